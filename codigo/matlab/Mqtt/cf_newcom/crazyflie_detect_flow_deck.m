@@ -10,10 +10,10 @@ function flowdeck = crazyflie_detect_flow_deck(scf)
     %             está presente y funcional en el dron.
     % -------------------------------------------------------------------------------------
     
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta detectar el Flow Deck en el dron usando la función correspondiente en Python.
     % Esta función verifica la presencia y el estado operativo del Flow Deck.
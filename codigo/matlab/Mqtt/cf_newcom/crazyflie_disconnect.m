@@ -6,10 +6,10 @@ function crazyflie_disconnect(scf)
     %   scf: Objeto de conexión que representa la conexión activa con el dron Crazyflie.
     % -------------------------------------------------------------------------------------
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta desconectar el dron usando la función correspondiente en Python
     % y limpiar el objeto de conexión de la memoria.
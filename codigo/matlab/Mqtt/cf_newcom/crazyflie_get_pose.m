@@ -11,10 +11,10 @@ function pose = crazyflie_get_pose(scf)
     %         función de la configuración del módulo de comandos en Python.
     % -------------------------------------------------------------------------------------
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta obtener la pose del dron Crazyflie usando la función Python correspondiente.
     try
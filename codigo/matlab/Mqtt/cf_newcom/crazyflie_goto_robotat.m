@@ -11,10 +11,10 @@ function crazyflie_goto_robotat(crazyflie, x, y, z, velocity, tcp_obj, agent_id)
     %   agent_id: Identificador del dron en el sistema de captura de movimiento (1-100).
     % -------------------------------------------------------------------------------------
     
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands';
     py_module = py.importlib.import_module(module_name);
-    py.importlib.reload(py_module);
 
     % Intento de mover el dron a la posición objetivo especificada.
     try        
@@ -14,10 +14,10 @@ function crazyflie_move_to_position(scf, x, y, z, v)
         error('ERROR: x, y, and z must be numeric values.');
     end
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta mover el dron a la posición deseada usando la función `move_to_position`.
     try
@@ -9,10 +9,10 @@ function crazyflie_set_pid_y(scf, P, I, D)
     %   D: Ganancia derivativa para el eje Y.
     % -------------------------------------------------------------------------------------
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta establecer los valores PID para el eje Y usando la función `set_pid_y`.
     try
@@ -7,10 +7,10 @@ function crazyflie_set_position(scf, x, y, z)
     %   x, y, z: Coordenadas de la posición objetivo en el espacio 3D.
     % -------------------------------------------------------------------------------------
     
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta establecer la posición del dron usando la función `set_position`.
     try
@@ -30,10 +30,10 @@ function crazyflie_takeoff(scf, height, duration)
         duration = 1.0;  
     end
     
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta ejecutar el comando de despegue usando la función `takeoff`.
     try
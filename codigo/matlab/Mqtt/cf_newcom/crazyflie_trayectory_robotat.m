@@ -1,14 +1,22 @@
-function crazyflie_trayectory_robotat(crazyflie, x, y, z, velocity, tcp_obj, agent_id)
+function samples = crazyflie_trayectory_robotat(crazyflie, x, y, z, velocity, tcp_obj, agent_id, durations)
     % Esta función dirige al dron Crazyflie a seguir una trayectoria definida por los puntos
-    % en los arreglos x, y, y z. El dron se desplaza de un punto a otro a la velocidad
-    % especificada.
+    % en los arreglos x, y, y z. La trayectoria completa se ejecuta en Python en una sola
+    % llamada (follow_trajectory_robotat): el dron recibe un go_to por punto y, durante cada
+    % tramo, su posición del sistema de captura de movimiento como posición externa.
     %
     % Argumentos:
     %   crazyflie: Objeto que representa el dron Crazyflie.
     %   x, y, z: Arreglos de coordenadas para la trayectoria en el espacio 3D.
     %   velocity: Velocidad de desplazamiento del dron entre los puntos de la trayectoria.
-    %   tcp_obj: Objeto TCP utilizado para la comunicación con el sistema de captura de movimiento.
+    %   tcp_obj: Objeto TCP del servidor Robotat (se usan su dirección y puerto; Python abre
+    %            su propia conexión).
     %   agent_id: ID del dron en el sistema de captura de movimiento (para identificarlo en el sistema).
+    %   durations: (Opcional) Duración en segundos de cada tramo entre puntos consecutivos
+    %              (numel(x) - 1 valores). Por defecto la duración es distancia / velocity.
+    %
+    % Salida:
+    %   samples: Matriz de muestras de seguimiento, una fila por muestra con las columnas
+    %            [t, objetivo x y z, MoCap x y z, estimación x y z].
     % -------------------------------------------------------------------------------------
 
     % Verifica si los arreglos de entrada (x, y, z) tienen la misma longitud.
@@ -17,19 +25,28 @@ function crazyflie_trayectory_robotat(crazyflie, x, y, z, velocity, tcp_obj, age
         error('The x, y, and z arrays must have the same length');
     end
 
-    % Refuerza la posición inicial moviendo el dron al primer punto de la trayectoria.
-    crazyflie_goto_robotat(crazyflie, x(1), y(1), z(1), velocity, tcp_obj, agent_id);
-
-    % Bucle que recorre cada punto en la trayectoria.
-    for i = 1:length(x)
-        % Mueve el dron al punto actual en la trayectoria, definido por las coordenadas
-        % x(i), y(i), z(i).
-        crazyflie_goto_robotat(crazyflie, x(i), y(i), z(i), velocity, tcp_obj, agent_id);
+    if nargin < 8 || isempty(durations)
+        durations = py.None;
+    else
+        durations = py.list(num2cell(double(durations(:)')));
     end
 
-    % Refuerza la posición final moviendo el dron al último punto de la trayectoria.
-    crazyflie_goto_robotat(crazyflie, x(end), y(end), z(end), velocity, tcp_obj, agent_id);
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
+    module_name = 'crazyflie_python_commands';
+    py_module = py.importlib.import_module(module_name);
+
+    % Ejecuta la trayectoria completa en Python.
+    try
+        result = py_module.follow_trajectory_robotat(crazyflie, ...
+            py.list(num2cell(double(x(:)'))), py.list(num2cell(double(y(:)'))), py.list(num2cell(double(z(:)'))), ...
+            pyargs('velocity', double(velocity), 'durations', durations, 'agent_id', int32(agent_id), ...
+                   'host', char(tcp_obj.Address), 'port', int32(tcp_obj.Port)));
+    catch ME
+        error('Error using crazyflie_python_commands>follow_trajectory_robotat: %s', ME.message);
+    end
 
-    % Proporciona un mensaje de retroalimentación indicando que la trayectoria ha sido completada.
-    fprintf('Trajectory completed successfully.\n');
+    % Convierte el arreglo plano de Python a una matriz (una fila por muestra).
+    columns = numel(cell(py_module.TRACKING_COLUMNS));
+    samples = reshape(double(result), columns, [])';
 end
@@ -0,0 +1,75 @@
+function result = crazyflie_daemon(method, varargin)
+    % Esta función es el cliente MATLAB del servicio de comandos crazyflie_daemon.py. El
+    % servicio importa crazyflie_python_commands una sola vez y atiende cada llamada por un
+    % socket local, sin recargar el módulo ni reinicializar los drivers de cflib.
+    %
+    % Argumentos:
+    %   method: 'start' para iniciar el servicio, 'stop' para detenerlo, o el nombre de una
+    %           función de crazyflie_python_commands ('connect', 'takeoff', ...). También se
+    %           aceptan 'ping' y 'stats'.
+    %   varargin: Argumentos de la función. El objeto que retorna 'connect' se pasa tal cual
+    %             en las llamadas siguientes.
+    %
+    % Salida:
+    %   result: Resultado de la función (los números y listas se convierten a double).
+    %
+    % Ejemplo:
+    %   crazyflie_daemon('start');
+    %   scf = crazyflie_daemon('connect', 'radio://0/80/2M/E7E7E7E7E1');
+    %   crazyflie_daemon('takeoff', scf, 0.5, 1.0);
+    %   pose = crazyflie_daemon('get_pose', scf);
+    %   crazyflie_daemon('disconnect', scf);
+    %   crazyflie_daemon('stop');
+    % -------------------------------------------------------------------------------------
+
+    % Carpeta de este wrapper (módulo de comandos) y carpeta codigo/python (servicio y cliente).
+    commands_folder = fileparts(mfilename('fullpath'));
+    daemon_folder = fullfile(commands_folder, '..', '..', '..', 'python');
+    if count(py.sys.path, daemon_folder) == 0
+        insert(py.sys.path, int32(0), daemon_folder);
+    end
+    client = py.importlib.import_module('crazyflie_daemon');
+    result = [];
+
+    switch method
+        case 'start'
+            % Inicia el servicio en segundo plano si no está corriendo y espera a que responda.
+            if client.wait_ready(0.2)
+                return;
+            end
+            script = fullfile(daemon_folder, 'crazyflie_daemon.py');
+            command = sprintf('"%s" "%s" --path "%s"', char(pyenv().Executable), script, commands_folder);
+            if ispc
+                system(['start "" /B ', command]);
+            else
+                system([command, ' > /dev/null 2>&1 &']);
+            end
+            if ~client.wait_ready(10.0)
+                error('ERROR: The crazyflie_daemon service did not start.');
+            end
+            fprintf('crazyflie_daemon service started.\n');
+
+        case 'stop'
+            try
+                client.call('shutdown');
+            catch
+                % El servicio ya estaba detenido.
+            end
+
+        otherwise
+            try
+                result = client.call(method, varargin{:});
+            catch ME
+                error('Error using crazyflie_daemon>%s: %s', method, ME.message);
+            end
+
+            % Conversión de los tipos de Python a MATLAB.
+            if isa(result, 'py.float') || isa(result, 'py.int')
+                result = double(result);
+            elseif isa(result, 'py.list')
+                result = double(py.array.array('d', result));
+            elseif isa(result, 'py.NoneType')
+                result = [];
+            end
+    end
+end
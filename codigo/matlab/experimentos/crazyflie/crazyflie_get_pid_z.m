@@ -10,10 +10,10 @@ function pid_z = crazyflie_get_pid_z(scf)
     %          Incluye tres campos: 'P' (Proporcional), 'I' (Integral) y 'D' (Derivativo).
     % -------------------------------------------------------------------------------------
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta obtener los valores PID para el eje Z usando la función Python.
     try
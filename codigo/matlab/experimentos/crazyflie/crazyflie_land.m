@@ -36,10 +36,10 @@ function crazyflie_land(scf, height, duration)
         duration = 2.0; 
     end
 
-    % Importa y recarga el módulo Python para comandos de Crazyflie
+    % Importa el módulo Python para comandos de Crazyflie (cargado una sola vez por
+    % crazyflie_connect; import_module retorna el módulo ya cargado, sin volver a ejecutarlo)
     module_name = 'crazyflie_python_commands'; 
     py_module = py.importlib.import_module(module_name);  
-    py.importlib.reload(py_module);
 
     % Intenta ejecutar el comando de aterrizaje usando la función `land` en Python.
     try
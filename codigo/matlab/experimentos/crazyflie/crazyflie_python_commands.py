@@ -4,19 +4,34 @@ Permite conectar y desconectar el dron, obtener y configurar su posición y orie
 así como realizar acciones básicas como despegue, aterrizaje y movimiento a una posición específica.
 """
 
+import array
+import json
 import logging
+import os
+import socket
 import time
 import sys
 from threading import Event
 
-import cflib.crtp
-from cflib.crazyflie import Crazyflie
-from cflib.crazyflie.log import LogConfig
-from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
-from cflib.crazyflie.high_level_commander import HighLevelCommander
+# cflib (y la sesión/flota) se importa dentro de las funciones que conectan o comandan el
+# dron: importar este módulo no carga cflib.
 
-cflib.crtp.init_drivers(enable_debug_driver=False)
-logging.basicConfig(level=logging.CRITICAL)
+# Caché de TOC compartida por todas las herramientas (la misma carpeta que toc_cache.py)
+TOC_CACHE = os.environ.get('CRAZYFLIE_TOC_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'crazyflie', 'toc')
+
+_drivers_ready = False
+
+def _init_drivers():
+    """
+    Inicializa los drivers de cflib y el logging la primera vez que se conecta (antes se hacía
+    al importar el módulo, aunque el script nunca llegara a conectar).
+    """
+    global _drivers_ready
+    if not _drivers_ready:
+        import cflib.crtp
+        cflib.crtp.init_drivers(enable_debug_driver=False)
+        logging.basicConfig(level=logging.CRITICAL)
+        _drivers_ready = True
    
 def connect(uri):
     """
@@ -31,8 +46,11 @@ def connect(uri):
     Errores:
         Imprime errores específicos si el dongle Crazyradio no está conectado o si la conexión es rechazada.
     """
+    from cflib.crazyflie import Crazyflie
+    from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
+    _init_drivers()
     try:        
-        scf = SyncCrazyflie(uri, cf=Crazyflie(rw_cache='./cache'))
+        scf = SyncCrazyflie(uri, cf=Crazyflie(rw_cache=TOC_CACHE))
         scf.open_link()
         print(f"Connection to Crazyflie established successfully.")
         sys.stdout.flush()
@@ -103,6 +121,7 @@ def get_pose(scf):
     Errores:
         Imprime un mensaje de error si ocurre algún problema al obtener la pose.
     """
+    from cflib.crazyflie.log import LogConfig
     try:
         # Set up the log configuration to get position and orientation data
         pose_log_config = LogConfig(name='Pose', period_in_ms=100)
@@ -426,6 +445,7 @@ def takeoff(scf, height = 0.3, duration = 1.0):
     Errores:
         Imprime un mensaje de error si ocurre algún problema durante el despegue.
     """
+    from cflib.crazyflie.high_level_commander import HighLevelCommander
     try:
         position = get_pose(scf)
         current_z = position[2]  
@@ -454,6 +474,7 @@ def land(scf, height = 0.0, duration = 2.0):
     Errores:
         Imprime un mensaje de error si ocurre algún problema durante el aterrizaje.
     """
+    from cflib.crazyflie.high_level_commander import HighLevelCommander
     try:
         position = get_pose(scf)
         current_z = position[2]  
@@ -497,3 +518,155 @@ def move_to_position(scf, x, y, z, velocity = 1.0):
 
     except Exception as e:
         print(f"ERROR: An error occurred during moving to position: {str(e)}")
+
+# Columnas de cada muestra de follow_trajectory_robotat()
+TRACKING_COLUMNS = ['t', 'target_x', 'target_y', 'target_z', 'mocap_x', 'mocap_y', 'mocap_z',
+                    'estimate_x', 'estimate_y', 'estimate_z']
+
+def _robotat_get_position(sock, agent_id, timeout = 1.0):
+    """
+    Pide la pose de un agente al servidor Robotat (mismo mensaje que robotat_get_pose.m).
+
+    Parámetros:
+        sock (socket): Conexión TCP con el servidor Robotat.
+        agent_id (int): Identificador del agente (1-100).
+        timeout (float): Tiempo máximo de espera de la respuesta en segundos.
+
+    Retorno:
+        list: Posición [x, y, z] del agente.
+
+    Errores:
+        Lanza ConnectionError si el servidor cierra la conexión, socket.timeout si no llega una
+        respuesta completa dentro de timeout (el plazo es para toda la respuesta, no para cada
+        lectura) y ValueError si la respuesta no contiene una posición.
+    """
+    deadline = time.monotonic() + timeout
+    sock.sendall(json.dumps({'dst': 1, 'cmd': 1, 'pld': [int(agent_id)]}).encode())
+    data = b''
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("No complete reply from the Robotat server")
+        sock.settimeout(remaining)
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("Robotat server closed the connection")
+        data += chunk
+        try:
+            mocap_data = json.loads(data)
+        except ValueError:
+            continue        # respuesta incompleta: seguir leyendo
+        if isinstance(mocap_data, list) and len(mocap_data) >= 3:
+            try:
+                return [float(v) for v in mocap_data[:3]]
+            except (TypeError, ValueError):
+                pass
+        raise ValueError(f"Invalid Robotat reply: {data[:80]!r}")
+
+def follow_trajectory_robotat(scf, x, y, z, velocity = 1.0, durations = None, agent_id = 1,
+                              host = '192.168.50.200', port = 1883, sample_period = 0.05):
+    """
+    Recorre una trayectoria completa en una sola llamada: envía un go_to por punto y, mientras
+    el dron se desplaza, consulta su posición al servidor Robotat y la envía al dron como
+    posición externa. Reemplaza el bucle de crazyflie_goto_robotat.m por punto, que cruzaba la
+    frontera MATLAB-Python y esperaba la respuesta del Robotat en cada llamada.
+
+    Parámetros:
+        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        x, y, z (sequence): Coordenadas de los puntos de la trayectoria.
+        velocity (float): Velocidad en m/s para calcular la duración de los tramos sin duración dada.
+        durations (sequence): Duración en segundos de cada tramo entre puntos consecutivos
+                              (len(x) - 1 valores). None = distancia / velocity.
+        agent_id (int): Identificador del dron en el sistema Robotat (1-100).
+        host (str): Dirección del servidor Robotat.
+        port (int): Puerto del servidor Robotat.
+        sample_period (float): Periodo de consulta al Robotat y de registro de muestras en segundos.
+
+    Retorno:
+        array.array: Muestras de seguimiento como arreglo plano de doubles, una fila por muestra
+                     con las columnas de TRACKING_COLUMNS (en MATLAB:
+                     reshape(double(samples), numel(TRACKING_COLUMNS), [])').
+
+    Errores:
+        Imprime un mensaje de error si los datos son inválidos o si ocurre algún problema
+        durante la trayectoria. Ante cualquier falla en vuelo (Robotat sin respuesta o con una
+        respuesta inválida, error de cflib) el dron aterriza y se retornan las muestras
+        registradas hasta ese momento.
+    """
+    from cflib.crazyflie.log import LogConfig
+    samples = array.array('d')
+    try:
+        x, y, z = [float(v) for v in x], [float(v) for v in y], [float(v) for v in z]
+        if not (len(x) == len(y) == len(z)) or not x:
+            print(f"ERROR: The x, y, and z arrays must have the same, non-zero length.")
+            return samples
+        if durations is not None:
+            durations = [float(d) for d in durations]
+            if len(durations) != len(x) - 1:
+                print(f"ERROR: durations must have one value per segment (len(x) - 1).")
+                return samples
+        if not 0 < agent_id <= 100:
+            print(f"ERROR: Invalid ID.")
+            return samples
+
+        # Estimación de posición del dron durante la trayectoria
+        estimate = [float('nan')] * 3
+        log_config = LogConfig(name='Tracking', period_in_ms=int(max(10, sample_period * 1000)))
+        for axis in ('x', 'y', 'z'):
+            log_config.add_variable(f'stateEstimate.{axis}', 'float')
+
+        def estimate_callback(timestamp, data, logconf):
+            estimate[:] = [data['stateEstimate.x'], data['stateEstimate.y'], data['stateEstimate.z']]
+
+        log_config.data_received_cb.add_callback(estimate_callback)
+
+        commander = scf.cf.high_level_commander
+        sock = socket.create_connection((host, int(port)), timeout=2.0)
+        try:
+            scf.cf.log.add_config(log_config)
+            log_config.start()
+
+            position = _robotat_get_position(sock, agent_id)
+            scf.cf.extpos.send_extpos(*position)
+            t0 = time.time()
+
+            for i in range(len(x)):
+                target = (x[i], y[i], z[i])
+                if i > 0 and durations is not None:
+                    duration = durations[i - 1]
+                else:
+                    duration = max(sum((a - b) ** 2 for a, b in zip(target, position)) ** 0.5 / velocity, sample_period)
+                commander.go_to(*target, yaw=0.0, duration_s=duration)
+
+                # Retroalimentación del MoCap mientras dura el tramo
+                end = time.time() + duration
+                while True:
+                    position = _robotat_get_position(sock, agent_id)
+                    scf.cf.extpos.send_extpos(*position)
+                    now = time.time()
+                    samples.extend([now - t0, *target, *position, *estimate])
+                    if now >= end:
+                        break
+                    time.sleep(max(0.0, min(sample_period, end - time.time())))
+        except Exception as e:
+            # Sin la posición del Robotat el EKF deja de recibir extpos y un error de cflib deja
+            # el tramo a medias: en ambos casos aterrizar en vez de seguir
+            if isinstance(e, OSError):
+                print(f"ERROR: Lost the Robotat feedback ({type(e).__name__}: {str(e)}). Landing.")
+            else:
+                print(f"ERROR: An error occurred during the trajectory: {str(e)}. Landing.")
+            commander.land(absolute_height_m=0.0, duration_s=2.0)
+            time.sleep(2.0)
+            commander.stop()
+            return samples
+        finally:
+            sock.close()
+            if log_config.cf is not None:       # add_config() registró el bloque
+                log_config.stop()
+                log_config.delete()
+
+        print(f"Trajectory completed successfully ({len(samples) // len(TRACKING_COLUMNS)} samples).")
+
+    except Exception as e:
+        print(f"ERROR: An error occurred during the trajectory: {str(e)}")
+    return samples
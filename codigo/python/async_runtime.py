@@ -0,0 +1,311 @@
+"""
+Este módulo permite ejecutar las misiones con un solo event loop de asyncio en lugar de mezclar
+hilos daemon (MQTT), hilos de cflib y `time.sleep` en la lógica de la misión.
+
+    - attach_mqtt_to_loop: el event loop atiende el socket de paho (MocapStream/MocapRouter.start(loop)),
+      sin hilo de red propio.
+    - AsyncPoseStream / AsyncLogStream: flujos de poses del MoCap o de los logs de cflib que se
+      pueden esperar con `await` o recorrer con `async for`.
+    - AsyncCrazyflie: takeoff/go_to/land que se esperan con `await` sin bloquear el hilo, de modo
+      que un proceso puede volar varios drones a la vez con asyncio.gather().
+    - periodic / SchedulingMonitor: tareas periódicas y medición de la latencia de planificación
+      del event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+import paho.mqtt.client as mqtt
+
+
+# -------------------------------------------------------
+# MQTT SOBRE EL EVENT LOOP
+# -------------------------------------------------------
+def attach_mqtt_to_loop(client, loop):
+    """
+    Conecta un cliente paho al event loop: las lecturas y escrituras del socket se hacen con
+    add_reader/add_writer y las tareas periódicas de paho (keepalive) con una tarea de asyncio.
+    Debe llamarse antes de client.connect(), desde el hilo del event loop.
+
+    Parámetros:
+        client (mqtt.Client): Cliente paho sin conectar.
+        loop (asyncio.AbstractEventLoop): Event loop que atenderá el socket.
+    """
+    tasks = {}
+
+    async def misc_loop():
+        while client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1.0)
+
+    def on_socket_open(client, userdata, sock):
+        loop.add_reader(sock, client.loop_read)
+        tasks['misc'] = loop.create_task(misc_loop())
+
+    def on_socket_close(client, userdata, sock):
+        loop.remove_reader(sock)
+        task = tasks.pop('misc', None)
+        if task is not None:
+            task.cancel()
+
+    def on_socket_register_write(client, userdata, sock):
+        loop.add_writer(sock, client.loop_write)
+
+    def on_socket_unregister_write(client, userdata, sock):
+        loop.remove_writer(sock)
+
+    client.on_socket_open = on_socket_open
+    client.on_socket_close = on_socket_close
+    client.on_socket_register_write = on_socket_register_write
+    client.on_socket_unregister_write = on_socket_unregister_write
+
+
+# -------------------------------------------------------
+# FLUJOS DE POSES
+# -------------------------------------------------------
+class AsyncPoseStream:
+    """
+    Flujo de muestras que se puede esperar desde corrutinas. Acepta callbacks desde cualquier
+    hilo (paho, cflib) o desde el propio event loop, y siempre entrega la muestra más reciente:
+    un consumidor lento se salta muestras intermedias en lugar de acumularlas.
+
+    Uso:
+        poses = AsyncPoseStream(mocap)            # MocapStream o MocapBody
+        x0, y0, z0 = await poses.wait_for_pose()
+        async for sample in poses:
+            ...
+    """
+
+    def __init__(self, source=None, loop=None):
+        """
+        Parámetros:
+            source: Objeto con add_callback(callback(sample)) (MocapStream, MocapBody); opcional.
+            loop (asyncio.AbstractEventLoop): Event loop de los consumidores (por defecto el actual).
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+        else:
+            # Event loop de otro hilo: toda entrega pasa por call_soon_threadsafe
+            self._loop_thread = None
+        self.loop = loop
+        self._latest = None
+        self._waiters = []
+        self.source = source
+        if source is not None:
+            source.add_callback(self.push)
+
+    def close(self):
+        """Deja de recibir muestras de la fuente."""
+        if self.source is not None:
+            self.source.remove_callback(self.push)
+            self.source = None
+
+    def push(self, sample):
+        """
+        Entrega una muestra nueva; se puede llamar desde cualquier hilo.
+
+        Parámetros:
+            sample: Muestra (por ejemplo un MocapSample).
+        """
+        if threading.get_ident() == self._loop_thread:
+            self._deliver(sample)
+        else:
+            self.loop.call_soon_threadsafe(self._deliver, sample)
+
+    def _deliver(self, sample):
+        self._latest = sample
+        waiters, self._waiters = self._waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(sample)
+
+    def latest(self):
+        """
+        Retorno:
+            Última muestra recibida, o None si aún no hay ninguna.
+        """
+        return self._latest
+
+    async def next(self, timeout=None):
+        """
+        Espera la próxima muestra.
+
+        Parámetros:
+            timeout (float): Tiempo máximo de espera en segundos (None = sin límite).
+
+        Errores:
+            Lanza asyncio.TimeoutError si se agota el tiempo de espera.
+        """
+        future = self.loop.create_future()
+        self._waiters.append(future)
+        return await asyncio.wait_for(future, timeout)
+
+    async def wait_for_pose(self, timeout=None):
+        """
+        Retorno:
+            list: Posición [x, y, z] de la última muestra (espera la primera si aún no hay).
+        """
+        sample = self._latest
+        if sample is None:
+            sample = await self.next(timeout)
+        return [sample.x, sample.y, sample.z]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.next()
+
+
+class AsyncLogStream(AsyncPoseStream):
+    """
+    AsyncPoseStream alimentado por un LogConfig de cflib o un LogSet de LogManager: cada
+    muestra es el diccionario `data` del log, con el timestamp del dron en la clave 'timestamp'.
+
+    Uso:
+        log = AsyncLogStream(scf.pose_logger)
+        data = await log.next()
+        z = data['stateEstimate.z']
+    """
+
+    def __init__(self, log_config, loop=None):
+        super().__init__(None, loop)
+        self.log_config = log_config
+        log_config.data_received_cb.add_callback(self._on_log)
+
+    def close(self):
+        self.log_config.data_received_cb.remove_callback(self._on_log)
+
+    def _on_log(self, timestamp, data, logconf):
+        self.push(dict(data, timestamp=timestamp))
+
+    async def wait_for_pose(self, timeout=None):
+        data = self._latest
+        if data is None:
+            data = await self.next(timeout)
+        return [data['stateEstimate.x'], data['stateEstimate.y'], data['stateEstimate.z']]
+
+
+# -------------------------------------------------------
+# COMANDOS DE VUELO
+# -------------------------------------------------------
+class AsyncCrazyflie:
+    """
+    Comandos de alto nivel que se esperan con `await`: el comando se envía y la corrutina
+    cede el event loop durante su duración, en lugar de bloquear el hilo con time.sleep.
+
+    Uso:
+        drone = AsyncCrazyflie(scf)
+        await drone.takeoff(0.5, 2.0)
+        await drone.go_to(x, y, 0.5, duration=1.5)
+        await drone.land()
+    """
+
+    def __init__(self, scf):
+        """
+        Parámetros:
+            scf (CrazyflieSession | SyncCrazyflie | Crazyflie): Conexión establecida con el dron.
+        """
+        self.cf = getattr(scf, 'cf', scf)
+        # Commander persistente del Crazyflie (el mismo que usa CrazyflieSession)
+        self.commander = self.cf.high_level_commander
+
+    async def takeoff(self, height=0.3, duration=1.0):
+        """Despega hasta `height` [m] en `duration` [s]."""
+        self.commander.takeoff(absolute_height_m=height, duration_s=duration)
+        await asyncio.sleep(duration)
+
+    async def go_to(self, x, y, z, yaw=0.0, duration=1.0, relative=False):
+        """Se desplaza a (x, y, z) [m] con orientación `yaw` [rad] en `duration` [s]."""
+        self.commander.go_to(x, y, z, yaw, duration, relative=relative)
+        await asyncio.sleep(duration)
+
+    async def land(self, height=0.0, duration=2.0):
+        """Aterriza hasta `height` [m] en `duration` [s] y detiene el commander."""
+        self.commander.land(absolute_height_m=height, duration_s=duration)
+        await asyncio.sleep(duration)
+        self.commander.stop()
+
+
+# -------------------------------------------------------
+# TAREAS PERIÓDICAS
+# -------------------------------------------------------
+async def periodic(period, callback, *args):
+    """
+    Ejecuta callback(*args) cada `period` segundos sin acumular deriva. Si callback es una
+    corrutina, se espera antes del siguiente ciclo. Se detiene cancelando la tarea.
+
+    Uso:
+        task = asyncio.create_task(periodic(0.01, forward_pose))
+        ...
+        task.cancel()
+    """
+    next_tick = time.monotonic()
+    while True:
+        result = callback(*args)
+        if asyncio.iscoroutine(result):
+            await result
+        next_tick += period
+        delay = next_tick - time.monotonic()
+        if delay < 0:
+            next_tick = time.monotonic()
+            delay = 0
+        await asyncio.sleep(delay)
+
+
+class SchedulingMonitor:
+    """
+    Mide la latencia de planificación del event loop: cada `period` segundos programa un
+    despertar y registra cuánto tarde llegó. Valores altos indican que algún callback o
+    comando está bloqueando el loop.
+
+    Uso:
+        monitor = SchedulingMonitor()
+        monitor.start()
+        ...
+        print(monitor.stats())
+    """
+
+    def __init__(self, period=0.01, max_samples=100_000):
+        """
+        Parámetros:
+            period (float): Periodo de muestreo [s].
+            max_samples (int): Cantidad de mediciones recientes que se conservan.
+        """
+        self.period = period
+        self._task = None
+        self._samples = deque(maxlen=max_samples)
+
+    def start(self):
+        """Inicia la medición (debe llamarse dentro del event loop)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Detiene la medición."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.period
+            await asyncio.sleep(self.period)
+            self._samples.append(time.perf_counter() - expected)
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Cantidad de muestras y latencia promedio, p99 y máxima [ms].
+        """
+        samples = sorted(self._samples)
+        if not samples:
+            return {'samples': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'samples': len(samples),
+            'mean_ms': 1000 * sum(samples) / len(samples),
+            'p99_ms': 1000 * samples[int(0.99 * (len(samples) - 1))],
+            'max_ms': 1000 * samples[-1],
+        }
@@ -0,0 +1,122 @@
+import asyncio
+from functools import partial
+from crazyflie_python_commands_mod import connect_many, report_estimator
+from mocap_stream import MocapRouter
+from async_runtime import AsyncPoseStream, AsyncCrazyflie, SchedulingMonitor, periodic
+
+## Vuelo simultáneo de varios drones con un solo event loop de asyncio: un cliente MQTT para
+## todo el enjambre, el envío de la posición externa como tarea periódica por dron y las
+## misiones escritas con await en lugar de time.sleep.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+DRONES = {
+    # sufijo del tópico MoCap : URI del dron
+    'drone3': "radio://0/80/2M/E7E7E7E7E1",
+    'drone8': "radio://0/64/2M/E7E7E7E7E8",
+}
+MQTT_BROKER = '192.168.50.200'
+PORT = 1880
+EXTPOS_HZ = 100  # tasa de envío de la posición del MoCap a cada dron [Hz]
+
+# -------------------------------------------------------
+# MISIÓN (takeoff -> square -> land)
+# -------------------------------------------------------
+async def fly_square(name, scf, body, side_length=0.6, hover_height=0.5, dt=2.0):
+    poses = AsyncPoseStream(body)
+    drone = AsyncCrazyflie(scf)
+
+    # Envío de la última posición del MoCap al EKF a tasa fija
+    def send_extpos():
+        sample = poses.latest()
+        if sample is not None:
+            scf.cf.extpos.send_extpos(sample.x, sample.y, sample.z)
+
+    extpos_task = asyncio.create_task(periodic(1.0 / EXTPOS_HZ, send_extpos))
+    airborne = False    # True desde que se envía el despegue hasta que termina el aterrizaje
+
+    try:
+        # Reiniciar el EKF con la posición del MoCap ya llegando (bloqueante, fuera del event loop)
+        await asyncio.get_running_loop().run_in_executor(None, scf.reset_estimator)
+        if not report_estimator(scf):
+            raise RuntimeError("Kalman estimator did not converge")
+
+        print(f"[{name}] Esperando posición inicial del MoCap...")
+        x0, y0, z0 = await poses.wait_for_pose()
+        print(f"[{name}] Posición inicial detectada: x={x0:.2f}, y={y0:.2f}, z={z0:.2f}")
+
+        half_side = side_length / 2
+        square_points = [
+            (x0 - half_side, y0 - half_side),
+            (x0 + half_side, y0 - half_side),
+            (x0 + half_side, y0 + half_side),
+            (x0 - half_side, y0 + half_side),
+            (x0 - half_side, y0 - half_side),
+        ]
+
+        print(f"[{name}] Despegando...")
+        airborne = True
+        await drone.takeoff(hover_height, 2.0)
+        for x, y in square_points:
+            await drone.go_to(x, y, hover_height, duration=dt)
+
+        print(f"[{name}] Aterrizando...")
+        await drone.land(0.0, 2.0)
+        airborne = False
+
+    finally:
+        try:
+            if airborne:
+                # Error o cancelación en vuelo: aterrizar con el envío de extpos todavía activo
+                print(f"[{name}] Misión interrumpida, aterrizando...")
+                await drone.land(0.0, 2.0)
+        finally:
+            extpos_task.cancel()
+            poses.close()
+
+
+# -------------------------------------------------------
+# MAIN
+# -------------------------------------------------------
+async def main():
+    loop = asyncio.get_running_loop()
+
+    # Un solo cliente MQTT atendido por el event loop para todos los drones
+    router = MocapRouter(MQTT_BROKER, PORT, 'mocap/+', auto_add=False)
+    bodies = {name: router.body(name) for name in DRONES}
+    router.start(loop)
+
+    monitor = SchedulingMonitor()
+    monitor.start()
+
+    # Conexiones en paralelo (connect_many() es bloqueante, se ejecuta fuera del event loop)
+    print("Conectando a los drones...")
+    fleet = await loop.run_in_executor(None, partial(connect_many, list(DRONES.values()), reset_estimator=False))
+    drones = {name: fleet[uri] for name, uri in DRONES.items() if uri in fleet.sessions}
+    for name, uri in DRONES.items():
+        if uri in fleet.failures:
+            print(f"[{name}] Sin conexión con {uri}, no participa en la misión: {fleet.failures[uri]}")
+
+    missions = {name: asyncio.create_task(fly_square(name, scf, bodies[name])) for name, scf in drones.items()}
+    try:
+        # La falla de una misión no interrumpe a las demás
+        results = await asyncio.gather(*missions.values(), return_exceptions=True)
+        for name, result in zip(missions, results):
+            if isinstance(result, Exception):
+                print(f"[{name}] ERROR: la misión falló: {type(result).__name__}: {result}")
+    finally:
+        # Si main() se cancela, cada misión aterriza antes de cerrar los enlaces
+        for task in missions.values():
+            task.cancel()
+        await asyncio.gather(*missions.values(), return_exceptions=True)
+        fleet.close()
+        print("Conexión de los drones:", fleet.stats())
+        router.stop()
+        monitor.stop()
+        print("Latencia de planificación del event loop:", monitor.stats())
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    asyncio.run(main())
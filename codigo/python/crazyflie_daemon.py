@@ -0,0 +1,372 @@
+"""
+Este módulo proporciona un servicio de larga duración alrededor de crazyflie_python_commands
+para los wrappers de MATLAB. Antes cada wrapper (crazyflie_set_position.m, crazyflie_goto_robotat.m,
+...) ejecutaba `py.importlib.reload(py_module)` en cada llamada: el módulo se volvía a ejecutar
+completo, incluido `cflib.crtp.init_drivers()`, antes de mandar el comando.
+
+El servicio importa el módulo una sola vez y atiende llamadas por un socket Unix local (o TCP
+en 127.0.0.1 si la plataforma no tiene AF_UNIX). El protocolo es una línea JSON por mensaje:
+
+    petición   {"method": "takeoff", "args": [{"__handle__": 1}, 0.5, 1.0]}
+    respuesta  {"result": ...}  o  {"error": "mensaje"}
+
+Los objetos que no se pueden enviar como JSON (el SyncCrazyflie que retorna connect()) quedan
+en el servicio y el cliente recibe un Handle que se pasa como argumento en las llamadas
+siguientes. Solo se atienden las funciones públicas definidas en el propio módulo (no las
+clases ni funciones que importa, como SyncCrazyflie o LogConfig) y 'ping', 'stats' y
+'shutdown'. El socket Unix se crea con permisos 0600, solo para el usuario que inició el
+servicio. El lado cliente (DaemonClient / call) solo usa la librería estándar, así que
+cargarlo desde MATLAB no importa cflib.
+
+Uso:
+    python crazyflie_daemon.py --path ../matlab/Mqtt/cf_newcom        # servicio
+    >> crazyflie_daemon('start')                                       % desde MATLAB
+    >> scf = crazyflie_daemon('connect', 'radio://0/80/2M/E7E7E7E7E1');
+    >> crazyflie_daemon('takeoff', scf, 0.5, 1.0);
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+ENV_VARIABLE = 'CRAZYFLIE_DAEMON'
+DEFAULT_PORT = 50431
+
+
+def default_address():
+    """
+    Retorno:
+        str | tuple: Ruta del socket Unix (variable de entorno CRAZYFLIE_DAEMON o un archivo en
+                     la carpeta temporal), o ('127.0.0.1', puerto) si no hay AF_UNIX.
+    """
+    address = os.environ.get(ENV_VARIABLE)
+    if not hasattr(socket, 'AF_UNIX'):
+        return ('127.0.0.1', int(address or DEFAULT_PORT))
+    return address or os.path.join(tempfile.gettempdir(), 'crazyflie_daemon.sock')
+
+
+class Handle:
+    """Referencia a un objeto que vive en el servicio (por ejemplo el SyncCrazyflie de connect())."""
+
+    def __init__(self, ident):
+        self.ident = ident
+
+    def __repr__(self):
+        return f'Handle({self.ident})'
+
+
+# -------------------------------------------------------
+# SERVICIO
+# -------------------------------------------------------
+class CommandService:
+    """
+    Despacha las llamadas a las funciones del módulo de comandos y guarda los objetos que no se
+    pueden enviar como JSON.
+    """
+
+    def __init__(self, module):
+        self.module = module
+        # API expuesta: funciones públicas definidas en el módulo, no lo que este importa
+        self.methods = {name: f for name, f in vars(module).items()
+                        if not name.startswith('_') and inspect.isfunction(f) and f.__module__ == module.__name__}
+        self.objects = {}       # id -> objeto retenido en el servicio
+        self.next_id = 1
+        self.calls = {}         # método -> [llamadas, tiempo total [s]]
+        self.started = time.time()
+        # MATLAB es de un solo hilo, pero dos sesiones podrían mandar comandos a la vez
+        self.lock = threading.Lock()
+
+    def _decode(self, value):
+        if isinstance(value, dict) and '__handle__' in value:
+            try:
+                return self.objects[value['__handle__']]
+            except KeyError:
+                raise ValueError(f"Unknown handle {value['__handle__']}") from None
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
+
+    def _encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+            return {k: self._encode(v) for k, v in value.items()}
+        if hasattr(value, 'tolist'):
+            return value.tolist()       # array.array / arreglos de NumPy
+        for ident, obj in self.objects.items():
+            if obj is value:
+                return {'__handle__': ident}
+        ident = self.next_id
+        self.next_id += 1
+        self.objects[ident] = value
+        return {'__handle__': ident}
+
+    def handle(self, request):
+        """
+        Parámetros:
+            request (dict): Petición decodificada ({'method', 'args'}).
+
+        Retorno:
+            dict: Respuesta ({'result'} o {'error'}).
+        """
+        method = request.get('method')
+        args = request.get('args', [])
+        t0 = time.perf_counter()
+        try:
+            if method == 'ping':
+                result = {'pid': os.getpid(), 'module': self.module.__name__}
+            elif method == 'stats':
+                result = self.stats()
+            elif method == 'shutdown':
+                result = True       # el servidor se detiene después de responder
+            elif not isinstance(method, str) or method not in self.methods:
+                raise ValueError(f"Unknown method {method!r}")
+            else:
+                with self.lock:
+                    result = self.methods[method](*self._decode(args))
+                    if method == 'disconnect':
+                        self._release(args)
+                    result = self._encode(result)
+            response = {'result': result}
+        except Exception as e:
+            response = {'error': f"{type(e).__name__}: {e}"}
+        entry = self.calls.setdefault(method, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - t0
+        return response
+
+    def _release(self, args):
+        # disconnect(scf): el objeto ya no sirve, se libera su handle
+        for arg in args:
+            if isinstance(arg, dict) and '__handle__' in arg:
+                self.objects.pop(arg['__handle__'], None)
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Tiempo activo [s], objetos retenidos y, por método, llamadas y tiempo medio [ms].
+        """
+        return {
+            'uptime_s': time.time() - self.started,
+            'objects': len(self.objects),
+            'calls': {m: {'count': n, 'mean_ms': total / n * 1e3} for m, (n, total) in self.calls.items() if n},
+        }
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer if hasattr(socket, 'AF_UNIX') else object):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = {}
+                response = {'error': "Invalid JSON request"}
+            else:
+                response = self.server.service.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+            if request.get('method') == 'shutdown':
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+def serve(module_name='crazyflie_python_commands', path=None, address=None):
+    """
+    Importa el módulo de comandos y atiende llamadas hasta recibir 'shutdown'.
+
+    Parámetros:
+        module_name (str): Módulo con las funciones de comandos.
+        path (str): Carpeta del módulo (se agrega al inicio de sys.path).
+        address (str | tuple): Dirección del socket (None = default_address()).
+    """
+    if path:
+        sys.path.insert(0, os.path.abspath(path))
+    module = importlib.import_module(module_name)
+    address = address or default_address()
+
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.unlink(address)      # socket de una ejecución anterior
+        server_class = _UnixServer
+    else:
+        server_class = _TCPServer
+
+    # Socket Unix con permisos 0600: los demás usuarios no pueden conectarse (la umask evita
+    # que quede abierto entre bind() y chmod())
+    umask = os.umask(0o077)
+    try:
+        server = server_class(address, _RequestHandler)
+        if isinstance(address, str):
+            os.chmod(address, 0o600)
+    finally:
+        os.umask(umask)
+
+    with server:
+        server.service = CommandService(module)
+        print(f"Serving {module.__file__} on {address}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if isinstance(address, str) and os.path.exists(address):
+                os.unlink(address)
+
+
+# -------------------------------------------------------
+# CLIENTE
+# -------------------------------------------------------
+class DaemonClient:
+    """
+    Cliente del servicio. Mantiene la conexión abierta entre llamadas.
+
+    Uso:
+        client = DaemonClient()
+        scf = client.call('connect', 'radio://0/80/2M/E7E7E7E7E1')
+        client.call('takeoff', scf, 0.5, 1.0)
+    """
+
+    def __init__(self, address=None, timeout=None):
+        """
+        Parámetros:
+            address (str | tuple): Dirección del servicio (None = default_address()).
+            timeout (float): Tiempo máximo de espera de cada respuesta [s] (None = sin límite,
+                             los comandos de vuelo bloquean hasta terminar).
+        """
+        address = address or default_address()
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        self._file = self._sock.makefile('rwb')
+
+    def call(self, method, *args):
+        """
+        Parámetros:
+            method (str): Función del módulo de comandos (o 'ping', 'stats', 'shutdown').
+            *args: Argumentos (números, textos, listas, diccionarios o Handle).
+
+        Retorno:
+            Resultado de la función; los objetos retenidos en el servicio llegan como Handle.
+
+        Errores:
+            Lanza RuntimeError con el mensaje del servicio si la llamada falló.
+        """
+        request = {'method': method, 'args': [_to_json(a) for a in args]}
+        self._file.write(json.dumps(request).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return _from_json(response['result'])
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _to_json(value):
+    if isinstance(value, Handle):
+        return {'__handle__': value.ident}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    # Escalares de MATLAB/NumPy: cualquier objeto con item() o __float__
+    if not isinstance(value, (type(None), bool, int, float, str, dict)):
+        if hasattr(value, 'tolist'):
+            return _to_json(value.tolist())
+        return float(value)
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {'__handle__'}:
+            return Handle(value['__handle__'])
+        return {k: _from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_from_json(v) for v in value]
+    return value
+
+
+_client = None
+
+
+def call(method, *args):
+    """
+    Llamada con un cliente compartido por el proceso (el que usa MATLAB). Si la conexión se
+    cayó (por ejemplo porque el servicio se reinició) se reconecta una vez.
+    """
+    global _client
+    for attempt in range(2):
+        if _client is None:
+            _client = DaemonClient()
+        try:
+            return _client.call(method, *args)
+        except (ConnectionError, OSError):
+            _client.close()
+            _client = None
+            if attempt or method == 'shutdown':
+                raise
+
+
+def wait_ready(timeout=10.0):
+    """
+    Espera hasta que el servicio responda a 'ping'.
+
+    Retorno:
+        bool: True si respondió antes de timeout [s].
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            call('ping')
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+# -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de comandos de Crazyflie para MATLAB")
+    parser.add_argument('--module', default='crazyflie_python_commands', help="módulo de comandos")
+    parser.add_argument('--path', help="carpeta del módulo de comandos")
+    parser.add_argument('--address', help="socket Unix (o puerto TCP si no hay AF_UNIX)")
+    args = parser.parse_args()
+    address = args.address
+    if address and not hasattr(socket, 'AF_UNIX'):
+        address = ('127.0.0.1', int(address))
+    serve(args.module, args.path, address)
+
+
+if __name__ == '__main__':
+    main()
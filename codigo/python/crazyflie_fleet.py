@@ -0,0 +1,165 @@
+"""
+Este módulo proporciona connect_many(): la conexión en paralelo de varios Crazyflie. Antes
+cada dron se conectaba uno tras otro (enlace, TOC, log, estimador), así que levantar N drones
+tardaba N veces lo de uno.
+
+Las sesiones (CrazyflieSession) se abren en un pool de hilos y comparten la carpeta de caché
+de TOC. Si la caché está vacía, todos los drones descargarían el TOC completo a la vez, por
+eso primero se conecta un dron (que descarga y guarda el TOC) y después el resto en paralelo,
+que ya lo encuentra. El reinicio del estimador de cada dron también corre en
+paralelo. El resultado es un CrazyflieFleet con las sesiones conectadas, los tiempos de cada
+dron y los errores de los que no se pudieron conectar (una falla no detiene a los demás).
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from crazyflie_session import CrazyflieSession
+from toc_cache import cache_dir
+
+
+class CrazyflieFleet:
+    """
+    Conjunto de sesiones conectadas con connect_many().
+
+    Uso:
+        fleet = connect_many([URI1, URI2, URI3], reset_estimator=False)
+        print(fleet.failures)           # {uri: error} de los drones que no conectaron
+        ...                             # iniciar el envío de extpos de cada dron
+        fleet.reset_estimators()
+        for uri, session in fleet.items():
+            session.takeoff_async(0.5)
+        fleet.close()
+    """
+
+    def __init__(self, max_workers=None):
+        self.sessions = {}      # uri -> CrazyflieSession conectada
+        self.failures = {}      # uri -> mensaje de error
+        self.timings = {}       # uri -> tiempos de conexión [s]
+        self.wall_time = None   # duración total de connect_many() [s]
+        self.max_workers = max_workers
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __iter__(self):
+        return iter(self.sessions.values())
+
+    def __getitem__(self, uri):
+        return self.sessions[uri]
+
+    def items(self):
+        return self.sessions.items()
+
+    def _map(self, function, uris):
+        # Ejecuta function(uri) en paralelo; retorna {uri: (resultado, error)}
+        uris = list(uris)
+        if not uris:
+            return {}
+
+        def run(uri):
+            try:
+                return function(uri), None
+            except Exception as e:
+                return None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(uris)) as pool:
+            return dict(zip(uris, pool.map(run, uris)))
+
+    def reset_estimators(self, threshold=0.001, timeout=10.0):
+        """
+        Reinicia el estimador de todos los drones en paralelo y espera su convergencia.
+
+        Retorno:
+            dict: uri -> True si el estimador convergió (False si no, o si hubo un error).
+        """
+        results = self._map(lambda uri: self.sessions[uri].reset_estimator(threshold, timeout), self.sessions)
+        for uri, (converged, error) in results.items():
+            self.timings[uri]['ready_s'] = self.sessions[uri].ready_time
+            if error is not None:
+                self.failures[uri] = f"reset_estimator: {error}"
+        return {uri: bool(converged) for uri, (converged, _) in results.items()}
+
+    def close(self):
+        """Cierra todas las sesiones en paralelo."""
+        self._map(lambda uri: self.sessions[uri].close(), self.sessions)
+        self.sessions = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Duración total, drones conectados y fallidos, y tiempos de cada dron [s]
+                  (open_s: apertura completa en el pool, connect_s y ready_s de la sesión).
+        """
+        return {
+            'wall_s': self.wall_time,
+            'connected': len(self.sessions),
+            'failed': len(self.failures),
+            'timings': self.timings,
+            'failures': dict(self.failures),
+        }
+
+
+def connect_many(uris, reset_estimator=True, rw_cache=None, warm_first=True, max_workers=None):
+    """
+    Conecta varios Crazyflie en paralelo.
+
+    Parámetros:
+        uris (sequence): URIs de los drones.
+        reset_estimator (bool): Si es True, cada sesión reinicia el estimador al abrirse (en
+                                paralelo). Con MoCap usar False y llamar a
+                                fleet.reset_estimators() con el envío de extpos ya iniciado.
+        rw_cache (str): Carpeta de caché de TOC compartida por todas las sesiones (None = la
+                        caché del usuario, ver toc_cache.py).
+        warm_first (bool): Si es True y la caché no tiene archivos, se conecta primero un dron
+                           para que el resto use el TOC guardado.
+        max_workers (int): Hilos del pool (None = uno por dron).
+
+    Retorno:
+        CrazyflieFleet: Sesiones conectadas, tiempos y errores por dron.
+    """
+    rw_cache = rw_cache or cache_dir()
+    fleet = CrazyflieFleet(max_workers)
+    t0 = time.perf_counter()
+
+    def open_session(uri):
+        t_start = time.perf_counter()
+        session = CrazyflieSession(uri, rw_cache=rw_cache)
+        try:
+            session.open(reset_estimator)
+        except Exception:
+            session.close()
+            raise
+        fleet.timings[uri] = {
+            'open_s': time.perf_counter() - t_start,
+            'connect_s': session.connect_time,
+            'ready_s': session.ready_time,
+        }
+        return session
+
+    def collect(results):
+        for uri, (session, error) in results.items():
+            if error is None:
+                fleet.sessions[uri] = session
+            else:
+                fleet.failures[uri] = str(error)
+
+    pending = list(dict.fromkeys(uris))
+    cache_is_cold = not glob.glob(os.path.join(rw_cache, '*.json'))
+    if warm_first and cache_is_cold and len(pending) > 1:
+        # El primer dron que conecte deja el TOC en la caché para los demás
+        while pending and not fleet.sessions:
+            collect(fleet._map(open_session, pending[:1]))
+            pending = pending[1:]
+    collect(fleet._map(open_session, pending))
+
+    fleet.wall_time = time.perf_counter() - t0
+    return fleet
@@ -5,18 +5,30 @@ así como realizar acciones básicas como despegue, aterrizaje y movimiento a un
 """
 
 import logging
+import os
 import time
 import sys
 from threading import Event
 
-import cflib.crtp
-from cflib.crazyflie import Crazyflie
-from cflib.crazyflie.log import LogConfig
-from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
-from cflib.crazyflie.high_level_commander import HighLevelCommander
+# cflib (y la sesión/flota) se importa dentro de las funciones que conectan o comandan el
+# dron: importar este módulo no carga cflib.
 
-cflib.crtp.init_drivers(enable_debug_driver=False)
-logging.basicConfig(level=logging.CRITICAL)
+# Caché de TOC compartida por todas las herramientas (la misma carpeta que toc_cache.py)
+TOC_CACHE = os.environ.get('CRAZYFLIE_TOC_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'crazyflie', 'toc')
+
+_drivers_ready = False
+
+def _init_drivers():
+    """
+    Inicializa los drivers de cflib y el logging la primera vez que se conecta (antes se hacía
+    al importar el módulo, aunque el script nunca llegara a conectar).
+    """
+    global _drivers_ready
+    if not _drivers_ready:
+        import cflib.crtp
+        cflib.crtp.init_drivers(enable_debug_driver=False)
+        logging.basicConfig(level=logging.CRITICAL)
+        _drivers_ready = True
    
 def connect(uri):
     """
@@ -31,8 +43,11 @@ def connect(uri):
     Errores:
         Imprime errores específicos si el dongle Crazyradio no está conectado o si la conexión es rechazada.
     """
+    from cflib.crazyflie import Crazyflie
+    from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
+    _init_drivers()
     try:        
-        scf = SyncCrazyflie(uri, cf=Crazyflie(rw_cache='./cache'))
+        scf = SyncCrazyflie(uri, cf=Crazyflie(rw_cache=TOC_CACHE))
         scf.open_link()
         print(f"Connection to Crazyflie established successfully.")
         sys.stdout.flush()
@@ -103,6 +118,7 @@ def get_pose(scf):
     Errores:
         Imprime un mensaje de error si ocurre algún problema al obtener la pose.
     """
+    from cflib.crazyflie.log import LogConfig
     try:
         # Set up the log configuration to get position and orientation data
         pose_log_config = LogConfig(name='Pose', period_in_ms=100)
@@ -426,6 +442,7 @@ def takeoff(scf, height = 0.3, duration = 1.0):
     Errores:
         Imprime un mensaje de error si ocurre algún problema durante el despegue.
     """
+    from cflib.crazyflie.high_level_commander import HighLevelCommander
     try:
         position = get_pose(scf)
         current_z = position[2]  
@@ -454,6 +471,7 @@ def land(scf, height = 0.0, duration = 2.0):
     Errores:
         Imprime un mensaje de error si ocurre algún problema durante el aterrizaje.
     """
+    from cflib.crazyflie.high_level_commander import HighLevelCommander
     try:
         position = get_pose(scf)
         current_z = position[2]  
@@ -2,6 +2,10 @@
 Cambios de versión: 
     - Ahora el logconfig se crea en connect() y se guarda en el objeto scf.
     - Se agregó la inicialización del filtro de Kalman
+    - La pose del logger se guarda en un PoseMailbox para leerla sin mezclar muestras.
+    - connect() retorna una CrazyflieSession (enlace, commander persistente, logs, caché de
+      parámetros y métricas); las funciones de este módulo son envoltorios sobre ella.
+    - cflib, los drivers y el logging se importan e inicializan en la primera conexión, no al importar.
 """
 
 import logging
@@ -9,73 +13,74 @@ import time
 import sys
 from threading import Event
 
-import cflib.crtp
-from cflib.crazyflie import Crazyflie
-from cflib.crazyflie.log import LogConfig
-from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
-from cflib.crazyflie.high_level_commander import HighLevelCommander
+# cflib (y la sesión/flota) se importa dentro de las funciones que conectan o comandan el
+# dron: importar este módulo no carga cflib.
 
-cflib.crtp.init_drivers(enable_debug_driver=False)
-logging.basicConfig(level=logging.CRITICAL)
+_drivers_ready = False
+
+def _init_drivers():
+    """
+    Inicializa los drivers de cflib y el logging la primera vez que se conecta (antes se hacía
+    al importar el módulo, aunque el script nunca llegara a conectar).
+    """
+    global _drivers_ready
+    if not _drivers_ready:
+        import cflib.crtp
+        cflib.crtp.init_drivers(enable_debug_driver=False)
+        logging.basicConfig(level=logging.CRITICAL)
+        _drivers_ready = True
+
+# Parámetros [P, I, D] del controlador de posición por eje
+PID_PARAMS = {
+    'X': ('posCtlPid.xKp', 'posCtlPid.xKi', 'posCtlPid.xKd'),
+    'Y': ('posCtlPid.yKp', 'posCtlPid.yKi', 'posCtlPid.yKd'),
+    'Z': ('posCtlPid.zKp', 'posCtlPid.zKi', 'posCtlPid.zKd'),
+}
+
+def _write_pid(scf, values):
+    """
+    Escribe un lote de ganancias con confirmación (scf.set_params) e informa el resultado.
+
+    Retorno:
+        dict: Resultado de set_params ('rtt_ms', 'missing', 'total_ms').
+    """
+    result = scf.set_params(values)
+    if result['missing']:
+        print(f"ERROR: No confirmation received for: {', '.join(result['missing'])}")
+    else:
+        print(f"Successful PID modification ({result['total_ms']:.1f} ms).")
+    return result
    
-def connect(uri):
+def connect(uri, reset_estimator=True, allow_unconverged=False):
     """
     Conecta al Crazyflie usando el URI proporcionado.
 
     Parámetros:
         uri (str): El URI del Crazyflie.
+        reset_estimator (bool): Si es True, reinicia el estimador Kalman y espera a que converja.
+                                Con MoCap usar False y llamar a scf.reset_estimator() una vez
+                                iniciado el envío de la posición externa.
+        allow_unconverged (bool): Si es True se retorna la sesión aunque el estimador no haya
+                                  convergido (ver report_estimator).
 
     Retorno:
-        SyncCrazyflie: Un objeto de sincronización de Crazyflie si la conexión es exitosa.
+        CrazyflieSession: Sesión con la conexión establecida si la conexión es exitosa, o None
+                          si el estimador no convergió.
 
     Errores:
         Imprime errores específicos si el dongle Crazyradio no está conectado o si la conexión es rechazada.
     """
-    try:        
-        scf = SyncCrazyflie(uri, cf=Crazyflie(rw_cache='./cache'))
-        scf.open_link()
+    from crazyflie_session import CrazyflieSession
+    _init_drivers()
+    try:
+        session = CrazyflieSession(uri)
+        session.open(reset_estimator)
         print(f"Connection to Crazyflie established successfully.")
+        if reset_estimator and not report_estimator(session, allow_unconverged):
+            session.close()
+            return None
 
-        # --- Crear un logger global de pose ---
-        pose_log_config = LogConfig(name='Pose', period_in_ms=100)
-        pose_log_config.add_variable('stateEstimate.x', 'float')
-        pose_log_config.add_variable('stateEstimate.y', 'float')
-        pose_log_config.add_variable('stateEstimate.z', 'float')
-        pose_log_config.add_variable('stateEstimate.roll', 'float')
-        pose_log_config.add_variable('stateEstimate.pitch', 'float')
-        pose_log_config.add_variable('stateEstimate.yaw', 'float')
-
-        pose_data = {'x': 0, 'y': 0, 'z': 0, 'roll': 0, 'pitch': 0, 'yaw': 0}
-
-        def pose_callback(timestamp, data, logconf):
-            pose_data.update({
-                'x': data['stateEstimate.x'],
-                'y': data['stateEstimate.y'],
-                'z': data['stateEstimate.z'],
-                'roll': data['stateEstimate.roll'],
-                'pitch': data['stateEstimate.pitch'],
-                'yaw': data['stateEstimate.yaw']
-            })
-
-        pose_log_config.data_received_cb.add_callback(pose_callback)
-        scf.cf.log.add_config(pose_log_config)
-        pose_log_config.start()
-
-        # Guardar el logger y los datos en el objeto
-        scf.pose_logger = pose_log_config
-        scf.pose_data = pose_data
-
-        scf.cf.param.set_value('stabilizer.estimator', '2')  # 2 = Kalman
-        # --- Reiniciar el estimador Kalman ---
-        print("Reiniciando el estimador Kalman...")
-        scf.cf.param.set_value('kalman.resetEstimation', '1')
-        time.sleep(0.1)
-        scf.cf.param.set_value('kalman.resetEstimation', '0')  # vuelve a 0
-        # Esperar a que el EKF converja antes del vuelo
-        time.sleep(3.0)
-        print("Estimador reiniciado correctamente.")
-
-        return scf
+        return session
     
     except Exception as e:
         if 'Cannot find a Crazyradio Dongle' in str(e):
@@ -85,22 +90,67 @@ def connect(uri):
         else:
             print(f"General error occurred while trying to connect to Crazyflie. Error details: {str(e)}")
 
+def connect_many(uris, reset_estimator=True):
+    """
+    Conecta varios Crazyflie en paralelo (ver crazyflie_fleet.py).
+
+    Parámetros:
+        uris (sequence): URIs de los drones.
+        reset_estimator (bool): Si es True, reinicia en paralelo el estimador de cada dron. Con
+                                MoCap usar False y llamar a fleet.reset_estimators() una vez
+                                iniciado el envío de la posición externa.
+
+    Retorno:
+        CrazyflieFleet: Sesiones conectadas (fleet[uri]), tiempos y drones que fallaron.
+
+    Errores:
+        Imprime el error de cada dron que no se pudo conectar; los demás quedan conectados.
+    """
+    from crazyflie_fleet import connect_many as _connect_many
+    _init_drivers()
+    fleet = _connect_many(uris, reset_estimator)
+    for uri, timing in fleet.timings.items():
+        print(f"Connection to {uri} established in {timing['open_s']:.2f} s.")
+    for uri, error in fleet.failures.items():
+        print(f"ERROR: Could not connect to {uri}. Error details: {error}")
+    print(f"{len(fleet)}/{len(fleet) + len(fleet.failures)} Crazyflies connected in {fleet.wall_time:.2f} s.")
+    return fleet
+
+def report_estimator(scf, allow_unconverged=False):
+    """
+    Imprime el resultado de la espera de convergencia del estimador Kalman e indica si se
+    puede despegar. Volar con el EKF sin converger no es seguro: los llamadores deben cancelar
+    la misión cuando retorna False.
+
+    Parámetros:
+        scf (CrazyflieSession): Sesión retornada por connect().
+        allow_unconverged (bool): Si es True se permite despegar aunque no haya convergido.
+
+    Retorno:
+        bool: True si el estimador convergió (o si allow_unconverged es True).
+    """
+    if scf.ready_time is not None:
+        print(f"Estimador listo: {scf.ready_time:.2f} s desde la conexión.")
+        return True
+    if allow_unconverged:
+        print("Advertencia: el estimador Kalman no convergió dentro del tiempo de espera.")
+        return True
+    print("ERROR: el estimador Kalman no convergió dentro del tiempo de espera; no se despega.")
+    return False
+
 def disconnect(scf):
     """
     Desconecta el Crazyflie.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie para cerrar la conexión.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Errores:
         Imprime errores si ocurre algún problema durante la desconexión.
     """
     try:
         if scf:
-            if hasattr(scf, 'pose_logger'):
-                scf.pose_logger.stop()
-                scf.pose_logger.delete()
-            scf.close_link()
+            scf.close()
             print(f"Successfully disconnected from Crazyflie.")
         else:
             print(f"Error: Invalid SyncCrazyflie object. No connection to close.")
@@ -113,7 +163,7 @@ def detect_flow_deck(scf):
     Detecta si el Flow Deck está instalado en el Crazyflie.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         int: Retorna 1 si el Flow Deck es detectado, 0 en caso contrario.
@@ -138,7 +188,7 @@ def get_pose(scf):
     Obtiene la posición y orientación del Crazyflie en términos de coordenadas (x, y, z) y ángulos (roll, pitch, yaw).
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         list: Una lista con los valores de posición [x, y, z] y orientación [roll, pitch, yaw].
@@ -147,8 +197,8 @@ def get_pose(scf):
         Imprime un mensaje de error si ocurre algún problema al obtener la pose.
     """
     try:
-        pose = scf.pose_data
-        return [pose['x'], pose['y'], pose['z'], pose['roll'], pose['pitch'], pose['yaw']]
+        # Lectura consistente: los seis valores pertenecen a la misma muestra del logger
+        return scf.get_pose()
     except AttributeError:
         print("ERROR: Pose logger not initialized. Ensure connect() was called first.")
 
@@ -157,7 +207,7 @@ def set_position(scf, x, y, z):
     Establece una posición absoluta para el Crazyflie.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         x (float): Coordenada X.
         y (float): Coordenada Y.
         z (float): Coordenada Z.
@@ -169,7 +219,7 @@ def set_position(scf, x, y, z):
         if not all(isinstance(coord, (int, float)) for coord in [x, y, z]):
             print(f"ERROR: Input values invalids.")
 
-        scf.cf.extpos.send_extpos(x, y, z)
+        scf.send_extpos(x, y, z)
         time.sleep(0.01)
         print(f"Absolute position successfully set.")
 
@@ -181,7 +231,7 @@ def set_pose(scf, x, y, z, qx, qy, qz, qw):
     Establece una pose absoluta en el espacio, con posición y orientación en cuaterniones.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         x, y, z (float): Coordenadas de posición.
         qx, qy, qz, qw (float): Componentes del cuaternión de orientación.
 
@@ -192,19 +242,33 @@ def set_pose(scf, x, y, z, qx, qy, qz, qw):
         if not all(isinstance(coord, (int, float)) for coord in [x, y, z]):
             print(f"ERROR: Input values invalids.")
 
-        scf.cf.extpos.send_extpose(x, y, z, qx, qy, qz, qw)
+        scf.send_extpose(x, y, z, qx, qy, qz, qw)
         time.sleep(0.01)
         print(f"Absolute pose successfully set.")
 
     except Exception as e:
         print(f"ERROR: An error occurred during the pose update: {str(e)}")
 
+def start_extpos_stream(scf, max_rate_hz=None):
+    """
+    Crea un envío de la posición externa para tasas de 100 Hz o más. A diferencia de
+    set_position/set_pose, push() no duerme ni imprime: los errores se cuentan en stats().
+
+    Parámetros:
+        scf (CrazyflieSession): Sesión retornada por connect().
+        max_rate_hz (float): Tasa máxima de envío [Hz] (None = sin límite).
+
+    Retorno:
+        ExtPosStream: Objeto con push(x, y, z[, qx, qy, qz, qw]) y stats().
+    """
+    return scf.extpos_stream(max_rate_hz)
+
 def get_pid_values(scf):
     """
     Obtiene los valores de los controladores PID del Crazyflie para los ejes X, Y y Z.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         dict: Diccionario con los valores PID para cada eje (X, Y, Z).
@@ -213,23 +277,8 @@ def get_pid_values(scf):
         Imprime un mensaje de error si ocurre algún problema al obtener los valores PID.
     """
     try:
-        pid_values = {
-            'X': [
-                float(scf.cf.param.get_value('posCtlPid.xKp')),
-                float(scf.cf.param.get_value('posCtlPid.xKi')),
-                float(scf.cf.param.get_value('posCtlPid.xKd'))
-            ],
-            'Y': [
-                float(scf.cf.param.get_value('posCtlPid.yKp')),
-                float(scf.cf.param.get_value('posCtlPid.yKi')),
-                float(scf.cf.param.get_value('posCtlPid.yKd'))
-            ],
-            'Z': [
-                float(scf.cf.param.get_value('posCtlPid.zKp')),
-                float(scf.cf.param.get_value('posCtlPid.zKi')),
-                float(scf.cf.param.get_value('posCtlPid.zKd'))
-            ]
-        }
+        values = scf.get_params([name for axis in PID_PARAMS.values() for name in axis])
+        pid_values = {axis: [values[name] for name in names] for axis, names in PID_PARAMS.items()}
         print("PID values for X axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_values['X'][0], pid_values['X'][1], pid_values['X'][2]))
         print("PID values for Y axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_values['Y'][0], pid_values['Y'][1], pid_values['Y'][2]))
         print("PID values for Z axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_values['Z'][0], pid_values['Z'][1], pid_values['Z'][2]))
@@ -243,7 +292,7 @@ def set_pid_values(scf, p_gains, i_gains, d_gains):
     Establece los valores de los controladores PID para cada eje (X, Y, Z).
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         p_gains (dict): Ganancias P para los ejes X, Y y Z.
         i_gains (dict): Ganancias I para los ejes X, Y y Z.
         d_gains (dict): Ganancias D para los ejes X, Y y Z.
@@ -252,22 +301,11 @@ def set_pid_values(scf, p_gains, i_gains, d_gains):
         Imprime un mensaje de error si ocurre algún problema al establecer los valores PID.
     """
     try:       
-        # X Axis
-        scf.cf.param.set_value('posCtlPid.xKp', p_gains['X'])
-        scf.cf.param.set_value('posCtlPid.xKi', i_gains['X'])
-        scf.cf.param.set_value('posCtlPid.xKd', d_gains['X'])
-        
-        # Y Axis
-        scf.cf.param.set_value('posCtlPid.yKp', p_gains['Y'])
-        scf.cf.param.set_value('posCtlPid.yKi', i_gains['Y'])
-        scf.cf.param.set_value('posCtlPid.yKd', d_gains['Y'])
-        
-        # Z Axis
-        scf.cf.param.set_value('posCtlPid.zKp', p_gains['Z'])
-        scf.cf.param.set_value('posCtlPid.zKi', i_gains['Z'])
-        scf.cf.param.set_value('posCtlPid.zKd', d_gains['Z'])
-
-        print(f"Successful PID modification.")
+        return _write_pid(scf, {
+            name: gains[axis]
+            for axis, names in PID_PARAMS.items()
+            for name, gains in zip(names, (p_gains, i_gains, d_gains))
+        })
     
     except Exception as e:
         print(f"ERROR: An error occurred during the PID modification: {str(e)}")
@@ -277,7 +315,7 @@ def get_pid_x(scf):
     Obtiene los valores del controlador PID para el eje X.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         dict: Diccionario con los valores P, I y D para el eje X.
@@ -286,11 +324,8 @@ def get_pid_x(scf):
         Imprime un mensaje de error si ocurre algún problema al obtener los valores PID.
     """
     try:
-        pid_x = {
-            'P': float(scf.cf.param.get_value('posCtlPid.xKp')),
-            'I': float(scf.cf.param.get_value('posCtlPid.xKi')),
-            'D': float(scf.cf.param.get_value('posCtlPid.xKd'))
-        }
+        values = scf.get_params(PID_PARAMS['X'])
+        pid_x = dict(zip('PID', values.values()))
         
         print("PID values for X axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_x['P'], pid_x['I'], pid_x['D']))
         return pid_x
@@ -303,7 +338,7 @@ def get_pid_y(scf):
     Obtiene los valores del controlador PID para el eje Y.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         dict: Diccionario con los valores P, I y D para el eje Y.
@@ -312,11 +347,8 @@ def get_pid_y(scf):
         Imprime un mensaje de error si ocurre algún problema al obtener los valores PID.
     """
     try:
-        pid_y = {
-            'P': float(scf.cf.param.get_value('posCtlPid.yKp')),
-            'I': float(scf.cf.param.get_value('posCtlPid.yKi')),
-            'D': float(scf.cf.param.get_value('posCtlPid.yKd'))
-        }
+        values = scf.get_params(PID_PARAMS['Y'])
+        pid_y = dict(zip('PID', values.values()))
         
         print("PID values for Y axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_y['P'], pid_y['I'], pid_y['D']))
         return pid_y
@@ -329,7 +361,7 @@ def get_pid_z(scf):
     Obtiene los valores del controlador PID para el eje Z.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
 
     Retorno:
         dict: Diccionario con los valores P, I y D para el eje Z.
@@ -338,11 +370,8 @@ def get_pid_z(scf):
         Imprime un mensaje de error si ocurre algún problema al obtener los valores PID.
     """
     try:
-        pid_z = {
-            'P': float(scf.cf.param.get_value('posCtlPid.zKp')),
-            'I': float(scf.cf.param.get_value('posCtlPid.zKi')),
-            'D': float(scf.cf.param.get_value('posCtlPid.zKd'))
-        }
+        values = scf.get_params(PID_PARAMS['Z'])
+        pid_z = dict(zip('PID', values.values()))
         
         print("PID values for Z axis: P = {:.2f}, I = {:.2f}, D = {:.2f}".format(pid_z['P'], pid_z['I'], pid_z['D']))
         return pid_z
@@ -355,7 +384,7 @@ def set_pid_x(scf, P, I, D):
     Establece los valores del controlador PID para el eje X.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         P (float): Ganancia P.
         I (float): Ganancia I.
         D (float): Ganancia D.
@@ -364,11 +393,7 @@ def set_pid_x(scf, P, I, D):
         Imprime un mensaje de error si ocurre algún problema al establecer los valores PID.
     """
     try:      
-        scf.cf.param.set_value('posCtlPid.xKp', P)
-        scf.cf.param.set_value('posCtlPid.xKi', I)
-        scf.cf.param.set_value('posCtlPid.xKd', D)
-
-        print(f"Successful PID modification.")
+        return _write_pid(scf, dict(zip(PID_PARAMS['X'], (P, I, D))))
     
     except Exception as e:
         print(f"ERROR: An error occurred during the PID modification: {str(e)}")
@@ -378,7 +403,7 @@ def set_pid_y(scf, P, I, D):
     Establece los valores del controlador PID para el eje Y.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         P (float): Ganancia P.
         I (float): Ganancia I.
         D (float): Ganancia D.
@@ -387,11 +412,7 @@ def set_pid_y(scf, P, I, D):
         Imprime un mensaje de error si ocurre algún problema al establecer los valores PID.
     """
     try:    
-        scf.cf.param.set_value('posCtlPid.yKp', P)
-        scf.cf.param.set_value('posCtlPid.yKi', I)
-        scf.cf.param.set_value('posCtlPid.yKd', D)
-
-        print(f"Successful PID modification.")
+        return _write_pid(scf, dict(zip(PID_PARAMS['Y'], (P, I, D))))
     
     except Exception as e:
         print(f"ERROR: An error occurred during the PID modification: {str(e)}")
@@ -401,7 +422,7 @@ def set_pid_z(scf, P, I, D):
     Establece los valores del controlador PID para el eje Z.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         P (float): Ganancia P.
         I (float): Ganancia I.
         D (float): Ganancia D.
@@ -410,11 +431,7 @@ def set_pid_z(scf, P, I, D):
         Imprime un mensaje de error si ocurre algún problema al establecer los valores PID.
     """
     try:  
-        scf.cf.param.set_value('posCtlPid.zKp', P)
-        scf.cf.param.set_value('posCtlPid.zKi', I)
-        scf.cf.param.set_value('posCtlPid.zKd', D)
-
-        print(f"Successful PID modification.")
+        return _write_pid(scf, dict(zip(PID_PARAMS['Z'], (P, I, D))))
     
     except Exception as e:
         print(f"ERROR: An error occurred during the PID modification: {str(e)}")
@@ -424,7 +441,7 @@ def takeoff(scf, height = 0.3, duration = 1.0):
     Comanda al Crazyflie a despegar a una altura especificada.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         height (float): Altura a alcanzar en el despegue.
         duration (float): Duración del despegue en segundos.
 
@@ -432,16 +449,10 @@ def takeoff(scf, height = 0.3, duration = 1.0):
         Imprime un mensaje de error si ocurre algún problema durante el despegue.
     """
     try:
-        position = get_pose(scf)
-        current_z = position[2]  
-
-        if current_z > 0.1:
+        if not scf.takeoff(height, duration):
             print(f"The Crazyflie was already in the air.")
             return 0
 
-        commander = HighLevelCommander(scf.cf)
-        commander.takeoff(absolute_height_m=height, duration_s=duration)
-        time.sleep(duration)
         print(f"Takeoff completed successfully")
 
     except Exception as e:
@@ -452,7 +463,7 @@ def land(scf, height = 0.0, duration = 2.0):
     Comanda al Crazyflie a aterrizar a una altura específica (por defecto al suelo).
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         height (float): Altura a la que aterrizar.
         duration (float): Duración del aterrizaje en segundos.
 
@@ -460,17 +471,10 @@ def land(scf, height = 0.0, duration = 2.0):
         Imprime un mensaje de error si ocurre algún problema durante el aterrizaje.
     """
     try:
-        position = get_pose(scf)
-        current_z = position[2]  
-
-        if current_z <= 0.1:
+        if not scf.land(height, duration):
             print(f"The Crazyflie was already on the ground.")
             return 0
 
-        commander = HighLevelCommander(scf.cf)
-        commander.land(absolute_height_m=height, duration_s=duration)
-        time.sleep(duration)
-        commander.stop()
         print(f"Landing completed successfully.")
 
     except Exception as e:
@@ -481,7 +485,7 @@ def move_to_position(scf, x, y, z, velocity = 1.0):
     Comanda al Crazyflie a moverse a una posición específica en el espacio con una velocidad especificada.
 
     Parámetros:
-        scf (SyncCrazyflie): Objeto SyncCrazyflie con la conexión establecida.
+        scf (CrazyflieSession): Sesión retornada por connect().
         x (float): Coordenada X destino.
         y (float): Coordenada Y destino.
         z (float): Coordenada Z destino.
@@ -491,14 +495,37 @@ def move_to_position(scf, x, y, z, velocity = 1.0):
         Imprime un mensaje de error si ocurre algún problema durante el movimiento.
     """
     try:
-        commander = scf.cf.high_level_commander
-        current_position = get_pose(scf)
-        current_x, current_y, current_z = current_position[0], current_position[1], current_position[2]
-        distance = ((x - current_x)**2 + (y - current_y)**2 + (z - current_z)**2)**0.5
-        duration = distance / velocity
-        commander.go_to(x, y, z, yaw=0.0, duration_s=duration)
-        time.sleep(duration)
+        scf.move_to_position(x, y, z, velocity)
         print(f"Position command completed successfully")
 
     except Exception as e:
         print(f"ERROR: An error occurred during moving to position: {str(e)}")
+
+def fly_trajectory(scf, waypoints, velocity = 0.5, trajectory_id = 1):
+    """
+    Sube los puntos como trayectoria polinomial a la memoria del Crazyflie y la ejecuta con un
+    único start_trajectory (sin detenerse en cada punto). El dron debe estar en el primer punto.
+
+    Parámetros:
+        scf (CrazyflieSession): Sesión retornada por connect().
+        waypoints (array): Puntos (n, 3) de la trayectoria [m].
+        velocity (float): Velocidad media en m/s (define la duración de cada tramo).
+        trajectory_id (int): Identificador de la trayectoria en el Crazyflie.
+
+    Retorno:
+        float: Duración de la trayectoria [s], o None si ocurrió un error.
+
+    Errores:
+        Imprime un mensaje de error si la carga o la ejecución de la trayectoria falla.
+    """
+    from onboard_trajectory import segment_durations
+
+    try:
+        duration = scf.upload_trajectory(waypoints, segment_durations(waypoints, velocity), trajectory_id)
+        print(f"Trajectory uploaded ({len(waypoints) - 1} pieces, {duration:.2f} s)")
+        scf.start_trajectory(trajectory_id)
+        print(f"Trajectory completed successfully")
+        return duration
+
+    except Exception as e:
+        print(f"ERROR: An error occurred during the trajectory: {str(e)}")
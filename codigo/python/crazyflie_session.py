@@ -0,0 +1,567 @@
+"""
+Este módulo proporciona CrazyflieSession: un objeto por conexión que concentra el estado que
+antes se colgaba del SyncCrazyflie de forma ad hoc (`scf.pose_logger`, `scf.pose_data`) y
+que los comandos volvían a construir en cada llamada (HighLevelCommander).
+
+La sesión es dueña del enlace, del commander de alto nivel, de los bloques de log, de una
+caché de parámetros y de las métricas de los comandos. Las funciones de
+crazyflie_python_commands_mod.py son envoltorios delgados sobre ella, de modo que los
+scripts de Python y MATLAB comparten el mismo objeto ya inicializado.
+
+Los comandos de movimiento tienen una variante no bloqueante (*_async) que retorna un
+MotionHandle (ver motion_handle.py); las variantes bloqueantes esperan ese manejador.
+"""
+
+import threading
+import time
+
+from cflib.crazyflie.log import LogConfig
+from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
+
+from extpos_stream import ExtPosStream
+from ingest_metrics import LatencyHistogram
+from log_manager import LogManager
+from motion_handle import MotionHandle
+from pose_mailbox import PoseMailbox
+from toc_cache import cache_dir, new_crazyflie
+
+# Variables del bloque de log de la pose
+POSE_VARIABLES = (
+    'stateEstimate.x', 'stateEstimate.y', 'stateEstimate.z',
+    'stateEstimate.roll', 'stateEstimate.pitch', 'stateEstimate.yaw',
+)
+
+# Varianzas de posición del estimador Kalman
+KALMAN_VARIANCES = ('kalman.varPX', 'kalman.varPY', 'kalman.varPZ')
+
+
+# -------------------------------------------------------
+# CONVERGENCIA DEL ESTIMADOR
+# -------------------------------------------------------
+def wait_for_estimator(cf, threshold=0.001, stable_samples=10, timeout=10.0, period_ms=20):
+    """
+    Espera a que el estimador Kalman converja: las varianzas de posición (kalman.varPX/PY/PZ)
+    deben quedar bajo `threshold` durante `stable_samples` muestras seguidas del log.
+    Reemplaza la espera fija de 3 s: retorna apenas el filtro converge y, si no lo hace,
+    espera como máximo `timeout`.
+
+    Parámetros:
+        cf (Crazyflie): Objeto Crazyflie conectado (scf.cf o session.cf).
+        threshold (float): Varianza máxima de cada eje [m^2].
+        stable_samples (int): Muestras consecutivas bajo el umbral.
+        timeout (float): Tiempo máximo de espera [s].
+        period_ms (int): Periodo del log de las varianzas [ms].
+
+    Retorno:
+        float: Tiempo que tardó en converger [s], o None si se agotó el tiempo de espera.
+    """
+    block = LogConfig(name='KalmanVariance', period_in_ms=period_ms)
+    for variable in KALMAN_VARIANCES:
+        block.add_variable(variable, 'float')
+
+    converged = threading.Event()
+    stable = [0]
+
+    def on_variance(timestamp, data, logconf):
+        if all(data[variable] < threshold for variable in KALMAN_VARIANCES):
+            stable[0] += 1
+            if stable[0] >= stable_samples:
+                converged.set()
+        else:
+            stable[0] = 0
+
+    t0 = time.perf_counter()
+    block.data_received_cb.add_callback(on_variance)
+    cf.log.add_config(block)
+    block.start()
+    try:
+        ready = converged.wait(timeout)
+    finally:
+        block.stop()
+        block.delete()
+    return time.perf_counter() - t0 if ready else None
+
+
+class CrazyflieSession:
+    """
+    Conexión con un Crazyflie y todo su estado asociado.
+
+    Uso:
+        session = CrazyflieSession("radio://0/80/2M/E7E7E7E7E1")
+        session.open()
+        session.takeoff(0.5, 2.0)
+        session.go_to(0.0, 0.0, 0.5, duration=2.0)
+        handle = session.go_to_async(0.5, 0.0, 0.5, duration=2.0, tolerance=0.05)
+        ...
+        handle.result()
+        session.land()
+        print(session.stats())
+        session.close()
+    """
+
+    def __init__(self, uri, rw_cache=None, pose_period_ms=10):
+        """
+        Parámetros:
+            uri (str): URI del Crazyflie.
+            rw_cache (str): Carpeta de la caché de TOC (None = la caché del usuario, ver toc_cache.py).
+            pose_period_ms (int): Periodo del log de la pose [ms] (10 ms = 100 Hz, el máximo del
+                                  firmware; se pide en formato compacto, ver log_manager.py).
+        """
+        self.uri = uri
+        self.rw_cache = rw_cache or cache_dir()
+        self.pose_period_ms = pose_period_ms
+
+        self.scf = None
+        self.cf = None
+        self.commander = None
+        self.logs = None
+        self.pose = PoseMailbox(('x', 'y', 'z', 'roll', 'pitch', 'yaw'))
+
+        self._params = {}           # tabla local de parámetros (nombre -> float)
+        self._param_batches = []    # escrituras de set_params() esperando confirmación
+        self._watchers = []     # MotionHandle que se completan al llegar la pose al objetivo
+        self._trajectories = {}     # trayectorias subidas (id -> duración [s])
+        self.command_ns = {}    # histogramas de la duración de cada comando (nombre -> LatencyHistogram)
+        self.connect_time = None    # apertura del enlace -> sesión lista [s]
+        self.ready_time = None      # apertura del enlace -> estimador convergido [s]
+        self._t_open = None
+
+    # -------------------------------------------------------
+    # CONEXIÓN
+    # -------------------------------------------------------
+    def open(self, reset_estimator=True):
+        """
+        Abre el enlace, inicia el log de la pose y reinicia el estimador Kalman.
+
+        Parámetros:
+            reset_estimator (bool): Si es True, se reinicia el estimador y se espera su
+                                    convergencia. Con posición externa (MoCap) conviene usar
+                                    False y llamar a reset_estimator() después de iniciar el
+                                    envío de extpos, ya que sin él el filtro no converge.
+
+        Retorno:
+            CrazyflieSession: La propia sesión.
+
+        Errores:
+            Lanza la excepción de cflib si no es posible conectar (dongle ausente, conexión rechazada).
+        """
+        self._t_open = t0 = time.perf_counter()
+        self.scf = SyncCrazyflie(self.uri, cf=new_crazyflie(self.rw_cache))
+        self.scf.open_link()
+        self.cf = self.scf.cf
+        self.commander = self.cf.high_level_commander
+        self.cf.param.add_update_callback(cb=self._on_param)
+
+        self.logs = LogManager(self.cf)
+        self.logs.add('Pose', POSE_VARIABLES, 1000.0 / self.pose_period_ms, self._on_pose, compact=True)
+        self.set_param('stabilizer.estimator', 2)  # 2 = Kalman
+        if reset_estimator:
+            self.reset_estimator()
+
+        self.connect_time = time.perf_counter() - t0
+        return self
+
+    def close(self):
+        """Detiene los bloques de log y cierra el enlace."""
+        if self.logs is not None:
+            self.logs.close()
+            self.logs = None
+        if self.scf is not None:
+            self.scf.close_link()
+            self.scf = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def reset_estimator(self, threshold=0.001, timeout=10.0):
+        """
+        Reinicia el estimador Kalman y espera a que converja (ver wait_for_estimator).
+
+        Parámetros:
+            threshold (float): Varianza máxima de posición de cada eje [m^2].
+            timeout (float): Tiempo máximo de espera [s].
+
+        Retorno:
+            bool: True si el estimador convergió antes del tiempo de espera.
+        """
+        self.cf.param.set_value('kalman.resetEstimation', '1')
+        time.sleep(0.1)
+        self.cf.param.set_value('kalman.resetEstimation', '0')
+        converged = wait_for_estimator(self.cf, threshold, timeout=timeout) is not None
+        self.ready_time = time.perf_counter() - self._t_open if converged else None
+        return converged
+
+    # -------------------------------------------------------
+    # LOGS
+    # -------------------------------------------------------
+    def add_log_block(self, name, variables, period_ms=100, callback=None, compact=False):
+        """
+        Registra e inicia un conjunto de variables de log (ver LogManager.add). Las variables
+        de todos los conjuntos con el mismo periodo comparten los bloques del firmware.
+
+        Parámetros:
+            name (str): Nombre del conjunto (clave en log_blocks).
+            variables (sequence): Variables del log ('grupo.nombre').
+            period_ms (int): Periodo deseado [ms] (múltiplo de 10).
+            callback (callable): Función con la firma callback(timestamp, data, logset).
+            compact (bool): Si es True se usan las variantes int16/FP16 de las variables.
+
+        Retorno:
+            LogSet: Conjunto iniciado.
+        """
+        return self.logs.add(name, variables, 1000.0 / period_ms, callback, compact=compact)
+
+    def stop_log_block(self, name):
+        """Detiene un conjunto de log; se puede reanudar con start_log_block()."""
+        self.logs.stop(name)
+
+    def start_log_block(self, name):
+        """Reanuda un conjunto de log detenido."""
+        self.logs.start(name)
+
+    @property
+    def log_blocks(self):
+        """Conjuntos de log registrados (nombre -> LogSet)."""
+        return self.logs.sets if self.logs is not None else {}
+
+    def _on_pose(self, timestamp, data, logconf):
+        pose = tuple(data[variable] for variable in POSE_VARIABLES)
+        self.pose.write(pose)
+        for handle in self._watchers:
+            if handle.check_pose(pose[0], pose[1], pose[2]):
+                self._unwatch(handle)
+
+    def get_pose(self):
+        """
+        Retorno:
+            list: Pose [x, y, z, roll, pitch, yaw] de la última muestra del log (consistente).
+        """
+        return list(self.pose.read()[1])
+
+    # -------------------------------------------------------
+    # PARÁMETROS
+    # -------------------------------------------------------
+    def _on_param(self, name, value):
+        # Callback de cflib para todo valor recibido (lectura o eco de una escritura)
+        try:
+            self._params[name] = float(value)
+        except ValueError:
+            return
+        now = time.perf_counter()
+        for batch in self._param_batches:
+            with batch['lock']:
+                if name in batch['pending']:
+                    batch['pending'].discard(name)
+                    batch['acks'][name] = now
+                    if not batch['pending']:
+                        batch['done'].set()
+
+    def get_param(self, name):
+        """
+        Lee un parámetro como float desde la tabla local (la mantiene al día cflib con cada
+        valor recibido del dron), sin comunicación por radio.
+
+        Parámetros:
+            name (str): Nombre completo del parámetro ('posCtlPid.xKp').
+        """
+        value = self._params.get(name)
+        if value is None:
+            value = float(self.cf.param.get_value(name))
+            self._params[name] = value
+        return value
+
+    def get_params(self, names):
+        """
+        Lee varios parámetros en una sola pasada por la tabla local.
+
+        Parámetros:
+            names (sequence): Nombres completos de los parámetros.
+
+        Retorno:
+            dict: Valor (float) de cada parámetro.
+        """
+        return {name: self.get_param(name) for name in names}
+
+    def set_param(self, name, value):
+        """
+        Escribe un parámetro sin esperar confirmación (ver set_params para escrituras confirmadas).
+
+        Parámetros:
+            name (str): Nombre completo del parámetro.
+            value (float | int | str): Valor a escribir.
+        """
+        t0 = time.perf_counter_ns()
+        self.cf.param.set_value(name, value)
+        self._params[name] = float(value)
+        self._record('set_param', t0)
+
+    def set_params(self, values, timeout=2.0):
+        """
+        Escribe varios parámetros: todas las escrituras se encolan de una vez (cflib las envía
+        una tras otra apenas llega cada confirmación) y se espera el eco de todas en conjunto.
+
+        Parámetros:
+            values (dict): Valor de cada parámetro (nombre completo -> valor).
+            timeout (float): Tiempo máximo de espera de las confirmaciones [s].
+
+        Retorno:
+            dict: 'rtt_ms' con el tiempo de ida y vuelta de cada parámetro confirmado (desde la
+                  confirmación anterior, o desde el envío para el primero), 'missing' con los
+                  parámetros sin confirmar y 'total_ms' con la duración del lote.
+        """
+        batch = {'pending': set(values), 'acks': {}, 'done': threading.Event(), 'lock': threading.Lock()}
+        self._param_batches = self._param_batches + [batch]
+        t0 = time.perf_counter()
+        try:
+            for name, value in values.items():
+                self.cf.param.set_value(name, value)
+            if values:
+                batch['done'].wait(timeout)
+        finally:
+            self._param_batches = [b for b in self._param_batches if b is not batch]
+
+        with batch['lock']:
+            acks = sorted(batch['acks'].items(), key=lambda item: item[1])
+            missing = sorted(batch['pending'])
+
+        rtt_ms = {}
+        previous = t0
+        histogram = self.command_ns.setdefault('param_ack', LatencyHistogram())
+        for name, t_ack in acks:
+            rtt = t_ack - previous
+            rtt_ms[name] = 1000 * rtt
+            histogram.record(rtt * 1e9)
+            previous = t_ack
+        return {'rtt_ms': rtt_ms, 'missing': missing, 'total_ms': 1000 * (time.perf_counter() - t0)}
+
+    # -------------------------------------------------------
+    # COMANDOS
+    # -------------------------------------------------------
+    def takeoff(self, height=0.3, duration=1.0):
+        """
+        Despega hasta `height` [m] en `duration` [s] y espera a que termine.
+
+        Retorno:
+            bool: False si el dron ya estaba en el aire (no se envía el comando).
+        """
+        return self.takeoff_async(height, duration).result()
+
+    def land(self, height=0.0, duration=2.0):
+        """
+        Aterriza hasta `height` [m] en `duration` [s], espera y detiene el commander.
+
+        Retorno:
+            bool: False si el dron ya estaba en el suelo (no se envía el comando).
+        """
+        return self.land_async(height, duration).result()
+
+    def go_to(self, x, y, z, yaw=0.0, duration=1.0, relative=False):
+        """Se desplaza a (x, y, z) [m] con orientación `yaw` [rad] en `duration` [s] y espera."""
+        return self.go_to_async(x, y, z, yaw, duration, relative).result()
+
+    def move_to_position(self, x, y, z, velocity=1.0):
+        """
+        Se desplaza a (x, y, z) [m] a la velocidad `velocity` [m/s] desde la pose actual y espera.
+
+        Retorno:
+            float: Duración del movimiento [s].
+        """
+        handle = self.move_to_async(x, y, z, velocity)
+        handle.result()
+        return handle.duration
+
+    def takeoff_async(self, height=0.3, duration=1.0, tolerance=None):
+        """
+        Envía el despegue sin esperar.
+
+        Parámetros:
+            height (float): Altura [m].
+            duration (float): Duración [s].
+            tolerance (float): Si se indica, el manejador se completa cuando la altura llega a
+                               `height` ± tolerance en lugar de al terminar `duration`.
+
+        Retorno:
+            MotionHandle: Manejador del comando; su resultado es False si el dron ya estaba en el aire.
+        """
+        x, y, z = self.get_pose()[:3]
+        handle = MotionHandle(self, 'takeoff', duration, (x, y, height), tolerance)
+        if z > 0.1:
+            handle.set_result(False)
+            return handle
+        t0 = time.perf_counter_ns()
+        self.commander.takeoff(absolute_height_m=height, duration_s=duration)
+        self._record('takeoff', t0)
+        return handle.start()
+
+    def land_async(self, height=0.0, duration=2.0):
+        """
+        Envía el aterrizaje sin esperar; el commander se detiene cuando el manejador se completa.
+
+        Retorno:
+            MotionHandle: Manejador del comando; su resultado es False si el dron ya estaba en el suelo.
+        """
+        handle = MotionHandle(self, 'land', duration)
+        if self.get_pose()[2] <= 0.1:
+            handle.set_result(False)
+            return handle
+        t0 = time.perf_counter_ns()
+        self.commander.land(absolute_height_m=height, duration_s=duration)
+        self._record('land', t0)
+        def stop_commander(handle):
+            if not handle.cancelled():
+                self.commander.stop()
+
+        handle.add_done_callback(stop_commander)
+        return handle.start()
+
+    def go_to_async(self, x, y, z, yaw=0.0, duration=1.0, relative=False, tolerance=None):
+        """
+        Envía un desplazamiento a (x, y, z) [m] sin esperar.
+
+        Parámetros:
+            tolerance (float): Si se indica (y relative=False), el manejador se completa cuando la
+                               pose llega a menos de `tolerance` [m] del objetivo.
+
+        Retorno:
+            MotionHandle: Manejador del comando.
+        """
+        target = None if relative else (x, y, z)
+        handle = MotionHandle(self, 'go_to', duration, target, tolerance)
+        t0 = time.perf_counter_ns()
+        self.commander.go_to(x, y, z, yaw=yaw, duration_s=duration, relative=relative)
+        self._record('go_to', t0)
+        return handle.start()
+
+    def move_to_async(self, x, y, z, velocity=1.0, tolerance=None):
+        """
+        Envía un desplazamiento a (x, y, z) [m] a la velocidad `velocity` [m/s] sin esperar.
+
+        Retorno:
+            MotionHandle: Manejador del comando (la duración calculada queda en handle.duration).
+        """
+        current_x, current_y, current_z = self.get_pose()[:3]
+        distance = ((x - current_x)**2 + (y - current_y)**2 + (z - current_z)**2)**0.5
+        return self.go_to_async(x, y, z, duration=distance / velocity, tolerance=tolerance)
+
+    # -------------------------------------------------------
+    # TRAYECTORIAS A BORDO
+    # -------------------------------------------------------
+    def upload_trajectory(self, waypoints, durations, trajectory_id=1):
+        """
+        Ajusta los puntos a polinomios y los sube a la memoria de trayectorias del Crazyflie
+        (ver onboard_trajectory.py).
+
+        Parámetros:
+            waypoints (array): Puntos (n, 3) [m].
+            durations (array): Duración de cada tramo (n - 1,) [s].
+            trajectory_id (int): Identificador de la trayectoria.
+
+        Retorno:
+            float: Duración total de la trayectoria [s].
+        """
+        # NumPy y el ajuste de polinomios solo se cargan si se usan trayectorias a bordo
+        from onboard_trajectory import upload_trajectory
+
+        t0 = time.perf_counter_ns()
+        duration = upload_trajectory(self.cf, waypoints, durations, trajectory_id)
+        self._record('upload_trajectory', t0)
+        self._trajectories[trajectory_id] = duration
+        return duration
+
+    def start_trajectory_async(self, trajectory_id=1, time_scale=1.0, relative=False):
+        """
+        Inicia una trayectoria subida con upload_trajectory() sin esperar.
+
+        Parámetros:
+            trajectory_id (int): Identificador de la trayectoria.
+            time_scale (float): Factor de escala del tiempo (2.0 = el doble de lento).
+            relative (bool): Si es True la trayectoria se ejecuta relativa a la posición actual.
+
+        Retorno:
+            MotionHandle: Manejador que se completa al terminar la trayectoria.
+
+        Errores:
+            Lanza KeyError si la trayectoria no se subió en esta sesión.
+        """
+        duration = self._trajectories[trajectory_id] * time_scale
+        handle = MotionHandle(self, 'trajectory', duration)
+        t0 = time.perf_counter_ns()
+        self.commander.start_trajectory(trajectory_id, time_scale, relative)
+        self._record('start_trajectory', t0)
+        return handle.start()
+
+    def start_trajectory(self, trajectory_id=1, time_scale=1.0, relative=False):
+        """Inicia una trayectoria subida y espera a que termine."""
+        return self.start_trajectory_async(trajectory_id, time_scale, relative).result()
+
+    def hold(self):
+        """Detiene el movimiento en curso y mantiene la posición actual."""
+        x, y, z = self.get_pose()[:3]
+        self.commander.go_to(x, y, z, yaw=0.0, duration_s=0.1)
+
+    def _watch(self, handle):
+        # Copia completa: el hilo de cflib recorre la lista sin candado
+        self._watchers = self._watchers + [handle]
+
+    def _unwatch(self, handle):
+        self._watchers = [h for h in self._watchers if h is not handle]
+
+    def send_extpos(self, x, y, z):
+        """Envía la posición externa (MoCap) al estimador."""
+        self.cf.extpos.send_extpos(x, y, z)
+
+    def send_extpose(self, x, y, z, qx, qy, qz, qw):
+        """Envía la pose externa (posición y cuaternión) al estimador."""
+        self.cf.extpos.send_extpose(x, y, z, qx, qy, qz, qw)
+
+    def extpos_stream(self, max_rate_hz=None):
+        """
+        Crea un envío de posición externa para tasas altas (sin esperas ni impresiones).
+
+        Parámetros:
+            max_rate_hz (float): Tasa máxima de envío [Hz] (None = sin límite).
+
+        Retorno:
+            ExtPosStream: Objeto con push(x, y, z[, qx, qy, qz, qw]) y stats().
+        """
+        return ExtPosStream(self.cf, max_rate_hz)
+
+    # -------------------------------------------------------
+    # MÉTRICAS
+    # -------------------------------------------------------
+    def _record(self, name, t0):
+        histogram = self.command_ns.get(name)
+        if histogram is None:
+            histogram = self.command_ns[name] = LatencyHistogram()
+        histogram.record(time.perf_counter_ns() - t0)
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Tiempos de conexión y de convergencia del estimador [s], parámetros en caché,
+                  tasas de los bloques de log y duración del envío de cada comando [ms].
+        """
+        return {
+            'uri': self.uri,
+            'connect_s': self.connect_time,
+            'ready_s': self.ready_time,
+            'cached_params': len(self._params),
+            'logs': self.logs.stats() if self.logs is not None else None,
+            'commands_ms': {name: h.summary() for name, h in self.command_ns.items()},
+        }
+
+    # -------------------------------------------------------
+    # COMPATIBILIDAD CON EL SCF ANTERIOR
+    # -------------------------------------------------------
+    @property
+    def pose_logger(self):
+        """Conjunto de log de la pose (antes scf.pose_logger)."""
+        return self.log_blocks.get('Pose')
+
+    @property
+    def pose_data(self):
+        """Buzón de la pose (antes scf.pose_data)."""
+        return self.pose
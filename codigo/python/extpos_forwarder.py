@@ -0,0 +1,157 @@
+"""
+Este módulo desacopla la recepción del MoCap del envío de la posición externa (extpos) al
+Crazyflie. Antes, `send_extpos` (o `set_position`, con su sleep y print) se ejecutaba dentro
+del callback de paho: cualquier demora del radio frenaba la recepción MQTT y la tasa de envío
+era la misma que la del servidor.
+
+ExtPosForwarder guarda solo la última muestra recibida (en un PoseMailbox) y un hilo propio la
+envía a una tasa fija configurable, contando las muestras enviadas, combinadas (reemplazadas
+por una más nueva antes de enviarse) y descartadas (demasiado antiguas). La latencia entre la
+decodificación y el envío se registra en el histograma decoded_to_sent de un IngestMetrics.
+"""
+
+import threading
+import time
+
+from extpos_stream import ExtPosStream
+from ingest_metrics import IngestMetrics
+from pose_mailbox import PoseMailbox
+
+
+class ExtPosForwarder:
+    """
+    Reenvío de la posición externa al Crazyflie a tasa fija, en un hilo propio.
+
+    Uso:
+        forwarder = ExtPosForwarder(scf.cf, rate_hz=100)
+        mocap.add_callback(forwarder.on_pose)
+        forwarder.start()
+        ...
+        forwarder.stop()
+        print(forwarder.stats())
+    """
+
+    def __init__(self, cf, rate_hz=100, send_orientation=False, max_age=0.1, metrics=None):
+        """
+        Parámetros:
+            cf (Crazyflie): Objeto Crazyflie conectado (scf.cf).
+            rate_hz (float): Tasa de envío al radio [Hz].
+            send_orientation (bool): Si es True se envía la pose completa (send_extpose), si no solo la posición.
+            max_age (float): Antigüedad máxima [s] de una muestra para enviarla (None = sin límite).
+            metrics (IngestMetrics): Métricas donde registrar la latencia decoded_to_sent
+                                     (por ejemplo mocap.metrics); si es None se crean unas propias.
+
+        Errores:
+            Lanza ValueError si rate_hz no es positiva.
+        """
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.cf = cf
+        self.rate_hz = rate_hz
+        self.send_orientation = send_orientation
+        self.max_age = max_age
+        self.metrics = metrics if metrics is not None else IngestMetrics()
+        self.stream = ExtPosStream(cf)
+
+        # t: tiempo de recepción (time.time()), t_submit: instante de submit() (time.perf_counter())
+        self._mailbox = PoseMailbox(('x', 'y', 'z', 'qx', 'qy', 'qz', 'qw', 't', 't_submit'))
+        self._thread = None
+        self._stop = threading.Event()
+
+        # Contadores
+        self.submitted = 0    # muestras recibidas del MoCap
+        self.sent = 0         # muestras enviadas al Crazyflie
+        self.coalesced = 0    # muestras reemplazadas por una más nueva antes de enviarse
+        self.dropped = 0      # muestras descartadas por antigüedad
+        self.errors = 0       # fallas del envío por radio
+        self.late_ticks = 0   # ciclos en los que el hilo no alcanzó la tasa configurada
+
+    def submit(self, x, y, z, qx=0.0, qy=0.0, qz=0.0, qw=1.0, t=None):
+        """
+        Guarda la última posición para el próximo envío. No bloquea; debe llamarse siempre
+        desde el mismo hilo (por ejemplo, el callback MQTT).
+
+        Parámetros:
+            x, y, z (float): Posición [m].
+            qx, qy, qz, qw (float): Orientación en cuaterniones (solo con send_orientation=True).
+            t (float): Tiempo de recepción (time.time()); si es None se usa el actual.
+        """
+        self._mailbox.write((x, y, z, qx, qy, qz, qw, time.time() if t is None else t, time.perf_counter()))
+        self.submitted += 1
+
+    def on_pose(self, sample):
+        """
+        Callback compatible con MocapStream/MocapBody.add_callback().
+
+        Parámetros:
+            sample (MocapSample): Muestra del MoCap.
+        """
+        self.submit(sample.x, sample.y, sample.z, sample.qx, sample.qy, sample.qz, sample.qw, sample.t_rx)
+
+    def start(self):
+        """Inicia el hilo de envío."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ExtPosForwarder', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo de envío."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Contadores de envío y tasa configurada.
+        """
+        return {
+            'rate_hz': self.rate_hz,
+            'submitted': self.submitted,
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'late_ticks': self.late_ticks,
+        }
+
+    def _send(self, values):
+        x, y, z, qx, qy, qz, qw, _, _ = values
+        if self.send_orientation:
+            return self.stream.push(x, y, z, qx, qy, qz, qw)
+        return self.stream.push(x, y, z)
+
+    def _run(self):
+        latency = self.metrics.decoded_to_sent
+        period = 1.0 / self.rate_hz
+        last_version = 0
+        next_tick = time.monotonic()
+
+        while not self._stop.is_set():
+            version, values = self._mailbox.read()
+            if version != last_version:
+                # Todas las muestras intermedias se combinaron en la última
+                self.coalesced += version - last_version - 1
+                last_version = version
+
+                if self.max_age is not None and time.time() - values[7] > self.max_age:
+                    self.dropped += 1
+                else:
+                    if self._send(values):
+                        latency.record((time.perf_counter() - values[8]) * 1e9)
+                        self.sent += 1
+                    else:
+                        self.errors += 1
+
+            # Esperar al siguiente ciclo (si el hilo se atrasó, se resincroniza)
+            next_tick += period
+            wait = next_tick - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+            else:
+                self.late_ticks += 1
+                next_tick = time.monotonic()
@@ -0,0 +1,115 @@
+"""
+Este módulo proporciona ExtPosStream, un envío de la posición externa (MoCap) al Crazyflie
+pensado para 100 Hz o más. `set_position` y `set_pose` de crazyflie_python_commands_mod.py
+duermen 10 ms e imprimen un mensaje en cada llamada, lo que limita la tasa a menos de 100 Hz
+y llena la consola cuando se llaman por cada paquete MQTT.
+
+ExtPosStream arma el paquete CRTP de localización directamente (sin pasar por
+cf.extpos -> cf.loc) y lo entrega al enlace sin esperas ni impresiones. Los errores no se
+imprimen: se cuentan y el último queda en `last_error`.
+"""
+
+import struct
+import time
+
+from cflib.crazyflie.localization import Localization
+from cflib.crtp.crtpstack import CRTPPacket, CRTPPort
+
+# Encabezados CRTP de los paquetes de posición y de pose externas
+_POSITION_HEADER = (CRTPPort.LOCALIZATION << 4) | Localization.POSITION_CH
+_GENERIC_HEADER = (CRTPPort.LOCALIZATION << 4) | Localization.GENERIC_CH
+
+_POSITION = struct.Struct('<fff')
+_POSE = struct.Struct('<Bfffffff')
+
+
+class ExtPosStream:
+    """
+    Envío de la posición (o pose) externa sin esperas, con contadores en lugar de impresiones.
+
+    Uso:
+        stream = ExtPosStream(session.cf)           # o session.extpos_stream()
+        mocap.add_callback(lambda s: stream.push(s.x, s.y, s.z))
+        ...
+        print(stream.stats())
+    """
+
+    def __init__(self, cf, max_rate_hz=None):
+        """
+        Parámetros:
+            cf (Crazyflie): Objeto Crazyflie conectado (scf.cf o session.cf).
+            max_rate_hz (float): Tasa máxima de envío [Hz]; las llamadas más frecuentes se
+                                 descartan y se cuentan en `throttled` (None = sin límite).
+        """
+        self.cf = cf
+        self.max_rate_hz = max_rate_hz
+        self._min_interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self._last_send = 0.0
+        self._t_start = time.perf_counter()
+
+        # Contadores
+        self.pushed = 0       # llamadas a push()
+        self.sent = 0         # paquetes entregados al enlace
+        self.throttled = 0    # llamadas descartadas por max_rate_hz
+        self.errors = 0       # fallas al enviar
+        self.last_error = None
+
+    def push(self, x, y, z, qx=None, qy=None, qz=None, qw=None):
+        """
+        Envía la posición (x, y, z) o, si se indica el cuaternión, la pose completa.
+
+        Parámetros:
+            x, y, z (float): Posición [m].
+            qx, qy, qz, qw (float): Orientación en cuaterniones (opcional).
+
+        Retorno:
+            bool: True si el paquete se entregó al enlace.
+        """
+        self.pushed += 1
+        if self._min_interval:
+            now = time.perf_counter()
+            if now - self._last_send < self._min_interval:
+                self.throttled += 1
+                return False
+            self._last_send = now
+
+        try:
+            if qw is None:
+                pk = CRTPPacket(_POSITION_HEADER, _POSITION.pack(x, y, z))
+            else:
+                pk = CRTPPacket(_GENERIC_HEADER, _POSE.pack(Localization.EXT_POSE, x, y, z, qx, qy, qz, qw))
+            self.cf.send_packet(pk)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            return False
+        self.sent += 1
+        return True
+
+    def on_pose(self, sample, orientation=False):
+        """
+        Callback compatible con MocapStream/MocapBody.add_callback().
+
+        Parámetros:
+            sample (MocapSample): Muestra del MoCap.
+            orientation (bool): Si es True, se envía también el cuaternión de la muestra.
+        """
+        if orientation:
+            self.push(sample.x, sample.y, sample.z, sample.qx, sample.qy, sample.qz, sample.qw)
+        else:
+            self.push(sample.x, sample.y, sample.z)
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Contadores, tasa promedio de envío [Hz] desde la creación y último error.
+        """
+        elapsed = time.perf_counter() - self._t_start
+        return {
+            'pushed': self.pushed,
+            'sent': self.sent,
+            'throttled': self.throttled,
+            'errors': self.errors,
+            'rate_hz': self.sent / elapsed if elapsed > 0 else 0.0,
+            'last_error': self.last_error,
+        }
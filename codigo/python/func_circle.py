@@ -1,15 +1,13 @@
-import json
 import time
-import threading
-import paho.mqtt.client as mqtt
-import matplotlib.pyplot as plt
 from cflib.crazyflie import Crazyflie
 from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 from cflib.crazyflie.high_level_commander import HighLevelCommander
 import cflib.crtp
-from datetime import datetime, timezone
 from crazyflie_python_commands_mod import *
-import numpy as np
+from mocap_stream import MocapStream
+from trajectory_buffer import TrajectoryBuffer
+from extpos_forwarder import ExtPosForwarder
+from trajectory_generator import circle_waypoints
 
 ## Vuelo del dron usando Mocap y Flowdeck, con verificación de vuelo final. Usada para
 ## comprobar que tan diferente es el funcionamiento de la fusión de sensores en Python sin
@@ -23,57 +21,24 @@ URI = "radio://0/80/2M/E7E7E7E7E1"
 MQTT_TOPIC = 'mocap/drone3'
 MQTT_BROKER = '192.168.50.200'
 PORT = 1880
+EXTPOS_HZ = 100  # tasa de envío de la posición del MoCap al dron [Hz]
 
 # -------------------------------------------------------
 # VARIABLES GLOBALES
 # -------------------------------------------------------
-mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
-real_trajectory = []
+real_trajectory = TrajectoryBuffer()  # [t, x, y, z] del MoCap
 theoretical_trajectory = []
 cf = None  # referencia global al dron
-last_ts = None  # timestamp del último mensaje procesado
 
 
 # -------------------------------------------------------
-# CALLBACK MQTT (lectura y envío a EKF)
+# CALLBACK MOCAP (registro de la trayectoria real)
 # -------------------------------------------------------
-def on_message(client, userdata, msg):
-    global mocap_pose, cf, last_ts
-    try:
-        data = json.loads(msg.payload.decode())
-        pos = data['payload']['pose']['position']
-        ts_str = data.get('ts', None)
-
-        # Convertir timestamp ISO 8601 a datetime con zona UTC
-        if ts_str is not None:
-            msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-
-            # Ignorar mensajes antiguos
-            if last_ts is not None and msg_time <= last_ts:
-                return  # este mensaje es viejo
-            last_ts = msg_time
-
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-        # Si el dron está conectado, enviar posición al EKF
-        if cf is not None:
-            set_position(cf, mocap_pose['x'], mocap_pose['y'], mocap_pose['z'])
-
-        # Guardar trayectoria real
-        real_trajectory.append([mocap_pose['x'], mocap_pose['y'], mocap_pose['z']])
+mocap = MocapStream(MQTT_BROKER, PORT, MQTT_TOPIC)
 
-    except Exception as e:
-        print("Error en MQTT:", e)
-        print("Mensaje:", msg.payload.decode())
-
-def start_mqtt():
-    client = mqtt.Client()
-    client.on_message = on_message
-    client.connect(MQTT_BROKER, PORT, 60)
-    client.subscribe(MQTT_TOPIC)
-    client.loop_forever()
+def on_pose(sample):
+    # Guardar trayectoria real (el envío al EKF lo hace el ExtPosForwarder a tasa fija)
+    real_trajectory.append(sample.t_rx, sample.x, sample.y, sample.z)
 
 
 # -------------------------------------------------------
@@ -87,16 +52,14 @@ def fly_circle(scf, radius=0.5, hover_height=0.5, velocity=0.3, num_points=20):
     velocity: velocidad de movimiento [m/s]
     num_points: cantidad de puntos que forman el círculo
     """
-    global mocap_pose, theoretical_trajectory
+    global theoretical_trajectory
 
     try:
         # --- Esperar posición inicial válida ---
         print("Esperando posición inicial del MoCap...")
-        while mocap_pose['x'] == 0 and mocap_pose['y'] == 0 and mocap_pose['z'] == 0:
-            time.sleep(0.1)
+        x0, y0, z0 = mocap.wait_for_pose()
 
         # --- Posición inicial ---
-        x0, y0, z0 = mocap_pose['x'], mocap_pose['y'], mocap_pose['z']
         print(f"Posición inicial detectada: x={x0:.2f}, y={y0:.2f}, z={z0:.2f}")
 
         # --- Despegue ---
@@ -104,22 +67,16 @@ def fly_circle(scf, radius=0.5, hover_height=0.5, velocity=0.3, num_points=20):
         takeoff(scf, height=hover_height, duration=2.0)
         time.sleep(1.0)
 
-        # --- Generar puntos del círculo ---
-        angles = np.linspace(0, 2*np.pi, num_points, endpoint=False)
-        circle_points = [(x0 + radius*np.cos(theta),
-                          y0 + radius*np.sin(theta),
-                          hover_height) for theta in angles]
+        # --- Generar puntos del círculo (cerrado: el último punto es el inicial) ---
+        circle_points = circle_waypoints((x0, y0, z0), radius, num_points, height=hover_height)
+        theoretical_trajectory.extend(circle_points.tolist())
 
-        print("Ejecutando trayectoria circular...")
-        for i, (x, y, z) in enumerate(circle_points):
-            print(f"  → Punto {i+1}: ({x:.2f}, {y:.2f}, {z:.2f})")
-            move_to_position(scf, x, y, z, velocity=velocity)
-            theoretical_trajectory.append([x, y, z])
-            time.sleep(0.2)  # espera corta entre puntos
+        # --- Ir al inicio del círculo ---
+        move_to_position(scf, *circle_points[0], velocity=velocity)
 
-        # --- Volver al inicio del círculo ---
-        move_to_position(scf, x0 + radius, y0, hover_height, velocity=velocity)
-        theoretical_trajectory.append([x0 + radius, y0, hover_height])
+        # --- Trayectoria polinomial a bordo: una sola carga y un solo comando ---
+        print("Ejecutando trayectoria circular...")
+        fly_trajectory(scf, circle_points, velocity=velocity)
 
         # --- Aterrizaje ---
         print("Aterrizando...")
@@ -138,11 +95,12 @@ def fly_circle(scf, radius=0.5, hover_height=0.5, velocity=0.3, num_points=20):
 # -------------------------------------------------------
 def plot_trajectories():
     import numpy as np
+    import matplotlib.pyplot as plt
     if len(real_trajectory) == 0:
         print("No se registró trayectoria real.")
         return
 
-    real = np.array(real_trajectory)
+    real = real_trajectory.positions  # vista (n, 3), sin copia
     theo = np.array(theoretical_trajectory)
 
     fig = plt.figure()
@@ -171,15 +129,25 @@ def main():
     # Inicializar drivers
     cflib.crtp.init_drivers()
 
-    # Hilo MQTT (recibe datos MoCap)
-    mqtt_thread = threading.Thread(target=start_mqtt, daemon=True)
-    mqtt_thread.start()
+    # Cliente MQTT (recibe datos MoCap en su propio hilo)
+    mocap.add_callback(on_pose)
+    mocap.start()
 
     print("Conectando al dron...")
-    cf = connect(URI)
-   
-    # Esperar a que el EKF converja antes del vuelo
-    time.sleep(3.0)
+    cf = connect(URI, reset_estimator=False)
+
+    # Reenvío de la posición del MoCap al EKF a tasa fija, en su propio hilo
+    forwarder = ExtPosForwarder(cf.cf, rate_hz=EXTPOS_HZ, metrics=mocap.metrics)
+    mocap.add_callback(forwarder.on_pose)
+    forwarder.start()
+
+    # Reiniciar el EKF con la posición del MoCap ya llegando y esperar a que converja
+    cf.reset_estimator()
+    if not report_estimator(cf):
+        # Sin convergencia del EKF no se despega
+        forwarder.stop()
+        disconnect(cf)
+        return
 
     try:
 
@@ -194,6 +162,9 @@ def main():
     finally:
         # Aterrizar y cerrar conexión con seguridad
         land(cf)
+        forwarder.stop()
+        print("Envío extpos:", forwarder.stats())
+        print("Ingesta MoCap:", mocap.metrics.snapshot())
         disconnect(cf)
 
         # Graficar trayectorias al final
@@ -1,14 +1,12 @@
-import json
 import time
-import threading
-import paho.mqtt.client as mqtt
-import matplotlib.pyplot as plt
 from cflib.crazyflie import Crazyflie
 from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 from cflib.crazyflie.high_level_commander import HighLevelCommander
 import cflib.crtp
-from datetime import datetime, timezone
 from crazyflie_python_commands_mod import *
+from mocap_stream import MocapStream
+from trajectory_buffer import TrajectoryBuffer
+from extpos_forwarder import ExtPosForwarder
 
 ## Vuelo del dron usando Mocap y Flowdeck, con verificación de vuelo final. Usada para
 ## comprobar que tan diferente es el funcionamiento de la fusión de sensores en Python sin
@@ -22,57 +20,24 @@ URI = "radio://0/80/2M/E7E7E7E7E1"
 MQTT_TOPIC = 'mocap/drone3'
 MQTT_BROKER = '192.168.50.200'
 PORT = 1880
+EXTPOS_HZ = 100  # tasa de envío de la posición del MoCap al dron [Hz]
 
 # -------------------------------------------------------
 # VARIABLES GLOBALES
 # -------------------------------------------------------
-mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
-real_trajectory = []
+real_trajectory = TrajectoryBuffer()  # [t, x, y, z] del MoCap
 theoretical_trajectory = []
 cf = None  # referencia global al dron
-last_ts = None  # timestamp del último mensaje procesado
 
 
 # -------------------------------------------------------
-# CALLBACK MQTT (lectura y envío a EKF)
+# CALLBACK MOCAP (registro de la trayectoria real)
 # -------------------------------------------------------
-def on_message(client, userdata, msg):
-    global mocap_pose, cf, last_ts
-    try:
-        data = json.loads(msg.payload.decode())
-        pos = data['payload']['pose']['position']
-        ts_str = data.get('ts', None)
-
-        # Convertir timestamp ISO 8601 a datetime con zona UTC
-        if ts_str is not None:
-            msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-
-            # Ignorar mensajes antiguos
-            if last_ts is not None and msg_time <= last_ts:
-                return  # este mensaje es viejo
-            last_ts = msg_time
+mocap = MocapStream(MQTT_BROKER, PORT, MQTT_TOPIC)
 
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-        # Si el dron está conectado, enviar posición al EKF
-        if cf is not None:
-            set_position(cf, mocap_pose['x'], mocap_pose['y'], mocap_pose['z'])
-
-        # Guardar trayectoria real
-        real_trajectory.append([mocap_pose['x'], mocap_pose['y'], mocap_pose['z']])
-
-    except Exception as e:
-        print("Error en MQTT:", e)
-        print("Mensaje:", msg.payload.decode())
-
-def start_mqtt():
-    client = mqtt.Client()
-    client.on_message = on_message
-    client.connect(MQTT_BROKER, PORT, 60)
-    client.subscribe(MQTT_TOPIC)
-    client.loop_forever()
+def on_pose(sample):
+    # Guardar trayectoria real (el envío al EKF lo hace el ExtPosForwarder a tasa fija)
+    real_trajectory.append(sample.t_rx, sample.x, sample.y, sample.z)
 
 
 # -------------------------------------------------------
@@ -103,11 +68,12 @@ def fly_simple(cf):
 # -------------------------------------------------------
 def plot_trajectories():
     import numpy as np
+    import matplotlib.pyplot as plt
     if len(real_trajectory) == 0:
         print("No se registró trayectoria real.")
         return
 
-    real = np.array(real_trajectory)
+    real = real_trajectory.positions  # vista (n, 3), sin copia
     theo = np.array(theoretical_trajectory)
 
     fig = plt.figure()
@@ -134,15 +100,25 @@ def main():
     # Inicializar drivers
     cflib.crtp.init_drivers()
 
-    # Hilo MQTT (recibe datos MoCap)
-    mqtt_thread = threading.Thread(target=start_mqtt, daemon=True)
-    mqtt_thread.start()
+    # Cliente MQTT (recibe datos MoCap en su propio hilo)
+    mocap.add_callback(on_pose)
+    mocap.start()
 
     print("Conectando al dron...")
-    cf = connect(URI)
-   
-    # Esperar a que el EKF converja antes del vuelo
-    time.sleep(3.0)
+    cf = connect(URI, reset_estimator=False)
+
+    # Reenvío de la posición del MoCap al EKF a tasa fija, en su propio hilo
+    forwarder = ExtPosForwarder(cf.cf, rate_hz=EXTPOS_HZ, metrics=mocap.metrics)
+    mocap.add_callback(forwarder.on_pose)
+    forwarder.start()
+
+    # Reiniciar el EKF con la posición del MoCap ya llegando y esperar a que converja
+    cf.reset_estimator()
+    if not report_estimator(cf):
+        # Sin convergencia del EKF no se despega
+        forwarder.stop()
+        disconnect(cf)
+        return
 
     try:
 
@@ -157,6 +133,9 @@ def main():
     finally:
         # Aterrizar y cerrar conexión con seguridad
         land(cf)
+        forwarder.stop()
+        print("Envío extpos:", forwarder.stats())
+        print("Ingesta MoCap:", mocap.metrics.snapshot())
         disconnect(cf)
 
         # Graficar trayectorias al final
@@ -0,0 +1,171 @@
+"""
+Este módulo proporciona una cola acotada (HandoffQueue) entre el hilo de red de paho y los
+consumidores lentos (gráficas, grabación, radio). Los callbacks de MocapStream se ejecutan en
+el hilo MQTT: si uno tarda, frena la recepción de todos los demás, incluida la pose que va al
+dron. Con HandoffQueue el callback solo encola la muestra (sin bloquear) y un hilo propio del
+consumidor la procesa; cuando la cola se llena se aplica la política elegida:
+
+    - 'drop_oldest': se descarta la muestra más antigua de la cola (se conservan las recientes).
+    - 'drop_newest': se descarta la muestra que llega (se conserva el orden de lo encolado).
+    - 'coalesce': la cola guarda solo la última muestra; las no procesadas se reemplazan.
+
+Cada consumidor tiene sus propias métricas de retraso (espera en cola, tiempo de proceso,
+profundidad y descartes), así un visualizador lento no afecta a nadie más.
+"""
+
+import threading
+import time
+from collections import deque
+
+from ingest_metrics import LatencyHistogram
+
+POLICIES = ('drop_oldest', 'drop_newest', 'coalesce')
+
+
+class HandoffQueue:
+    """
+    Cola acotada con un hilo consumidor propio.
+
+    Uso:
+        plot_queue = HandoffQueue(update_plot, maxsize=1, policy='coalesce', name='plot')
+        mocap.add_callback(plot_queue.put)
+        plot_queue.start()
+        ...
+        plot_queue.stop()
+        print(plot_queue.stats())
+    """
+
+    def __init__(self, callback, maxsize=64, policy='drop_oldest', name=None):
+        """
+        Parámetros:
+            callback (callable): Función del consumidor, callback(item); se ejecuta en el hilo de la cola.
+            maxsize (int): Cantidad máxima de elementos en espera (con 'coalesce' siempre es 1).
+            policy (str): 'drop_oldest', 'drop_newest' o 'coalesce'.
+            name (str): Nombre del consumidor (hilo y reportes).
+
+        Errores:
+            Lanza ValueError si la política no es válida o maxsize no es positivo.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid policy: {policy!r}")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.callback = callback
+        self.maxsize = 1 if policy == 'coalesce' else maxsize
+        self.policy = policy
+        self.name = name or getattr(callback, '__name__', 'HandoffQueue')
+
+        self._items = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self._running = False
+
+        # Métricas del consumidor
+        self.wait_ns = LatencyHistogram()       # tiempo en cola (put -> inicio del callback)
+        self.process_ns = LatencyHistogram()    # duración del callback
+        self.enqueued = 0     # elementos recibidos
+        self.processed = 0    # elementos procesados
+        self.dropped = 0      # elementos descartados por cola llena
+        self.coalesced = 0    # elementos reemplazados por uno más nuevo ('coalesce')
+        self.errors = 0       # excepciones del callback
+        self.max_depth = 0    # mayor profundidad observada
+
+    def put(self, item):
+        """
+        Encola un elemento sin bloquear; se puede usar directamente como callback de
+        MocapStream/MocapBody.
+
+        Parámetros:
+            item: Elemento a entregar al consumidor.
+
+        Retorno:
+            bool: False si el elemento se descartó (política 'drop_newest' con la cola llena).
+        """
+        entry = (item, time.perf_counter_ns())
+        with self._cond:
+            self.enqueued += 1
+            items = self._items
+            if len(items) >= self.maxsize:
+                if self.policy == 'drop_newest':
+                    self.dropped += 1
+                    return False
+                items.popleft()
+                if self.policy == 'coalesce':
+                    self.coalesced += 1
+                else:
+                    self.dropped += 1
+            items.append(entry)
+            if len(items) > self.max_depth:
+                self.max_depth = len(items)
+            self._cond.notify()
+        return True
+
+    def __len__(self):
+        return len(self._items)
+
+    def start(self):
+        """Inicia el hilo del consumidor."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, drain=False):
+        """
+        Detiene el hilo del consumidor.
+
+        Parámetros:
+            drain (bool): Si es True, se procesan los elementos pendientes antes de detenerse;
+                          si es False, se descartan.
+        """
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            if not drain:
+                self.dropped += len(self._items)
+                self._items.clear()
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Contadores, profundidad actual y máxima, y retraso del consumidor en ms
+                  (espera en cola y duración del callback).
+        """
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'depth': len(self._items),
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'wait_ms': self.wait_ns.summary(),
+            'process_ms': self.process_ns.summary(),
+        }
+
+    def _run(self):
+        items = self._items
+        while True:
+            with self._cond:
+                while not items and self._running:
+                    self._cond.wait()
+                if not items:
+                    return
+                item, t_put = items.popleft()
+
+            t0 = time.perf_counter_ns()
+            self.wait_ns.record(t0 - t_put)
+            try:
+                self.callback(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error en consumidor {self.name}:", e)
+            self.process_ns.record(time.perf_counter_ns() - t0)
+            self.processed += 1
@@ -0,0 +1,199 @@
+"""
+Este módulo proporciona la instrumentación del camino de ingesta del MoCap, pensada para
+dejarse activa durante los vuelos: histogramas de latencia con precisión relativa fija (estilo
+HDR) y contadores de paquetes, con una instantánea que se puede consultar en cualquier momento.
+
+Etapas medidas:
+    - ts_to_rx: `ts` del servidor -> recepción en el callback MQTT (incluye el desfase de
+      relojes entre el servidor y este equipo).
+    - rx_to_decoded: recepción -> paquete decodificado.
+    - decoded_to_sent: paquete decodificado -> posición enviada al Crazyflie (ExtPosForwarder).
+
+Reemplaza los contadores globales y las listas de 5000 elementos de medicionHZ.py y
+medicionLAG.py: registrar un valor es O(1) y la memoria es fija.
+"""
+
+import time
+from array import array
+
+
+# -------------------------------------------------------
+# HISTOGRAMA DE LATENCIAS
+# -------------------------------------------------------
+class LatencyHistogram:
+    """
+    Histograma log-lineal de enteros no negativos (por ejemplo latencias en ns): cada potencia
+    de dos se divide en 2**(precision - 1) buckets, así el error relativo de un percentil es
+    menor que 1 / 2**(precision - 1) con memoria fija. Un solo hilo escritor; las lecturas
+    desde otros hilos pueden quedar desfasadas en una muestra.
+
+    Uso:
+        hist = LatencyHistogram()
+        hist.record(time.perf_counter_ns() - t0)
+        print(hist.percentile(99) / 1e6, "ms")
+    """
+
+    def __init__(self, precision=7, max_value=60 * 10**9):
+        """
+        Parámetros:
+            precision (int): Bits de precisión por potencia de dos (7 -> error < 1.6 %).
+            max_value (int): Mayor valor distinguible; los valores mayores se acumulan en el último bucket.
+
+        Errores:
+            Lanza ValueError si precision es menor que 2 o max_value no es positivo.
+        """
+        if precision < 2 or max_value <= 0:
+            raise ValueError("precision must be >= 2 and max_value positive")
+        self.precision = precision
+        self.max_value = max_value
+        self._sub = 1 << precision
+        self._half = self._sub >> 1
+        self._counts = array('q', [0] * (self._index(max_value) + 1))
+        self.reset()
+
+    def reset(self):
+        """Elimina todos los valores registrados."""
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.negative = 0    # valores negativos registrados como 0 (p. ej. desfase de relojes)
+
+    def _index(self, value):
+        if value < self._sub:
+            return value
+        shift = value.bit_length() - self.precision
+        return self._sub + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _lower_bound(self, index):
+        if index < self._sub:
+            return index
+        shift, offset = divmod(index - self._sub, self._half)
+        return (offset + self._half) << (shift + 1)
+
+    def record(self, value):
+        """
+        Registra un valor.
+
+        Parámetros:
+            value (int): Valor a registrar (se trunca a entero; los negativos se cuentan como 0).
+        """
+        value = int(value)
+        if value < 0:
+            self.negative += 1
+            value = 0
+        elif value > self.max_value:
+            value = self.max_value
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, q):
+        """
+        Parámetros:
+            q (float): Percentil entre 0 y 100.
+
+        Retorno:
+            int: Valor del percentil (límite inferior de su bucket), o 0 si no hay valores.
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= target:
+                return min(max(self._lower_bound(index), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        """
+        Retorno:
+            float: Promedio de los valores registrados (0.0 si no hay).
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, scale=1e-6):
+        """
+        Parámetros:
+            scale (float): Factor de conversión de los valores (por defecto ns -> ms).
+
+        Retorno:
+            dict: Cantidad, promedio, p50, p90, p99, p99.9 y máximo, en las unidades de `scale`.
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean() * scale,
+            'p50': self.percentile(50) * scale,
+            'p90': self.percentile(90) * scale,
+            'p99': self.percentile(99) * scale,
+            'p99.9': self.percentile(99.9) * scale,
+            'max': self.max * scale,
+        }
+
+
+# -------------------------------------------------------
+# MÉTRICAS DE INGESTA
+# -------------------------------------------------------
+class IngestMetrics:
+    """
+    Histogramas por etapa y contadores del camino de ingesta. MocapStream y MocapRouter
+    crean una instancia propia (atributo `metrics`); ExtPosForwarder puede compartirla para
+    registrar la etapa decoded_to_sent.
+
+    Uso:
+        mocap = MocapStream(MQTT_BROKER, PORT, MQTT_TOPIC)
+        forwarder = ExtPosForwarder(cf, metrics=mocap.metrics)
+        ...
+        print(mocap.metrics.snapshot())
+    """
+
+    STAGES = ('ts_to_rx', 'rx_to_decoded', 'decoded_to_sent')
+
+    def __init__(self, precision=7):
+        """
+        Parámetros:
+            precision (int): Bits de precisión de los histogramas (ver LatencyHistogram).
+        """
+        self.ts_to_rx = LatencyHistogram(precision)
+        self.rx_to_decoded = LatencyHistogram(precision)
+        self.decoded_to_sent = LatencyHistogram(precision)
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Reinicia los contadores y el tiempo de inicio de la medición."""
+        self.started = time.time()
+        self.received = 0     # paquetes recibidos
+        self.malformed = 0    # paquetes que no se pudieron decodificar
+        self.stale = 0        # paquetes antiguos o duplicados descartados
+        self.unrouted = 0     # paquetes sin cuerpo rígido registrado (MocapRouter)
+
+    def reset(self):
+        """Reinicia contadores e histogramas (por ejemplo al comenzar una misión)."""
+        for stage in self.STAGES:
+            getattr(self, stage).reset()
+        self.reset_counters()
+
+    def snapshot(self):
+        """
+        Retorno:
+            dict: Contadores, tasa promedio de recepción [Hz] y resumen de cada etapa en ms.
+        """
+        elapsed = time.time() - self.started
+        snapshot = {
+            'elapsed_s': elapsed,
+            'received': self.received,
+            'rate_hz': self.received / elapsed if elapsed > 0 else 0.0,
+            'malformed': self.malformed,
+            'stale': self.stale,
+            'unrouted': self.unrouted,
+        }
+        for stage in self.STAGES:
+            snapshot[stage + '_ms'] = getattr(self, stage).summary()
+        return snapshot
@@ -0,0 +1,344 @@
+"""
+Este módulo proporciona LogManager: administra los bloques de log del Crazyflie a partir de
+conjuntos de variables con una tasa deseada, en lugar de un LogConfig fijo por conjunto.
+
+Cada paquete de log del Crazyflie lleva como máximo 26 bytes de datos (LogConfig.MAX_LEN) y el
+firmware admite 16 bloques. LogManager reparte los conjuntos activos con el mismo periodo en
+bloques compartidos (primer ajuste decreciente por conjunto): cada conjunto que entra en un
+paquete queda completo en un solo bloque, así sus valores llegan siempre del mismo paquete.
+Solo los conjuntos de más de 26 bytes se reparten en varios bloques propios.
+Con `compact=True` cada variable se pide en su variante más chica que ofrezca el firmware:
+
+    - int16 en mm (grupo stateEstimateZ) para la posición y la velocidad, escalada a m.
+    - FP16 (media precisión, ~3 cifras significativas) para el resto de las variables float.
+
+Así la pose completa (x, y, z, roll, pitch, yaw) ocupa 12 bytes en lugar de 24. Los conjuntos
+se pueden iniciar y detener en cualquier momento: solo se rearman los bloques de su periodo.
+Cada bloque y cada conjunto cuentan los paquetes recibidos para comparar la tasa real con la
+pedida.
+"""
+
+import threading
+import time
+
+from cflib.crazyflie.log import LogConfig, LogTocElement
+from cflib.utils.callbacks import Caller
+
+# Variantes int16 del firmware: variable -> (variante, escala a las unidades de la original)
+COMPACT_VARIANTS = {
+    'stateEstimate.x': ('stateEstimateZ.x', 0.001),
+    'stateEstimate.y': ('stateEstimateZ.y', 0.001),
+    'stateEstimate.z': ('stateEstimateZ.z', 0.001),
+    'stateEstimate.vx': ('stateEstimateZ.vx', 0.001),
+    'stateEstimate.vy': ('stateEstimateZ.vy', 0.001),
+    'stateEstimate.vz': ('stateEstimateZ.vz', 0.001),
+}
+
+MIN_PERIOD_MS = 10      # resolución del periodo de log del firmware (100 Hz máximo)
+MAX_PERIOD_MS = 2540
+
+
+def rate_to_period(rate_hz):
+    """
+    Parámetros:
+        rate_hz (float): Tasa deseada [Hz].
+
+    Retorno:
+        int: Periodo de log válido más cercano [ms] (múltiplo de 10, entre 10 y 2540).
+    """
+    period = int(round(1000.0 / rate_hz / MIN_PERIOD_MS)) * MIN_PERIOD_MS
+    return min(max(period, MIN_PERIOD_MS), MAX_PERIOD_MS)
+
+
+def _type_size(ctype):
+    return LogTocElement.get_size_from_id(LogTocElement.get_id_from_cstring(ctype))
+
+
+class LogSet:
+    """
+    Conjunto de variables con una tasa deseada. Expone `data_received_cb` con la misma firma
+    que LogConfig (timestamp, data, logset), así se puede usar donde antes se usaba un LogConfig
+    (por ejemplo AsyncLogStream). Las claves de `data` son los nombres pedidos, con los valores
+    ya convertidos a sus unidades originales.
+    """
+
+    def __init__(self, name, variables, period_ms, compact):
+        self.name = name
+        self.variables = tuple(variables)
+        self.period_ms = period_ms
+        self.compact = compact
+        self.active = False
+        self.data_received_cb = Caller()
+        self.fields = ()        # (nombre pedido, variable del log, tipo, escala)
+        self.received = 0
+        self.t_start = None
+
+    def _emit(self, timestamp, values):
+        data = {name: values[log_name] * scale for name, log_name, _, scale in self.fields}
+        self.received += 1
+        self.data_received_cb.call(timestamp, data, self)
+
+    def rate_hz(self):
+        """Tasa de recepción promedio desde que se inició [Hz]."""
+        if not self.active or self.t_start is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.t_start
+        return self.received / elapsed if elapsed > 0 else 0.0
+
+
+class _LogBlock:
+    """Bloque de log del firmware con las variables de uno o más conjuntos."""
+
+    def __init__(self, name, period_ms):
+        self.config = LogConfig(name=name, period_in_ms=period_ms)
+        self.period_ms = period_ms
+        self.fields = []        # (variable del log, tipo)
+        self.size = 0
+        self.triggers = ()      # (conjunto, otros bloques del conjunto) que se notifican con cada paquete
+        self.received = 0
+        self.t_start = None
+
+
+class LogManager:
+    """
+    Bloques de log de un Crazyflie conectado, armados a partir de conjuntos de variables.
+
+    Uso:
+        logs = LogManager(session.cf)
+        pose = logs.add('Pose', POSE_VARIABLES, rate_hz=100, callback=on_pose)
+        logs.add('Battery', ['pm.vbat'], rate_hz=2)
+        logs.stop('Battery')
+        ...
+        print(logs.stats())
+        logs.close()
+    """
+
+    def __init__(self, cf):
+        """
+        Parámetros:
+            cf (Crazyflie): Objeto Crazyflie conectado (con el TOC de log ya descargado).
+        """
+        self.cf = cf
+        self.sets = {}          # nombre -> LogSet
+        self._blocks = {}       # periodo [ms] -> lista de _LogBlock
+        self._values = {}       # variable del log -> último valor recibido
+        self._lock = threading.Lock()
+        self._count = 0
+
+    # -------------------------------------------------------
+    # CONJUNTOS
+    # -------------------------------------------------------
+    def add(self, name, variables, rate_hz=10, callback=None, compact=True, start=True):
+        """
+        Registra un conjunto de variables y, si start es True, lo inicia.
+
+        Parámetros:
+            name (str): Nombre del conjunto.
+            variables (sequence): Variables del log ('grupo.nombre').
+            rate_hz (float): Tasa deseada [Hz] (se redondea a un periodo múltiplo de 10 ms).
+            callback (callable): Función con la firma callback(timestamp, data, logset).
+            compact (bool): Si es True se usan las variantes int16/FP16 de las variables.
+            start (bool): Si es True el conjunto se inicia de inmediato.
+
+        Retorno:
+            LogSet: Conjunto registrado.
+
+        Errores:
+            Lanza ValueError si ya existe un conjunto con ese nombre, KeyError si una variable
+            no está en el TOC y AttributeError si se supera la cantidad de bloques o variables
+            del firmware.
+        """
+        if name in self.sets:
+            raise ValueError(f"Log set already exists: {name!r}")
+        log_set = LogSet(name, variables, rate_to_period(rate_hz), compact)
+        log_set.fields = tuple(self._resolve(variable, compact) for variable in log_set.variables)
+        if callback is not None:
+            log_set.data_received_cb.add_callback(callback)
+        self.sets = {**self.sets, name: log_set}
+        if start:
+            self.start(name)
+        return log_set
+
+    def start(self, name):
+        """Inicia un conjunto (rearma los bloques de su periodo)."""
+        log_set = self.sets[name]
+        if log_set.active:
+            return
+        with self._lock:
+            log_set.active = True
+            log_set.received = 0
+            log_set.t_start = time.perf_counter()
+            try:
+                self._rebuild(log_set.period_ms)
+            except Exception:
+                log_set.active = False
+                self._rebuild(log_set.period_ms)
+                raise
+
+    def stop(self, name):
+        """Detiene un conjunto (rearma los bloques de su periodo sin sus variables)."""
+        log_set = self.sets[name]
+        if not log_set.active:
+            return
+        with self._lock:
+            log_set.active = False
+            self._rebuild(log_set.period_ms)
+
+    def remove(self, name):
+        """Detiene y elimina un conjunto."""
+        self.stop(name)
+        self.sets = {k: v for k, v in self.sets.items() if k != name}
+
+    def close(self):
+        """Detiene y borra todos los bloques del Crazyflie."""
+        with self._lock:
+            for log_set in self.sets.values():
+                log_set.active = False
+            for period in list(self._blocks):
+                self._rebuild(period)
+
+    def _resolve(self, variable, compact):
+        toc = self.cf.log.toc
+        element = toc.get_element_by_complete_name(variable)
+        if element is None:
+            raise KeyError(f"Variable {variable} not in TOC")
+        if compact:
+            variant = COMPACT_VARIANTS.get(variable)
+            if variant is not None:
+                compact_element = toc.get_element_by_complete_name(variant[0])
+                if compact_element is not None:
+                    return (variable, variant[0], compact_element.ctype, variant[1])
+            if element.ctype == 'float':
+                return (variable, variable, 'FP16', 1.0)
+        return (variable, variable, element.ctype, 1.0)
+
+    # -------------------------------------------------------
+    # BLOQUES
+    # -------------------------------------------------------
+    def _rebuild(self, period_ms):
+        # Detener y borrar los bloques actuales de este periodo
+        for block in self._blocks.pop(period_ms, ()):
+            if block.config.cf is not None:     # solo los bloques que llegaron a agregarse
+                block.config.stop()
+                block.config.delete()
+
+        active = [s for s in self.sets.values() if s.active and s.period_ms == period_ms]
+        if not active:
+            return
+
+        # Variables sin repetir; si dos conjuntos piden la misma con distinto tipo, se usa el más grande
+        fields = {}
+        for log_set in active:
+            for _, log_name, ctype, _ in log_set.fields:
+                if log_name not in fields or _type_size(ctype) > _type_size(fields[log_name]):
+                    fields[log_name] = ctype
+
+        blocks = []
+        triggers = {}           # bloque -> [(conjunto, otros bloques del conjunto)]
+
+        def new_block():
+            self._count += 1
+            block = _LogBlock(f'LogManager{self._count}', period_ms)
+            blocks.append(block)
+            return block
+
+        def place(block, log_name):
+            block.fields.append((log_name, fields[log_name]))
+            block.size += _type_size(fields[log_name])
+
+        # Primer ajuste decreciente por conjunto en bloques de LogConfig.MAX_LEN bytes. Una
+        # variable de dos conjuntos puede quedar en dos bloques: así ninguno se parte.
+        def set_names(log_set):
+            return list(dict.fromkeys(log_name for _, log_name, _, _ in log_set.fields))
+
+        def set_size(names):
+            return sum(_type_size(fields[log_name]) for log_name in names)
+
+        for log_set in sorted(active, key=lambda s: -set_size(set_names(s))):
+            names = set_names(log_set)
+            if set_size(names) <= LogConfig.MAX_LEN:
+                for block in blocks:
+                    present = {log_name for log_name, _ in block.fields}
+                    missing = [log_name for log_name in names if log_name not in present]
+                    if block.size + set_size(missing) <= LogConfig.MAX_LEN:
+                        break
+                else:
+                    block = new_block()
+                    missing = names
+                for log_name in missing:
+                    place(block, log_name)
+                used = [block]
+            else:
+                # Conjunto más grande que un paquete: se reparte en bloques propios
+                used = []
+                for log_name in sorted(names, key=lambda n: -_type_size(fields[n])):
+                    block = next((b for b in used if b.size + _type_size(fields[log_name]) <= LogConfig.MAX_LEN), None)
+                    if block is None:
+                        block = new_block()
+                        used.append(block)
+                    place(block, log_name)
+            # Se notifica con el último bloque del conjunto, una vez que todos entregaron datos
+            triggers.setdefault(used[-1], []).append((log_set, tuple(used[:-1])))
+
+        self._blocks[period_ms] = blocks
+        for block in blocks:
+            block.triggers = tuple(triggers.get(block, ()))
+            for log_name, ctype in block.fields:
+                block.config.add_variable(log_name, ctype)
+            block.config.data_received_cb.add_callback(self._make_callback(block))
+            self.cf.log.add_config(block.config)
+            block.t_start = time.perf_counter()
+            block.config.start()
+
+    def _make_callback(self, block):
+        values = self._values
+
+        def on_data(timestamp, data, logconf):
+            values.update(data)
+            block.received += 1
+            for log_set, others in block.triggers:
+                # Un conjunto repartido en varios bloques se entrega recién cuando todos sus
+                # bloques recibieron al menos un paquete (antes faltarían valores)
+                if all(other.received for other in others):
+                    log_set._emit(timestamp, values)
+        return on_data
+
+    def blocks(self):
+        """
+        Retorno:
+            list: Bloques activos (_LogBlock) de todos los periodos.
+        """
+        return [block for blocks in self._blocks.values() for block in blocks]
+
+    # -------------------------------------------------------
+    # MÉTRICAS
+    # -------------------------------------------------------
+    def stats(self):
+        """
+        Retorno:
+            dict: Por bloque, su periodo, bytes usados, variables, paquetes recibidos y tasa real
+                  frente a la pedida [Hz]; por conjunto, si está activo y su tasa real.
+        """
+        now = time.perf_counter()
+        blocks = []
+        for block in self.blocks():
+            elapsed = now - block.t_start
+            blocks.append({
+                'name': block.config.name,
+                'period_ms': block.period_ms,
+                'bytes': block.size,
+                'variables': [f'{log_name}:{ctype}' for log_name, ctype in block.fields],
+                'received': block.received,
+                'rate_hz': block.received / elapsed if elapsed > 0 else 0.0,
+                'target_hz': 1000.0 / block.period_ms,
+            })
+        sets = {
+            name: {
+                'active': log_set.active,
+                'period_ms': log_set.period_ms,
+                'received': log_set.received,
+                'rate_hz': log_set.rate_hz(),
+            }
+            for name, log_set in self.sets.items()
+        }
+        return {'blocks': blocks, 'sets': sets}
@@ -1,5 +1,4 @@
 import time
-import json
 import threading
 import numpy as np
 from cflib.crazyflie import Crazyflie
@@ -7,9 +6,11 @@ from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 from cflib.crazyflie.syncLogger import SyncLogger
 from cflib.crazyflie.log import LogConfig
 from cflib.crtp import init_drivers
-import paho.mqtt.client as mqtt
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from extpos_forwarder import ExtPosForwarder
+from mocap_stream import MocapStream
+from toc_cache import cache_dir
 
 # Gráfica en tiempo real de la posición según MoCap y la posición según el dron Crazyflie,
 # con retroalimentación del MoCap.
@@ -21,73 +22,52 @@ URI = "radio://0/64/2M/E7E7E7E7E8"
 MQTT_TOPIC = 'mocap/drone3'
 BROKER = '192.168.50.200'
 PORT = 1880
+EXTPOS_HZ = 100  # tasa de envío de la posición del MoCap al dron [Hz]
 
 # Variables globales
-mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
 cf_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
-cf = None  # referencia global al dron
 max_len = 100 # trayectoria corta
 mocap_traj = {'x': [], 'y': [], 'z': []}
 cf_traj = {'x': [], 'y': [], 'z': []}
 
 # -------------------------------------------------------
-# CALLBACK MQTT (lectura y envío al dron)
+# CLIENTE MOCAP
 # -------------------------------------------------------
-def on_message(client, userdata, msg):
-    global mocap_pose, cf
-    try:
-        data = json.loads(msg.payload.decode())
-        pos = data['payload']['pose']['position']
-
-        # Actualizar posición del MoCap
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-        # Si el dron está conectado, enviar posición al dron
-        if cf is not None and cf.is_connected():
-            cf.extpos.send_extpos(
-                mocap_pose['x'],
-                mocap_pose['y'],
-                mocap_pose['z']
-            )
-        else:
-            print("No hay un cf conectado")
-
-    except Exception as e:
-        print("Error en MQTT:", e)
-        print("Mensaje:", msg.payload.decode())
-
-def start_mqtt():
-    client = mqtt.Client()
-    client.on_message = on_message
-    client.connect(BROKER, PORT, 60)
-    client.subscribe(MQTT_TOPIC)
-    client.loop_forever()
+mocap = MocapStream(BROKER, PORT, MQTT_TOPIC)
 
 # -------------------------------------------------------
 # LECTURA CRAZYFLIE
 # -------------------------------------------------------
 def start_cf_logging():
-    global cf_pose, cf
+    global cf_pose
     init_drivers(enable_debug_driver=False)
 
-    with SyncCrazyflie(URI, cf=Crazyflie(rw_cache='./cache')) as scf:        
+    with SyncCrazyflie(URI, cf=Crazyflie(rw_cache=cache_dir())) as scf:        
         cf = scf.cf
-        cf.param.set_value('stabilizer.estimator', '2')  # 2 = Kalman
-        
-        # Configurar logger
-        log_conf = LogConfig(name='Crazyflie', period_in_ms=50)
-        log_conf.add_variable('stateEstimate.x', 'float')
-        log_conf.add_variable('stateEstimate.y', 'float')
-        log_conf.add_variable('stateEstimate.z', 'float')
-
-        with SyncLogger(scf, log_conf) as logger:
-            for log_entry in logger:
-                data = log_entry[1]
-                cf_pose['x'] = data['stateEstimate.x']
-                cf_pose['y'] = data['stateEstimate.y']
-                cf_pose['z'] = data['stateEstimate.z']
+
+        # Reenvío de la posición del MoCap al EKF a tasa fija, en su propio hilo
+        forwarder = ExtPosForwarder(cf, rate_hz=EXTPOS_HZ, metrics=mocap.metrics)
+        mocap.add_callback(forwarder.on_pose)
+        forwarder.start()
+
+        try:
+            cf.param.set_value('stabilizer.estimator', '2')  # 2 = Kalman
+            
+            # Configurar logger
+            log_conf = LogConfig(name='Crazyflie', period_in_ms=50)
+            log_conf.add_variable('stateEstimate.x', 'float')
+            log_conf.add_variable('stateEstimate.y', 'float')
+            log_conf.add_variable('stateEstimate.z', 'float')
+
+            with SyncLogger(scf, log_conf) as logger:
+                for log_entry in logger:
+                    data = log_entry[1]
+                    cf_pose['x'] = data['stateEstimate.x']
+                    cf_pose['y'] = data['stateEstimate.y']
+                    cf_pose['z'] = data['stateEstimate.z']
+        finally:
+            mocap.remove_callback(forwarder.on_pose)
+            forwarder.stop()
 
 # -------------------------------------------------------
 # GRAFICADO EN TIEMPO REAL
@@ -115,6 +95,10 @@ ax.view_init(elev=30, azim=135)  # angulo de vista
 ax.set_title("Comparación de posición: Crazyflie vs MoCap")
 
 def update(frame):
+    # Última posición del MoCap (origen mientras no lleguen datos)
+    x, y, z = mocap.get_pose() or (0.0, 0.0, 0.0)
+    mocap_pose = {'x': x, 'y': y, 'z': z}
+
     # Actualizar trayectorias
     for src, traj in [(mocap_pose, mocap_traj), (cf_pose, cf_traj)]:
         for k in traj:
@@ -142,10 +126,9 @@ ani = FuncAnimation(fig, update, interval=100)
 # -------------------------------------------------------
 # HILOS PARA MQTT Y CF
 # -------------------------------------------------------
-mqtt_thread = threading.Thread(target=start_mqtt, daemon=True)
 cf_thread = threading.Thread(target=start_cf_logging, daemon=True)
 
-mqtt_thread.start()
+mocap.start()
 cf_thread.start()
 
 plt.show()
@@ -3,11 +3,13 @@ import matplotlib.pyplot as plt
 import threading
 import atexit
 import time
-from datetime import datetime, timezone
 import json
 from cflib.crazyflie import Crazyflie
 from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 import cflib.crtp
+from mocap_time import parse_ts_ns
+from reorder_buffer import ReorderBuffer
+from toc_cache import cache_dir
 
 # Medición y grafica de retraso (LAG) de los mensajes recibidos del servidor MQTT.
 
@@ -18,11 +20,14 @@ URI = "radio://0/64/2M/E7E7E7E7E8"
 BROKER = '192.168.50.200'
 TOPIC = 'mocap/drone3'
 DURACION = 60  # segundos
+REORDER_DEPTH = 4       # muestras retenidas para reordenar (0 = descartar todo lo que no sea más reciente)
+REORDER_DELAY = 0.01    # tiempo máximo de retención en la ventana [s]
 
 mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
 cf = None          # referencia al dron
 run_program = True
-last_ts = None
+reorder = ReorderBuffer(REORDER_DEPTH, REORDER_DELAY)
+reorder_lock = threading.Lock()     # la ventana la usan el hilo MQTT y el hilo principal
 
 total_msgs = 0
 processed_msgs = 0
@@ -36,7 +41,7 @@ start_time = time.time()
 # -------------------------------------------------------
 def on_message(client, userdata, msg):
     """Callback que calcula el lag y envía posición al dron."""
-    global idx, mocap_pose, cf, total_msgs, processed_msgs, last_ts
+    global cf, total_msgs
     #Si el dron aún no está conectado, no procesar mensajes
     if cf is None: 
         return
@@ -47,41 +52,59 @@ def on_message(client, userdata, msg):
         ts_str = data.get('ts', None) # tiempo de envío (ts del paquete)
 
         total_msgs += 1
+        position = (float(pos['x']), float(pos['y']), float(pos['z']))
+
+        # Validar timestamp: los mensajes desordenados se reordenan en la ventana y solo
+        # se descartan los tardíos o duplicados
+        with reorder_lock:
+            if ts_str is not None:
+                released = reorder.push(parse_ts_ns(ts_str), position)
+            else:
+                released = [position]
+
+            for position in released:
+                procesar(position, ts_str is not None)
 
-        # Validar timestamp
-        if ts_str is not None:
-            msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-
-            # Ignorar mensajes antiguos o duplicados
-            if last_ts is not None and msg_time <= last_ts:
-                return
-            last_ts = msg_time
-
-            # Guardar datos para gráfica
-            if idx < 5000:
-                ratio = processed_msgs / total_msgs if total_msgs > 0 else 0
-                processed_ratio[idx] = ratio
-                timestamps[idx] = time.time() - start_time
-                idx += 1
-
-        processed_msgs += 1
-
-        # Actualizar posición
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-        # Enviar posición al dron (EKF)
-        cf.extpos.send_extpos(
-            mocap_pose['x'],
-            mocap_pose['y'],
-            mocap_pose['z']
-        )
-    
     except Exception as e:
         print("Error en MQTT:", e)
 
 
+def procesar(position, con_ts):
+    """Actualiza la posición, la envía al dron y guarda los datos para la gráfica."""
+    global idx, processed_msgs
+
+    # Guardar datos para gráfica
+    if con_ts and idx < 5000:
+        ratio = processed_msgs / total_msgs if total_msgs > 0 else 0
+        processed_ratio[idx] = ratio
+        timestamps[idx] = time.time() - start_time
+        idx += 1
+
+    processed_msgs += 1
+
+    # Actualizar posición
+    mocap_pose['x'], mocap_pose['y'], mocap_pose['z'] = position
+
+    # Enviar posición al dron (EKF)
+    cf.extpos.send_extpos(
+        mocap_pose['x'],
+        mocap_pose['y'],
+        mocap_pose['z']
+    )
+
+
+def liberar(release):
+    """
+    Procesa las muestras que la ventana libera sin esperar un paquete nuevo.
+
+    Parámetros:
+        release (callable): reorder.poll (muestras vencidas) o reorder.flush (todas).
+    """
+    with reorder_lock:
+        for position in release():
+            procesar(position, True)
+
+
 def medir_duracion():
     """Controla el tiempo total de ejecución."""
     global run_program
@@ -103,6 +126,7 @@ def mostrar_resultados_finales():
     print(f"Mensajes totales: {total_msgs}")
     print(f"Mensajes procesados: {processed_msgs}")
     print(f"Porcentaje procesado: {(processed_msgs/total_msgs)*100:.2f}%")
+    print(f"Reordenados: {reorder.reordered}, tardíos: {reorder.late}, duplicados: {reorder.duplicate}")
 
     if not timestamps:
         print("No se recibieron datos.")
@@ -127,7 +151,7 @@ cflib.crtp.init_drivers()
 
 # Conectar al dron
 print("Conectando al dron...")
-with SyncCrazyflie(URI, cf=Crazyflie(rw_cache='./cache')) as scf:
+with SyncCrazyflie(URI, cf=Crazyflie(rw_cache=cache_dir())) as scf:
     cf = scf.cf
     print("Conectado correctamente.")
 
@@ -143,8 +167,14 @@ with SyncCrazyflie(URI, cf=Crazyflie(rw_cache='./cache')) as scf:
     threading.Thread(target=client.loop_forever, daemon=True).start()
     threading.Thread(target=medir_duracion, daemon=True).start()
     
-    # Esperar mientras se ejecuta la medición
+    # Esperar mientras se ejecuta la medición; las muestras retenidas en la ventana se
+    # liberan al vencer REORDER_DELAY aunque no lleguen paquetes nuevos
     while run_program:
-        time.sleep(0.5)
+        time.sleep(REORDER_DELAY)
+        liberar(reorder.poll)
+
+    # Las últimas muestras retenidas se procesan antes de desconectar el dron
+    client.disconnect()
+    liberar(reorder.flush)
 
 print("Medición finalizada, el dron se desconectará automáticamente.")
@@ -0,0 +1,54 @@
+import time
+from mocap_stream import MocapStream, decode_mocap, encode_mocap_binary
+from medicion_ingesta import generar_paquetes
+
+# Costo de CPU por mensaje del JSON del servidor frente al formato binario compacto, con los
+# mismos paquetes sintéticos de medicion_ingesta.py (no requiere servidor MQTT ni dron).
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+N_PAQUETES = 100_000
+FRECUENCIAS = [100, 500, 1000]   # para expresar el costo como fracción de CPU
+
+# -------------------------------------------------------
+# MEDICIÓN
+# -------------------------------------------------------
+def medir(handler, paquetes):
+    """Tiempo promedio por mensaje [us] de handler(payload) sobre todos los paquetes."""
+    t0 = time.perf_counter()
+    for payload in paquetes:
+        handler(payload)
+    return (time.perf_counter() - t0) / len(paquetes) * 1e6
+
+
+def main():
+    json_paquetes = generar_paquetes(N_PAQUETES)
+    bin_paquetes = [encode_mocap_binary(decode_mocap(p)) for p in json_paquetes]
+
+    # Ambos formatos deben entregar la misma muestra
+    a, b = decode_mocap(json_paquetes[-1], 0.0), decode_mocap(bin_paquetes[-1], 0.0)
+    assert a.identifier == b.identifier and a.ts_ns == b.ts_ns and (a.x, a.y, a.z) == (b.x, b.y, b.z)
+
+    resultados = []
+    for nombre, paquetes in [('JSON', json_paquetes), ('binario', bin_paquetes)]:
+        t_decode = medir(decode_mocap, paquetes)
+        stream = MocapStream('localhost')
+        t_stream = medir(stream.handle_payload, paquetes)
+        tamano = sum(len(p) for p in paquetes) / len(paquetes)
+        resultados.append((nombre, tamano, t_decode, t_stream))
+
+    print(f"\n{'formato':<8} | {'bytes/msg':>9} | {'decode [us]':>11} | {'MocapStream [us]':>16} | " +
+          " | ".join(f"CPU @{f} Hz" for f in FRECUENCIAS))
+    print("-" * (55 + 15 * len(FRECUENCIAS)))
+    for nombre, tamano, t_decode, t_stream in resultados:
+        cpu = " | ".join(f"{t_stream * 1e-6 * f * 100:>11.2f}%" for f in FRECUENCIAS)
+        print(f"{nombre:<8} | {tamano:>9.0f} | {t_decode:>11.2f} | {t_stream:>16.2f} | {cpu}")
+
+    ahorro = resultados[0][3] - resultados[1][3]
+    print(f"\nAhorro por mensaje: {ahorro:.2f} us ({100 * ahorro / resultados[0][3]:.0f}%)")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import contextlib
+import importlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import crazyflie_daemon
+from crazyflie_daemon import DaemonClient
+
+# Latencia por llamada de los wrappers de MATLAB: el camino anterior (import_module + reload de
+# crazyflie_python_commands en cada llamada, como hacían los .m) frente a una llamada al
+# servicio crazyflie_daemon.py por el socket local. No requiere el dron: se mide con get_pose
+# sin conexión (imprime un error y retorna), así que solo queda el costo del camino de la
+# llamada. MATLAB agrega su propia conversión de argumentos en ambos casos.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+CARPETA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'matlab', 'Mqtt', 'cf_newcom')
+MODULO = 'crazyflie_python_commands'
+REPETICIONES_RELOAD = 50
+REPETICIONES_SERVICIO = 2000
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def resumen(tiempos):
+    tiempos = sorted(tiempos)
+    return statistics.median(tiempos), tiempos[int(0.99 * (len(tiempos) - 1))]
+
+
+def medir_reload():
+    sys.path.insert(0, os.path.abspath(CARPETA))
+    tiempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(REPETICIONES_RELOAD):
+            t0 = time.perf_counter()
+            modulo = importlib.import_module(MODULO)
+            importlib.reload(modulo)
+            modulo.get_pose(None)
+            tiempos.append((time.perf_counter() - t0) * 1e3)
+    return tiempos
+
+
+def medir_servicio(address):
+    servicio = subprocess.Popen([sys.executable, crazyflie_daemon.__file__, '--path', CARPETA, '--address', address],
+                                stdout=subprocess.DEVNULL)
+    try:
+        t0 = time.perf_counter()
+        os.environ[crazyflie_daemon.ENV_VARIABLE] = address
+        if not crazyflie_daemon.wait_ready():
+            raise RuntimeError("Daemon did not start")
+        arranque = (time.perf_counter() - t0) * 1e3
+
+        tiempos = {'ping': [], 'get_pose': []}
+        with DaemonClient(address) as client:
+            for metodo, args in [('ping', ()), ('get_pose', (None,))]:
+                for _ in range(REPETICIONES_SERVICIO):
+                    t0 = time.perf_counter()
+                    client.call(metodo, *args)
+                    tiempos[metodo].append((time.perf_counter() - t0) * 1e3)
+            client.call('shutdown')
+        return arranque, tiempos
+    finally:
+        servicio.wait(timeout=5)
+
+
+def main():
+    address = os.path.join(tempfile.gettempdir(), f'crazyflie_daemon_{os.getpid()}.sock')
+    arranque, servicio = medir_servicio(address)
+    reload = medir_reload()
+
+    print(f"\nArranque del servicio (import de {MODULO} + cflib, una sola vez): {arranque:.1f} ms")
+    print(f"Primera llamada con reload (import de cflib en el proceso de MATLAB): {reload[0]:.1f} ms")
+    print(f"\n{'camino':<28} | {'mediana [ms]':>12} | {'p99 [ms]':>9}")
+    print("-" * 55)
+    for nombre, tiempos in [('import + reload + get_pose', reload),
+                            ('servicio ping', servicio['ping']),
+                            ('servicio get_pose', servicio['get_pose'])]:
+        mediana, p99 = resumen(tiempos)
+        print(f"{nombre:<28} | {mediana:>12.3f} | {p99:>9.3f}")
+    print(f"\nFactor (get_pose): {resumen(reload)[0] / resumen(servicio['get_pose'])[0]:.0f}x")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
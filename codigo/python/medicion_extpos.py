@@ -0,0 +1,123 @@
+import contextlib
+import io
+import socket
+import threading
+import time
+
+from cflib.crazyflie import Crazyflie
+from cflib.crtp.udpdriver import UdpDriver
+
+from crazyflie_python_commands_mod import set_position
+from crazyflie_session import CrazyflieSession
+
+# Tasa de envío alcanzable de la posición externa con set_position (sleep + print por llamada)
+# frente a ExtPosStream.push. cflib ya no incluye el driver "debug", así que el enlace es el
+# driver UDP de cflib contra un socket local (loopback): mide el costo del lado de Python sin
+# radio ni dron. Los paquetes recibidos por el socket confirman que el envío fue real.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+HOST = '127.0.0.1'
+DURACION = 2.0          # duración de cada medición [s]
+TASA_LIMITADA = 100     # max_rate_hz de la última medición [Hz]
+
+# -------------------------------------------------------
+# LOOPBACK
+# -------------------------------------------------------
+class Receptor:
+    """Socket UDP local que cuenta los paquetes CRTP que llegan."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.sock.bind((HOST, 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.recibidos = 0
+        self._activo = True
+        self._hilo = threading.Thread(target=self._run, daemon=True)
+        self._hilo.start()
+
+    def _run(self):
+        while self._activo:
+            try:
+                self.sock.recv(64)
+                self.recibidos += 1
+            except socket.timeout:
+                pass
+
+    def cerrar(self):
+        self._activo = False
+        self._hilo.join()
+        self.sock.close()
+
+
+def crear_sesion(port):
+    """CrazyflieSession con el enlace UDP local en lugar del radio."""
+    uri = f'udp://{HOST}:{port}'
+    driver = UdpDriver()
+    driver.connect(uri, None, None)
+    session = CrazyflieSession(uri)
+    session.cf = Crazyflie()
+    session.cf.link = driver
+    return session, driver
+
+# -------------------------------------------------------
+# MEDICIÓN
+# -------------------------------------------------------
+def medir(enviar):
+    """Llama enviar(i) durante DURACION segundos; retorna (llamadas, tiempo, recibidos)."""
+    receptor = Receptor()
+    session, driver = crear_sesion(receptor.port)
+    enviar = enviar(session)
+    n = 0
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while time.perf_counter() - t0 < DURACION:
+            enviar(n)
+            n += 1
+    elapsed = time.perf_counter() - t0
+    time.sleep(0.3)     # dejar que el receptor vacíe el socket
+    recibidos = receptor.recibidos
+    driver.close()
+    receptor.cerrar()
+    return n, elapsed, recibidos
+
+
+def legado(session):
+    return lambda i: set_position(session, 0.001 * i, 0.0, 0.5)
+
+
+def stream(session):
+    s = session.extpos_stream()
+    return lambda i: s.push(0.001 * i, 0.0, 0.5)
+
+
+def stream_pose(session):
+    s = session.extpos_stream()
+    return lambda i: s.push(0.001 * i, 0.0, 0.5, 0.0, 0.0, 0.0, 1.0)
+
+
+def stream_limitado(session):
+    s = session.extpos_stream(max_rate_hz=TASA_LIMITADA)
+    return lambda i: s.push(0.001 * i, 0.0, 0.5)
+
+
+def main():
+    casos = [
+        ('set_position (legado)', legado),
+        ('ExtPosStream.push', stream),
+        ('ExtPosStream.push (pose)', stream_pose),
+        (f'ExtPosStream @{TASA_LIMITADA} Hz', stream_limitado),
+    ]
+    print(f"\n{'método':<26} | {'llamadas':>9} | {'us/llamada':>10} | {'enviados/s':>11} | {'recibidos':>9}")
+    print("-" * 78)
+    for nombre, caso in casos:
+        n, elapsed, recibidos = medir(caso)
+        print(f"{nombre:<26} | {n:>9} | {elapsed / n * 1e6:>10.2f} | {recibidos / elapsed:>11.0f} | {recibidos:>9}")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Tiempo de arranque de cada script de entrada: desde que se inicia el intérprete hasta que el
+# script está listo para conectar (import del script + cflib.crtp.init_drivers()), que es la
+# latencia hasta el primer comando sin contar el enlace de radio. Con `python -X importtime` se
+# obtiene además el tiempo de import y los paquetes que más pesan. No requiere el dron.
+#
+# Con --csv se agrega una fila por script al archivo (fecha y commit) para seguir la evolución.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+SCRIPTS = [
+    'simple_flight', 'simple_circle', 'simple_square', 'simple_linear',
+    'func_flight', 'func_circle', 'func_square', 'async_swarm',
+    'crazyflie_python_commands', 'crazyflie_python_commands_mod', 'crazyflie_daemon',
+]
+REPETICIONES = 5
+PAQUETES_MOSTRADOS = 3
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def correr(*args):
+    return subprocess.run([sys.executable, *args], cwd=CARPETA, capture_output=True, text=True, check=True)
+
+
+def importtime(codigo):
+    """
+    Retorno:
+        tuple: (tiempo total de import [ms], {paquete: acumulado [ms]} de los imports directos
+               del script, agrupados por paquete raíz).
+    """
+    salida = correr('-X', 'importtime', '-c', codigo).stderr
+    total = 0.0
+    paquetes = {}
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        total += int(propio)
+        if len(nombre) - len(nombre.lstrip()) == 3:        # import hecho por el script
+            raiz = nombre.strip().split('.')[0]
+            paquetes[raiz] = paquetes.get(raiz, 0) + int(acumulado) / 1e3
+    return total / 1e3, paquetes
+
+
+def hasta_listo(modulo):
+    """Mediana del tiempo [ms] desde el inicio del proceso hasta import + init_drivers()."""
+    codigo = f'import {modulo}, cflib.crtp; cflib.crtp.init_drivers()'
+    tiempos = []
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        correr('-c', codigo)
+        tiempos.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(tiempos)
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=CARPETA,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de los scripts de entrada")
+    parser.add_argument('--csv', help="archivo CSV donde agregar los resultados")
+    parser.add_argument('scripts', nargs='*', default=SCRIPTS)
+    args = parser.parse_args()
+
+    base = hasta_listo('sys')
+    print(f"\nIntérprete + cflib.crtp + init_drivers() (sin script): {base:.0f} ms")
+    print(f"\n{'script':<30} | {'import [ms]':>11} | {'hasta listo [ms]':>16} | paquetes más pesados [ms]")
+    print("-" * 110)
+    filas = []
+    for modulo in args.scripts:
+        t_import, paquetes = importtime(f'import {modulo}')
+        pesados = sorted(paquetes.items(), key=lambda p: -p[1])[:PAQUETES_MOSTRADOS]
+        t_listo = hasta_listo(modulo)
+        detalle = ', '.join(f"{nombre} {t:.0f}" for nombre, t in pesados)
+        print(f"{modulo:<30} | {t_import:>11.0f} | {t_listo:>16.0f} | {detalle}")
+        filas.append([time.strftime('%Y-%m-%d %H:%M:%S'), commit(), modulo, f'{t_import:.1f}', f'{t_listo:.1f}'])
+
+    if args.csv:
+        nuevo = not os.path.exists(args.csv)
+        with open(args.csv, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if nuevo:
+                writer.writerow(['fecha', 'commit', 'script', 'import_ms', 'hasta_listo_ms'])
+            writer.writerows(filas)
+        print(f"\nResultados agregados a {args.csv}")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
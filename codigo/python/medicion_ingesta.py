@@ -0,0 +1,114 @@
+import json
+import time
+from datetime import datetime, timezone, timedelta
+from mocap_stream import MocapStream
+
+# Medición del costo de decodificación y despacho por mensaje MoCap a 100–500 Hz.
+# Compara el callback `on_message` original de los scripts contra MocapStream, alimentando
+# paquetes sintéticos con el mismo formato del servidor (no requiere servidor MQTT ni dron).
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+FRECUENCIAS = [100, 200, 300, 500]   # mensajes/s simulados
+DURACION = 2.0                       # segundos por frecuencia
+
+# -------------------------------------------------------
+# PAQUETES SINTÉTICOS
+# -------------------------------------------------------
+def generar_paquetes(n, identifier='3'):
+    """Genera n paquetes JSON (bytes) con timestamps crecientes, como los del servidor MoCap."""
+    t0 = datetime.now(timezone.utc)
+    paquetes = []
+    for i in range(n):
+        ts = (t0 + timedelta(milliseconds=2 * i)).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        data = {
+            'source': 'mocap',
+            'ts': ts,
+            'type': 'pose',
+            'command_name': 'get_pose',
+            'identifier': identifier,
+            'payload_size_bytes': 120,
+            'payload': {'pose': {
+                'position': {'x': 0.001 * i, 'y': -0.5 + 0.0005 * i, 'z': 0.45},
+                'rotation': {'qx': 0.0, 'qy': 0.0, 'qz': 0.0, 'qw': 1.0}
+            }}
+        }
+        paquetes.append(json.dumps(data).encode())
+    return paquetes
+
+# -------------------------------------------------------
+# CAMINO ORIGINAL (copia del on_message de los scripts)
+# -------------------------------------------------------
+mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+real_trajectory = []
+last_ts = None
+
+def on_message_original(payload):
+    global last_ts
+    data = json.loads(payload.decode())
+    pos = data['payload']['pose']['position']
+    ts_str = data.get('ts', None)
+    if ts_str is not None:
+        msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+        if last_ts is not None and msg_time <= last_ts:
+            return
+        last_ts = msg_time
+    mocap_pose['x'] = float(pos['x'])
+    mocap_pose['y'] = float(pos['y'])
+    mocap_pose['z'] = float(pos['z'])
+    real_trajectory.append([mocap_pose['x'], mocap_pose['y'], mocap_pose['z']])
+
+# -------------------------------------------------------
+# MEDICIÓN
+# -------------------------------------------------------
+def medir(handler, paquetes, frecuencia):
+    """
+    Entrega los paquetes a `handler` al ritmo indicado y mide el costo de cada llamada.
+
+    Retorno:
+        tuple: (promedio_us, p99_us, fracción de CPU usada a esa frecuencia)
+    """
+    periodo = 1.0 / frecuencia
+    costos = []
+    siguiente = time.perf_counter()
+    for payload in paquetes:
+        t0 = time.perf_counter_ns()
+        handler(payload)
+        costos.append(time.perf_counter_ns() - t0)
+
+        # Esperar al siguiente mensaje (simula el ritmo del servidor)
+        siguiente += periodo
+        espera = siguiente - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+
+    costos.sort()
+    promedio_us = sum(costos) / len(costos) / 1000
+    p99_us = costos[int(0.99 * (len(costos) - 1))] / 1000
+    return promedio_us, p99_us, promedio_us * 1e-6 * frecuencia
+
+
+def main():
+    print(f"{'Hz':>5} | {'camino':<12} | {'prom [us]':>10} | {'p99 [us]':>10} | {'CPU':>7}")
+    print("-" * 57)
+    for frecuencia in FRECUENCIAS:
+        paquetes = generar_paquetes(int(frecuencia * DURACION))
+
+        global last_ts
+        last_ts = None
+        real_trajectory.clear()
+        resultado_original = medir(on_message_original, paquetes, frecuencia)
+
+        stream = MocapStream('localhost')
+        trayectoria = []
+        stream.add_callback(lambda s: trayectoria.append((s.x, s.y, s.z)))
+        resultado_stream = medir(stream.handle_payload, paquetes, frecuencia)
+
+        for nombre, (prom, p99, cpu) in [('original', resultado_original), ('MocapStream', resultado_stream)]:
+            print(f"{frecuencia:>5} | {nombre:<12} | {prom:>10.2f} | {p99:>10.2f} | {cpu * 100:>6.2f}%")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
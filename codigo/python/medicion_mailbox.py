@@ -0,0 +1,103 @@
+import sys
+import time
+import threading
+from pose_mailbox import PoseMailbox
+
+# Prueba de estrés del buzón de pose (PoseMailbox) con un escritor y varios lectores.
+# El escritor publica muestras cuyos seis campos valen lo mismo (k, k, k, k, k, k); un lector
+# que vea campos distintos leyó una mezcla de dos muestras ("lectura rota").
+# Se compara contra el diccionario que se actualizaba campo por campo en los scripts.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+DURACION = 3.0       # segundos por prueba
+LECTORES = 4         # hilos lectores
+CAMPOS = ('x', 'y', 'z', 'roll', 'pitch', 'yaw')
+
+# -------------------------------------------------------
+# PRUEBAS
+# -------------------------------------------------------
+def prueba(escribir, leer):
+    """
+    Ejecuta un escritor y LECTORES lectores durante DURACION segundos.
+
+    Retorno:
+        tuple: (escrituras, lecturas, lecturas rotas, lecturas fuera de orden)
+    """
+    run = True
+    escrituras = [0]
+    resultados = []
+
+    def escritor():
+        k = 0
+        while run:
+            k += 1
+            escribir(float(k))
+        escrituras[0] = k
+
+    def lector():
+        lecturas = rotas = desorden = 0
+        ultimo = 0.0
+        while run:
+            valores = leer()
+            lecturas += 1
+            if any(v != valores[0] for v in valores):
+                rotas += 1
+            if valores[0] < ultimo:
+                desorden += 1
+            ultimo = valores[0]
+        resultados.append((lecturas, rotas, desorden))
+
+    hilos = [threading.Thread(target=escritor)] + [threading.Thread(target=lector) for _ in range(LECTORES)]
+    for h in hilos:
+        h.start()
+    time.sleep(DURACION)
+    run = False
+    for h in hilos:
+        h.join()
+
+    return (escrituras[0],
+            sum(r[0] for r in resultados),
+            sum(r[1] for r in resultados),
+            sum(r[2] for r in resultados))
+
+
+def main():
+    # Cambios de hilo muy frecuentes para provocar intercalados escritor/lector
+    sys.setswitchinterval(1e-6)
+
+    # --- Diccionario actualizado campo por campo (comportamiento anterior) ---
+    pose = dict.fromkeys(CAMPOS, 0.0)
+
+    def escribir_dict(k):
+        for campo in CAMPOS:
+            pose[campo] = k
+
+    def leer_dict():
+        return [pose['x'], pose['y'], pose['z'], pose['roll'], pose['pitch'], pose['yaw']]
+
+    # --- PoseMailbox ---
+    mailbox = PoseMailbox(CAMPOS)
+
+    def escribir_mailbox(k):
+        mailbox.write((k, k, k, k, k, k))
+
+    def leer_mailbox():
+        return mailbox.read()[1]
+
+    print(f"\n=== Prueba de estrés: 1 escritor, {LECTORES} lectores, {DURACION:.0f} s ===")
+    print(f"{'buzón':<12} | {'escrituras':>10} | {'lecturas':>10} | {'rotas':>8} | {'desorden':>8}")
+    print("-" * 60)
+    for nombre, escribir, leer in [('dict', escribir_dict, leer_dict), ('PoseMailbox', escribir_mailbox, leer_mailbox)]:
+        escrituras, lecturas, rotas, desorden = prueba(escribir, leer)
+        print(f"{nombre:<12} | {escrituras:>10} | {lecturas:>10} | {rotas:>8} | {desorden:>8}")
+    print(f"Reintentos de lectura del PoseMailbox: {mailbox.retries}")
+
+    # Para el buzón no se admite ninguna lectura rota ni fuera de orden
+    assert rotas == 0 and desorden == 0, "PoseMailbox entregó una muestra inconsistente"
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
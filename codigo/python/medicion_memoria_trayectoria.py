@@ -0,0 +1,72 @@
+import time
+import tracemalloc
+import numpy as np
+from trajectory_buffer import TrajectoryBuffer
+
+# Comparación de memoria y tiempo entre la lista `real_trajectory.append([x, y, z])` de los
+# scripts de vuelo y TrajectoryBuffer, para 100k y 1M muestras.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+TAMANOS = [100_000, 1_000_000]
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def muestras(n):
+    """Genera n posiciones (t, x, y, z) distintas."""
+    for i in range(n):
+        yield i * 0.005, 0.001 * i, -0.5 + 0.0005 * i, 0.45 + 1e-6 * i
+
+
+def medir_lista(n):
+    """Lista de listas [x, y, z] (sin timestamps, como en los scripts) y np.array() al graficar."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    trayectoria = []
+    for t, x, y, z in muestras(n):
+        trayectoria.append([x, y, z])
+    t_append = time.perf_counter() - t0
+    memoria = tracemalloc.get_traced_memory()[0]
+
+    t0 = time.perf_counter()
+    real = np.array(trayectoria)
+    t_graficar = time.perf_counter() - t0
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert real.shape == (n, 3)
+    return memoria, pico, t_append, t_graficar
+
+
+def medir_buffer(n):
+    """TrajectoryBuffer con timestamps y vista sin copia al graficar."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    trayectoria = TrajectoryBuffer()
+    for t, x, y, z in muestras(n):
+        trayectoria.append(t, x, y, z)
+    t_append = time.perf_counter() - t0
+    memoria = tracemalloc.get_traced_memory()[0]
+
+    t0 = time.perf_counter()
+    real = trayectoria.positions
+    t_graficar = time.perf_counter() - t0
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert real.shape == (n, 3)
+    return memoria, pico, t_append, t_graficar
+
+
+def main():
+    print(f"\n{'muestras':>9} | {'almacenamiento':<16} | {'memoria [MB]':>12} | {'pico [MB]':>10} | {'append [s]':>10} | {'graficar [ms]':>13}")
+    print("-" * 86)
+    for n in TAMANOS:
+        for nombre, medir in [('lista [x, y, z]', medir_lista), ('TrajectoryBuffer', medir_buffer)]:
+            memoria, pico, t_append, t_graficar = medir(n)
+            print(f"{n:>9} | {nombre:<16} | {memoria / 1e6:>12.1f} | {pico / 1e6:>10.1f} | {t_append:>10.2f} | {t_graficar * 1e3:>13.3f}")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
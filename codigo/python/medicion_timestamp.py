@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timezone, timedelta
+from mocap_time import parse_ts_ns, NS_PER_S
+
+# Microbenchmark de la conversión del campo `ts` de los paquetes MoCap.
+# Compara el camino original (datetime.fromisoformat + comparación de datetime) contra
+# parse_ts_ns (entero de nanosegundos con caché de prefijo), y verifica que ambos coincidan.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+N = 200_000          # cantidad de timestamps
+PERIODO_MS = 2.5     # separación entre paquetes (400 Hz)
+REPETICIONES = 5
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def generar_timestamps(n):
+    """Timestamps ISO 8601 consecutivos con el formato del servidor ('...Z')."""
+    t0 = datetime.now(timezone.utc)
+    return [(t0 + timedelta(milliseconds=PERIODO_MS * i)).isoformat(timespec='microseconds').replace('+00:00', 'Z')
+            for i in range(n)]
+
+
+def camino_original(timestamps):
+    """Copia del filtro de paquetes antiguos de los callbacks originales."""
+    last_ts = None
+    aceptados = 0
+    for ts_str in timestamps:
+        msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+        if last_ts is not None and msg_time <= last_ts:
+            continue
+        last_ts = msg_time
+        aceptados += 1
+    return aceptados
+
+
+def camino_entero(timestamps):
+    """Mismo filtro usando parse_ts_ns y comparaciones de enteros."""
+    last_ts = None
+    aceptados = 0
+    for ts_str in timestamps:
+        msg_time = parse_ts_ns(ts_str)
+        if last_ts is not None and msg_time <= last_ts:
+            continue
+        last_ts = msg_time
+        aceptados += 1
+    return aceptados
+
+
+def medir(funcion, timestamps):
+    """Mejor tiempo por timestamp [ns] en REPETICIONES corridas."""
+    mejor = None
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter_ns()
+        funcion(timestamps)
+        dt = time.perf_counter_ns() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor / len(timestamps)
+
+
+def main():
+    timestamps = generar_timestamps(N)
+
+    # Verificación: ambos caminos deben dar el mismo instante
+    for ts_str in timestamps[::997]:
+        dt = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
+        esperado = int(dt.timestamp()) * NS_PER_S + dt.microsecond * 1000
+        assert parse_ts_ns(ts_str) == esperado, ts_str
+    assert camino_original(timestamps) == camino_entero(timestamps)
+
+    t_original = medir(camino_original, timestamps)
+    t_entero = medir(camino_entero, timestamps)
+
+    print(f"\n=== Conversión de timestamps ({N} paquetes) ===")
+    print(f"datetime.fromisoformat: {t_original:8.1f} ns/paquete")
+    print(f"parse_ts_ns:            {t_entero:8.1f} ns/paquete")
+    print(f"Aceleración:            {t_original / t_entero:8.2f}x")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
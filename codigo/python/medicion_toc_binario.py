@@ -0,0 +1,74 @@
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from cflib.crazyflie.toccache import TocCache
+from toc_binary import BinaryTocCache, TocIndex, convert_json
+from toc_cache import entries
+
+# Costo de leer el TOC de la caché al conectar: JSON de cflib (TocCache) frente al formato
+# binario de toc_binary.py (BinaryTocCache), y búsqueda de un id por nombre con TocIndex (mmap,
+# sin construir el TOC). Usa una copia de las entradas de la caché ./cache del repositorio, no
+# requiere el dron.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+ORIGEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+REPETICIONES = 50
+VARIABLES = ['stateEstimate.x', 'stabilizer.yaw', 'kalman.resetEstimation', 'commander.enHighLevel']
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def cronometrar(funcion, *args):
+    """Mediana del tiempo [ms] de funcion(*args) en REPETICIONES llamadas."""
+    tiempos = []
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        funcion(*args)
+        tiempos.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(tiempos)
+
+
+def buscar(path):
+    # Lo que se paga para un id cuando solo se necesitan unas pocas variables
+    with TocIndex(path) as index:
+        for name in VARIABLES:
+            index.lookup(name)
+
+
+def main():
+    carpeta = tempfile.mkdtemp(prefix='toc_binario_')
+    try:
+        for filename in entries(ORIGEN).values():
+            shutil.copy(filename, carpeta)
+        t0 = time.perf_counter()
+        convert_json(carpeta)
+        print(f"\nConversión de {len(entries(carpeta))} entradas: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+        json_cache = TocCache(rw_cache=carpeta)
+        binary_cache = BinaryTocCache(rw_cache=carpeta)
+        print(f"\n{'CRC':<9} | {'JSON [KiB]':>10} | {'bin [KiB]':>9} | {'JSON [ms]':>9} | "
+              f"{'bin [ms]':>8} | {'índice [ms]':>11} | {'factor':>6}")
+        print("-" * 80)
+        totales = [0.0, 0.0]
+        for crc, filename in sorted(entries(carpeta).items()):
+            binario = os.path.splitext(filename)[0] + '.toc'
+            t_json = cronometrar(json_cache.fetch, crc)
+            t_bin = cronometrar(binary_cache.fetch, crc)
+            t_indice = cronometrar(buscar, binario)
+            totales[0] += t_json
+            totales[1] += t_bin
+            print(f"{crc:08X}  | {os.path.getsize(filename) / 1024:>10.1f} | {os.path.getsize(binario) / 1024:>9.1f} | "
+                  f"{t_json:>9.2f} | {t_bin:>8.2f} | {t_indice:>11.3f} | {t_json / t_bin:>5.1f}x")
+        print(f"\nTotal (log + parámetros de todas las entradas): JSON {totales[0]:.2f} ms, "
+              f"binario {totales[1]:.2f} ms")
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import shutil
+import statistics
+import tempfile
+import time
+import cflib.crtp
+from cflib.crazyflie import Crazyflie
+from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
+from cflib.crazyflie.toccache import TocCache
+from toc_cache import cache_dir, entries
+
+# Tiempo de conexión con la caché de TOC fría (carpeta vacía: se descarga el TOC completo de
+# log y parámetros) frente a la caché del usuario caliente (solo se compara el CRC). Requiere
+# el dron encendido y el Crazyradio conectado. Al final se mide el costo de leer cada entrada
+# de la caché (json.load), que se paga en cada conexión caliente.
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+URI = "radio://0/80/2M/E7E7E7E7E1"
+REPETICIONES = 5
+
+# -------------------------------------------------------
+# MEDICIÓN
+# -------------------------------------------------------
+def conectar(rw_cache):
+    """Tiempo [s] hasta que la conexión queda lista (TOC de log y parámetros disponibles)."""
+    t0 = time.perf_counter()
+    with SyncCrazyflie(URI, cf=Crazyflie(rw_cache=rw_cache)):
+        return time.perf_counter() - t0
+
+
+def medir_conexion():
+    frios = []
+    for _ in range(REPETICIONES):
+        carpeta = tempfile.mkdtemp(prefix='toc_frio_')
+        try:
+            frios.append(conectar(carpeta))
+        finally:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+    conectar(cache_dir())       # asegura que la caché del usuario tenga el TOC de este dron
+    calientes = [conectar(cache_dir()) for _ in range(REPETICIONES)]
+
+    print(f"\n{'caché':<9} | {'mediana [s]':>11} | {'mín [s]':>8} | {'máx [s]':>8}")
+    print("-" * 46)
+    for nombre, tiempos in [('fría', frios), ('caliente', calientes)]:
+        print(f"{nombre:<9} | {statistics.median(tiempos):>11.2f} | {min(tiempos):>8.2f} | {max(tiempos):>8.2f}")
+    print(f"\nAhorro por conexión: {statistics.median(frios) - statistics.median(calientes):.2f} s")
+
+
+def medir_lectura():
+    cache = TocCache(rw_cache=cache_dir())
+    print(f"\n{'CRC':<9} | {'lectura [ms]':>12}")
+    print("-" * 25)
+    for crc in sorted(entries()):
+        t0 = time.perf_counter()
+        cache.fetch(crc)
+        print(f"{crc:08X}  | {(time.perf_counter() - t0) * 1e3:>12.2f}")
+
+
+def main():
+    cflib.crtp.init_drivers()
+    print(f"Caché del usuario: {cache_dir()}")
+    medir_conexion()
+    medir_lectura()
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
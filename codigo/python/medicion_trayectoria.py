@@ -0,0 +1,82 @@
+import math
+import time
+import numpy as np
+import trajectory_generator
+from trajectory_generator import circle_waypoints, min_jerk, min_snap, sample
+
+# Tiempo de generación de trayectorias con trajectory_generator.py para 1k, 10k y 100k puntos:
+# solución de mínimo jerk y mínimo snap, y muestreo en lote de posición, velocidad y
+# aceleración. Como referencia se incluye el bucle con math.cos de simple_circle.py y, si
+# SciPy está instalado, la solución sin SciPy (eliminación por bloques en NumPy).
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+TAMANOS = [1_000, 10_000, 100_000]
+MUESTRAS_POR_TRAMO = 10
+SIN_SCIPY_MAX = 10_000     # la variante sin SciPy es lenta: solo hasta este tamaño
+
+# -------------------------------------------------------
+# FUNCIONES
+# -------------------------------------------------------
+def cronometrar(funcion, *args):
+    """Retorna (resultado, tiempo [ms]) de funcion(*args)."""
+    t0 = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, (time.perf_counter() - t0) * 1e3
+
+
+def circulo_bucle(n, radius=0.5):
+    """Puntos del círculo como en simple_circle.py (math.cos / math.sin por punto)."""
+    xs, ys, zs = [], [], []
+    for i in range(n + 1):
+        theta = 2 * math.pi * (i / n)
+        xs.append(radius * math.cos(theta))
+        ys.append(radius * math.sin(theta))
+        zs.append(0.5)
+    return [[xs[i], ys[i], zs[i]] for i in range(n + 1)]
+
+
+def puntos_aleatorios(n, rng):
+    """Caminata aleatoria de n puntos y duraciones de tramo entre 0.1 y 0.5 s."""
+    return np.cumsum(rng.normal(0.0, 0.1, (n, 3)), axis=0), rng.uniform(0.1, 0.5, n - 1)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"\nSciPy: {'sí' if trajectory_generator.banded_solver() is not None else 'no'}")
+    print(f"\n{'puntos':>8} | {'círculo bucle':>13} | {'círculo NumPy':>13} | {'min jerk':>9} | "
+          f"{'min snap':>9} | {'snap sin SciPy':>14} | {'muestreo':>9} | {'error':>8}")
+    print(f"{'':>8} | {'[ms]':>13} | {'[ms]':>13} | {'[ms]':>9} | {'[ms]':>9} | {'[ms]':>14} | {'[ms]':>9} | {'[m]':>8}")
+    print("-" * 106)
+
+    for n in TAMANOS:
+        _, t_bucle = cronometrar(circulo_bucle, n)
+        _, t_circulo = cronometrar(circle_waypoints, (0.0, 0.0, 0.0), 0.5, n, 0.5)
+
+        puntos, duraciones = puntos_aleatorios(n, rng)
+        _, t_jerk = cronometrar(min_jerk, puntos, duraciones)
+        coef, t_snap = cronometrar(min_snap, puntos, duraciones)
+
+        t_numpy = float('nan')
+        if trajectory_generator.solve_banded is not None and n <= SIN_SCIPY_MAX:
+            solve_banded = trajectory_generator.solve_banded
+            trajectory_generator.solve_banded = None
+            try:
+                _, t_numpy = cronometrar(min_snap, puntos, duraciones)
+            finally:
+                trajectory_generator.solve_banded = solve_banded
+
+        # Muestreo en lote y verificación: la trayectoria pasa por todos los puntos
+        inicios = np.concatenate([[0.0], np.cumsum(duraciones)])
+        t = np.linspace(0.0, inicios[-1], MUESTRAS_POR_TRAMO * (n - 1))
+        _, t_muestreo = cronometrar(sample, coef, duraciones, t)
+        error = np.abs(sample(coef, duraciones, inicios)[0] - puntos).max()
+
+        print(f"{n:>8} | {t_bucle:>13.2f} | {t_circulo:>13.2f} | {t_jerk:>9.2f} | {t_snap:>9.2f} | "
+              f"{t_numpy:>14.2f} | {t_muestreo:>9.2f} | {error:>8.1e}")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
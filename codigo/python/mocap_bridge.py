@@ -0,0 +1,76 @@
+import time
+import paho.mqtt.client as mqtt
+from mocap_stream import decode_mocap, encode_mocap_binary
+
+## Puente local: se suscribe al JSON del servidor MoCap y re-publica cada paquete en el formato
+## binario compacto (52 bytes) en un servidor MQTT local. Los scripts lo reciben con
+## MocapStream/MocapRouter sin cambios, solo apuntando al servidor y tópico del puente:
+##     mocap = MocapStream('localhost', 1883, 'mocap_bin/drone3')
+
+# -------------------------------------------------------
+# CONFIGURACIÓN
+# -------------------------------------------------------
+SOURCE_BROKER = '192.168.50.200'
+SOURCE_PORT = 1880
+SOURCE_TOPIC = 'mocap/+'
+
+TARGET_BROKER = 'localhost'
+TARGET_PORT = 1883
+TARGET_PREFIX = 'mocap_bin/'    # 'mocap/drone3' -> 'mocap_bin/drone3'
+
+REPORT_PERIOD = 5.0             # periodo de los reportes de estado [s]
+
+# -------------------------------------------------------
+# ESTADO
+# -------------------------------------------------------
+target = mqtt.Client()
+stats = {'forwarded': 0, 'errors': 0}
+
+# -------------------------------------------------------
+# CALLBACK MQTT
+# -------------------------------------------------------
+def on_message(client, userdata, msg):
+    try:
+        sample = decode_mocap(msg.payload)
+        payload = encode_mocap_binary(sample)
+    except Exception as e:
+        stats['errors'] += 1
+        print("Error en MQTT:", e)
+        return
+    suffix = msg.topic[msg.topic.rfind('/') + 1:]
+    target.publish(TARGET_PREFIX + suffix, payload)
+    stats['forwarded'] += 1
+
+# -------------------------------------------------------
+# MAIN
+# -------------------------------------------------------
+def main():
+    target.connect(TARGET_BROKER, TARGET_PORT, 60)
+    target.loop_start()
+
+    source = mqtt.Client()
+    source.on_message = on_message
+    source.connect(SOURCE_BROKER, SOURCE_PORT, 60)
+    source.subscribe(SOURCE_TOPIC)
+    source.loop_start()
+
+    print(f"Puente {SOURCE_BROKER}:{SOURCE_PORT}/{SOURCE_TOPIC} -> {TARGET_BROKER}:{TARGET_PORT}/{TARGET_PREFIX}+")
+    try:
+        last = 0
+        while True:
+            time.sleep(REPORT_PERIOD)
+            forwarded = stats['forwarded']
+            print(f"Reenviados: {forwarded} ({(forwarded - last) / REPORT_PERIOD:.0f} msg/s), errores: {stats['errors']}")
+            last = forwarded
+    except KeyboardInterrupt:
+        print("\nDeteniendo puente...")
+    finally:
+        source.loop_stop()
+        source.disconnect()
+        target.loop_stop()
+        target.disconnect()
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
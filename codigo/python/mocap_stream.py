@@ -0,0 +1,617 @@
+"""
+Este módulo concentra la recepción de datos del sistema de captura de movimiento (MoCap)
+publicados en el servidor MQTT. Reemplaza los callbacks `on_message` repetidos en cada script
+por un único componente (MocapStream) que administra el cliente paho, decodifica los paquetes
+por una ruta rápida y entrega la última pose a los consumidores mediante callbacks.
+
+Para varios drones, MocapRouter se suscribe una sola vez a 'mocap/+' y reparte cada paquete
+al estado de su cuerpo rígido (MocapBody), sin abrir una conexión por dron.
+
+Además del JSON del servidor se acepta un formato binario compacto de tamaño fijo (ver
+encode_mocap_binary y mocap_bridge.py); el formato se detecta automáticamente en cada mensaje.
+"""
+
+import json
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import paho.mqtt.client as mqtt
+
+from handoff_queue import HandoffQueue
+from ingest_metrics import IngestMetrics
+from mocap_time import parse_ts_ns
+from reorder_buffer import ReorderBuffer
+
+# Decodificador JSON: se usa orjson si está instalado (más rápido), si no la librería estándar.
+# Ambos aceptan directamente los bytes del paquete, sin necesidad de hacer .decode().
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Muestra decodificada de un cuerpo rígido del MoCap.
+#   identifier: identificador del cuerpo en el MoCap (str o None).
+#   ts_ns: timestamp del servidor en nanosegundos desde la época Unix (int o None).
+#   x, y, z: posición [m].
+#   qx, qy, qz, qw: orientación en cuaterniones.
+#   t_rx: tiempo local de recepción (time.time()).
+MocapSample = namedtuple('MocapSample', ['identifier', 'ts_ns', 'x', 'y', 'z', 'qx', 'qy', 'qz', 'qw', 't_rx'])
+
+# Formato binario compacto (52 bytes, little-endian):
+#   magic (uint8 = 0xB7), versión (uint8 = 1), identificador (uint16), ts_ns (int64, 0 = sin ts),
+#   x, y, z (float64) [m], qx, qy, qz, qw (float32).
+# El primer byte de un JSON es '{' o un espacio, por lo que el encabezado no se confunde con él.
+BINARY_HEADER = b'\xb7\x01'
+BINARY_FORMAT = struct.Struct('<2sHq3d4f')
+
+
+# -------------------------------------------------------
+# DECODIFICACIÓN
+# -------------------------------------------------------
+def decode_mocap(payload, t_rx=None):
+    """
+    Decodifica un paquete del servidor MQTT del MoCap, en JSON o en el formato binario compacto
+    (se detecta por el encabezado del mensaje).
+
+    Parámetros:
+        payload (bytes | str): Contenido del mensaje MQTT.
+        t_rx (float): Tiempo de recepción; si es None se usa time.time().
+
+    Retorno:
+        MocapSample: Muestra con la posición y orientación del cuerpo rígido.
+
+    Errores:
+        Lanza KeyError, TypeError o ValueError si el paquete no tiene la estructura esperada
+        (payload.pose.position) o si el campo `ts` no es un timestamp ISO 8601 válido.
+        Lanza struct.error si un paquete binario no tiene el tamaño esperado.
+    """
+    if payload[:2] == BINARY_HEADER:
+        return decode_mocap_binary(payload, t_rx)
+
+    data = _json_loads(payload)
+    ts = data.get('ts')
+    pose = data['payload']['pose']
+    pos = pose['position']
+    rot = pose.get('rotation')
+
+    if rot is not None:
+        qx, qy, qz, qw = float(rot['qx']), float(rot['qy']), float(rot['qz']), float(rot['qw'])
+    else:
+        qx, qy, qz, qw = 0.0, 0.0, 0.0, 1.0
+
+    return MocapSample(
+        data.get('identifier'),
+        parse_ts_ns(ts) if ts is not None else None,
+        float(pos['x']),
+        float(pos['y']),
+        float(pos['z']),
+        qx, qy, qz, qw,
+        time.time() if t_rx is None else t_rx
+    )
+
+
+def decode_mocap_binary(payload, t_rx=None):
+    """
+    Decodifica un paquete en el formato binario compacto.
+
+    Parámetros:
+        payload (bytes): Paquete de BINARY_FORMAT.size bytes que comienza con BINARY_HEADER.
+        t_rx (float): Tiempo de recepción; si es None se usa time.time().
+
+    Retorno:
+        MocapSample: Muestra con el identificador como texto ('3'), igual que en el JSON.
+
+    Errores:
+        Lanza struct.error si el paquete no tiene el tamaño esperado.
+    """
+    _, identifier, ts_ns, x, y, z, qx, qy, qz, qw = BINARY_FORMAT.unpack(payload)
+    return MocapSample(
+        str(identifier),
+        ts_ns or None,
+        x, y, z, qx, qy, qz, qw,
+        time.time() if t_rx is None else t_rx
+    )
+
+
+def encode_mocap_binary(sample):
+    """
+    Codifica una muestra en el formato binario compacto.
+
+    Parámetros:
+        sample (MocapSample): Muestra a codificar; el identificador debe ser un entero entre
+                              0 y 65535 (o su texto, como '3').
+
+    Retorno:
+        bytes: Paquete de BINARY_FORMAT.size bytes.
+
+    Errores:
+        Lanza ValueError si el identificador no es numérico y struct.error si está fuera de rango.
+    """
+    identifier = int(sample.identifier) if sample.identifier is not None else 0
+    return BINARY_FORMAT.pack(
+        BINARY_HEADER, identifier, sample.ts_ns or 0,
+        sample.x, sample.y, sample.z, sample.qx, sample.qy, sample.qz, sample.qw
+    )
+
+
+# -------------------------------------------------------
+# ESTADO POR CUERPO RÍGIDO
+# -------------------------------------------------------
+class MocapBody:
+    """
+    Estado de un cuerpo rígido del MoCap: última muestra, filtro de paquetes antiguos y
+    callbacks de sus consumidores. Cada callback recibe un MocapSample y se ejecuta en el
+    hilo de red de paho, por lo que debe ser breve.
+
+    Con reorder_depth > 0 los paquetes desordenados por la red se retienen en una ventana
+    (ReorderBuffer) y se entregan en orden de `ts`, en lugar de descartarse.
+    """
+
+    def __init__(self, name=None, drop_stale=True, reorder_depth=0, reorder_delay=0.01):
+        """
+        Parámetros:
+            name (str): Nombre del cuerpo (sufijo del tópico o identificador del MoCap).
+            drop_stale (bool): Si es True, se ignoran los mensajes con un `ts` no más reciente que el último procesado.
+            reorder_depth (int): Muestras que se pueden retener para reordenarlas (0 = sin ventana).
+            reorder_delay (float): Tiempo máximo [s] que una muestra puede quedar retenida en la ventana.
+        """
+        self.name = name
+        self.drop_stale = drop_stale
+        self.reorder = ReorderBuffer(reorder_depth, reorder_delay) if reorder_depth > 0 else None
+        # La ventana la usan el hilo MQTT y el temporizador de poll(); se entrega bajo el lock
+        # para que los callbacks reciban las muestras en orden
+        self._reorder_lock = threading.RLock()
+
+        self._callbacks = []
+        self._latest = None
+        self._last_ts_ns = None
+        self._new_sample = threading.Event()
+
+        # Contadores del cuerpo
+        self.updates = 0
+        self.stale = 0
+
+    def add_callback(self, callback):
+        """
+        Registra una función que se llama con cada muestra nueva.
+
+        Parámetros:
+            callback (callable): Función con la firma callback(sample).
+        """
+        # Se reemplaza la lista completa para no modificarla mientras el hilo MQTT la recorre
+        self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        """
+        Elimina un callback registrado previamente.
+
+        Parámetros:
+            callback (callable): Función registrada con add_callback().
+        """
+        # Comparación por igualdad: los métodos ligados (forwarder.on_pose) son objetos nuevos en cada acceso
+        self._callbacks = [cb for cb in self._callbacks if cb != callback]
+
+    def add_consumer(self, callback, maxsize=64, policy='drop_oldest', name=None):
+        """
+        Registra un consumidor lento (gráficas, grabación) detrás de una cola acotada con hilo
+        propio, para que no frene el hilo MQTT ni a los demás callbacks.
+
+        Parámetros:
+            callback (callable): Función con la firma callback(sample).
+            maxsize (int): Muestras en espera como máximo.
+            policy (str): 'drop_oldest', 'drop_newest' o 'coalesce' (ver HandoffQueue).
+            name (str): Nombre del consumidor para los reportes.
+
+        Retorno:
+            HandoffQueue: Cola del consumidor (ya iniciada), con sus métricas en stats().
+        """
+        queue = HandoffQueue(callback, maxsize, policy, name)
+        queue.start()
+        self.add_callback(queue.put)
+        return queue
+
+    def remove_consumer(self, queue):
+        """
+        Elimina un consumidor registrado con add_consumer() y detiene su hilo.
+
+        Parámetros:
+            queue (HandoffQueue): Cola retornada por add_consumer().
+        """
+        self.remove_callback(queue.put)
+        queue.stop()
+
+    def latest(self):
+        """
+        Retorno:
+            MocapSample: Última muestra procesada, o None si aún no se ha recibido ninguna.
+        """
+        return self._latest
+
+    def get_pose(self):
+        """
+        Retorno:
+            list: Última posición [x, y, z], o None si aún no se ha recibido ninguna muestra.
+        """
+        sample = self._latest
+        if sample is None:
+            return None
+        return [sample.x, sample.y, sample.z]
+
+    def wait_for_pose(self, timeout=None):
+        """
+        Espera hasta recibir la primera muestra válida del MoCap.
+
+        Parámetros:
+            timeout (float): Tiempo máximo de espera en segundos (None = sin límite).
+
+        Retorno:
+            list: Posición [x, y, z], o None si se agotó el tiempo de espera.
+        """
+        self._new_sample.wait(timeout)
+        return self.get_pose()
+
+    def update(self, sample):
+        """
+        Guarda una muestra nueva y despacha los callbacks. Con ventana de reordenamiento, la
+        muestra puede quedar retenida y entregarse en una llamada posterior.
+
+        Parámetros:
+            sample (MocapSample): Muestra decodificada.
+
+        Retorno:
+            bool: True si la muestra se aceptó, False si era antigua o duplicada.
+        """
+        ts_ns = sample.ts_ns
+        reorder = self.reorder
+        if reorder is not None and ts_ns is not None:
+            with self._reorder_lock:
+                dropped = reorder.late + reorder.duplicate
+                for s in reorder.push(ts_ns, sample):
+                    self._dispatch(s)
+            if reorder.late + reorder.duplicate != dropped:
+                self.stale += 1
+                return False
+            return True
+
+        # Ignorar mensajes antiguos o duplicados
+        if self.drop_stale and ts_ns is not None:
+            if self._last_ts_ns is not None and ts_ns <= self._last_ts_ns:
+                self.stale += 1
+                return False
+            self._last_ts_ns = ts_ns
+
+        self._dispatch(sample)
+        return True
+
+    def poll(self):
+        """
+        Entrega las muestras retenidas en la ventana de reordenamiento que superaron
+        `reorder_delay`, sin esperar un paquete nuevo. Con el stream iniciado la llama un
+        temporizador cada `reorder_delay` (ver _MocapClient.start).
+        """
+        if self.reorder is not None:
+            with self._reorder_lock:
+                for sample in self.reorder.poll():
+                    self._dispatch(sample)
+
+    def flush(self):
+        """
+        Entrega todas las muestras retenidas en la ventana de reordenamiento (al detener el stream).
+        """
+        if self.reorder is not None:
+            with self._reorder_lock:
+                for sample in self.reorder.flush():
+                    self._dispatch(sample)
+
+    def _dispatch(self, sample):
+        self.updates += 1
+        self._latest = sample
+        self._new_sample.set()
+
+        for callback in self._callbacks:
+            try:
+                callback(sample)
+            except Exception as e:
+                print("Error en callback MoCap:", e)
+
+
+# -------------------------------------------------------
+# CLIENTE MQTT
+# -------------------------------------------------------
+class _MocapClient:
+    """
+    Conexión MQTT compartida por MocapStream y MocapRouter. Las latencias por etapa y los
+    contadores de paquetes se registran en `metrics` (IngestMetrics).
+    """
+
+    def __init__(self, broker, port, topic, keepalive):
+        self.broker = broker
+        self.port = port
+        self.topic = topic
+        self.keepalive = keepalive
+
+        self._client = None
+        self._threaded = False
+        self._poll_stop = None          # temporizador de la ventana de reordenamiento
+        self._poll_thread = None
+        self._poll_handle = None
+        self.metrics = IngestMetrics()
+
+    def _reorder_bodies(self):
+        # Cuerpos con ventana de reordenamiento (los redefinen MocapStream y MocapRouter)
+        return []
+
+    def _reorder_period(self):
+        # Periodo [s] del temporizador de la ventana, o None si no hay ventana
+        return None
+
+    def _poll_bodies(self):
+        for body in self._reorder_bodies():
+            body.poll()
+
+    def start(self, loop=None):
+        """
+        Conecta al servidor MQTT, se suscribe al tópico e inicia el hilo de red de paho.
+
+        Parámetros:
+            loop (asyncio.AbstractEventLoop): Si se indica, el socket lo atiende ese event loop
+                                              (ver async_runtime) en lugar de un hilo de paho.
+                                              Debe llamarse desde el hilo del event loop.
+
+        Errores:
+            Lanza la excepción de paho/socket si no es posible conectar con el servidor.
+        """
+        client = mqtt.Client()
+        client.on_message = self._on_message
+        if loop is not None:
+            from async_runtime import attach_mqtt_to_loop
+            attach_mqtt_to_loop(client, loop)
+        client.connect(self.broker, self.port, self.keepalive)
+        client.subscribe(self.topic)
+        if loop is None:
+            client.loop_start()
+        self._client = client
+        self._threaded = loop is None
+        self._start_poll_timer(loop)
+
+    def _start_poll_timer(self, loop):
+        # Sin un temporizador, una muestra retenida solo se libera al llegar el paquete
+        # siguiente: si el stream se pausa, get_pose() entregaría una pose vieja
+        period = self._reorder_period()
+        if period is None:
+            return
+        period = max(period, 0.001)
+        if loop is not None:
+            def tick():
+                self._poll_bodies()
+                self._poll_handle = loop.call_later(period, tick)
+            self._poll_handle = loop.call_later(period, tick)
+        else:
+            stop = threading.Event()
+
+            def run():
+                while not stop.wait(period):
+                    self._poll_bodies()
+
+            self._poll_stop = stop
+            self._poll_thread = threading.Thread(target=run, name='mocap-reorder', daemon=True)
+            self._poll_thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo de red y cierra la conexión con el servidor MQTT. Las muestras que
+        quedaban en la ventana de reordenamiento se entregan antes de retornar.
+        """
+        if self._client is not None:
+            if self._threaded:
+                self._client.loop_stop()
+            self._client.disconnect()
+            self._client = None
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+            self._poll_handle = None
+        if self._poll_thread is not None:
+            self._poll_stop.set()
+            self._poll_thread.join()
+            self._poll_thread = None
+        for body in self._reorder_bodies():
+            body.flush()
+
+    def _decode(self, payload, t_rx):
+        metrics = self.metrics
+        metrics.received += 1
+        t0 = time.perf_counter_ns()
+        if t_rx is None:
+            t_rx = time.time()
+        try:
+            sample = decode_mocap(payload, t_rx)
+        except (KeyError, TypeError, ValueError, struct.error) as e:
+            metrics.malformed += 1
+            print("Error en MQTT:", e)
+            return None
+        metrics.rx_to_decoded.record(time.perf_counter_ns() - t0)
+        if sample.ts_ns is not None:
+            metrics.ts_to_rx.record(int(t_rx * 1e9) - sample.ts_ns)
+        return sample
+
+    def _on_message(self, client, userdata, msg):
+        self.handle_message(msg.topic, msg.payload)
+
+
+# -------------------------------------------------------
+# STREAM MQTT (un cuerpo rígido)
+# -------------------------------------------------------
+class MocapStream(_MocapClient, MocapBody):
+    """
+    Cliente MQTT del MoCap para un solo cuerpo rígido, con la última pose recibida y
+    callbacks para los consumidores.
+
+    Uso:
+        mocap = MocapStream('192.168.50.200', 1880, 'mocap/drone3')
+        mocap.add_callback(lambda sample: print(sample.x, sample.y, sample.z))
+        mocap.start()
+        x0, y0, z0 = mocap.wait_for_pose()
+        ...
+        mocap.stop()
+    """
+
+    def __init__(self, broker, port=1880, topic='mocap/drone3', keepalive=60, drop_stale=True,
+                 reorder_depth=0, reorder_delay=0.01):
+        """
+        Parámetros:
+            broker (str): Dirección IP del servidor MQTT.
+            port (int): Puerto del servidor MQTT.
+            topic (str): Tópico donde se publica el cuerpo rígido.
+            keepalive (int): Keepalive de la conexión MQTT en segundos.
+            drop_stale (bool): Si es True, se ignoran los mensajes con un `ts` no más reciente que el último procesado.
+            reorder_depth (int): Muestras que se pueden retener para reordenarlas (0 = sin ventana).
+            reorder_delay (float): Tiempo máximo [s] que una muestra puede quedar retenida en la ventana.
+        """
+        _MocapClient.__init__(self, broker, port, topic, keepalive)
+        MocapBody.__init__(self, topic.rsplit('/', 1)[-1], drop_stale, reorder_depth, reorder_delay)
+
+    def _reorder_bodies(self):
+        return [self] if self.reorder is not None else []
+
+    def _reorder_period(self):
+        return self.reorder.max_delay if self.reorder is not None else None
+
+    def handle_payload(self, payload, t_rx=None):
+        """
+        Decodifica un paquete, actualiza la última pose y despacha los callbacks.
+        Es el camino que sigue cada mensaje MQTT; se expone para poder alimentarlo
+        sin servidor (pruebas y mediciones).
+
+        Parámetros:
+            payload (bytes | str): Contenido del mensaje MQTT.
+            t_rx (float): Tiempo de recepción; si es None se usa time.time().
+
+        Retorno:
+            MocapSample: Muestra procesada, o None si el paquete se descartó.
+        """
+        sample = self._decode(payload, t_rx)
+        if sample is None:
+            return None
+        if not self.update(sample):
+            self.metrics.stale += 1
+            return None
+        return sample
+
+    def handle_message(self, topic, payload, t_rx=None):
+        return self.handle_payload(payload, t_rx)
+
+
+# -------------------------------------------------------
+# ROUTER MQTT (varios cuerpos rígidos)
+# -------------------------------------------------------
+class MocapRouter(_MocapClient):
+    """
+    Un solo cliente MQTT suscrito a todos los cuerpos rígidos (por defecto 'mocap/+') que
+    reparte cada paquete al estado (MocapBody) de su agente mediante una búsqueda en un
+    diccionario. Permite alimentar un enjambre completo con una sola conexión y un solo
+    hilo de red.
+
+    Uso:
+        router = MocapRouter('192.168.50.200', 1880)
+        dron3 = router.body('drone3')
+        dron3.add_callback(lambda sample: cf3.extpos.send_extpos(sample.x, sample.y, sample.z))
+        router.start()
+        x0, y0, z0 = dron3.wait_for_pose()
+    """
+
+    def __init__(self, broker, port=1880, topic='mocap/+', route_by='topic', keepalive=60,
+                 drop_stale=True, auto_add=True, reorder_depth=0, reorder_delay=0.01):
+        """
+        Parámetros:
+            broker (str): Dirección IP del servidor MQTT.
+            port (int): Puerto del servidor MQTT.
+            topic (str): Tópico con comodín que agrupa a los cuerpos rígidos.
+            route_by (str): 'topic' para identificar el cuerpo por el sufijo del tópico ('drone3'),
+                            o 'identifier' para usar el campo `identifier` del paquete (como mqttCB.m).
+            keepalive (int): Keepalive de la conexión MQTT en segundos.
+            drop_stale (bool): Filtro de paquetes antiguos para los cuerpos creados por el router.
+            auto_add (bool): Si es True, se crea el estado de un cuerpo al recibir su primer paquete;
+                             si es False, los paquetes de cuerpos no registrados se descartan.
+            reorder_depth (int): Ventana de reordenamiento de los cuerpos creados por el router (0 = sin ventana).
+            reorder_delay (float): Tiempo máximo [s] que una muestra puede quedar retenida en la ventana.
+
+        Errores:
+            Lanza ValueError si `route_by` no es 'topic' ni 'identifier'.
+        """
+        if route_by not in ('topic', 'identifier'):
+            raise ValueError(f"Invalid route_by value: {route_by!r}")
+        _MocapClient.__init__(self, broker, port, topic, keepalive)
+        self.route_by = route_by
+        self.drop_stale = drop_stale
+        self.auto_add = auto_add
+        self.reorder_depth = reorder_depth
+        self.reorder_delay = reorder_delay
+
+        self.bodies = {}
+
+    def _reorder_bodies(self):
+        return [body for body in self.bodies.values() if body.reorder is not None]
+
+    def _reorder_period(self):
+        # Los cuerpos se crean al recibir su primer paquete: el temporizador corre desde start()
+        return self.reorder_delay if self.reorder_depth > 0 else None
+
+    def body(self, key):
+        """
+        Obtiene (o registra) el estado de un cuerpo rígido.
+
+        Parámetros:
+            key (str | int): Sufijo del tópico o identificador del MoCap, según `route_by`.
+
+        Retorno:
+            MocapBody: Estado del cuerpo rígido.
+        """
+        key = str(key)
+        body = self.bodies.get(key)
+        if body is None:
+            body = MocapBody(key, self.drop_stale, self.reorder_depth, self.reorder_delay)
+            # Se reemplaza el diccionario completo para no modificarlo mientras el hilo MQTT lo lee
+            self.bodies = {**self.bodies, key: body}
+        return body
+
+    def handle_message(self, topic, payload, t_rx=None):
+        """
+        Decodifica un paquete y lo entrega al cuerpo rígido correspondiente.
+
+        Parámetros:
+            topic (str): Tópico del mensaje MQTT (por ejemplo 'mocap/drone3').
+            payload (bytes | str): Contenido del mensaje MQTT.
+            t_rx (float): Tiempo de recepción; si es None se usa time.time().
+
+        Retorno:
+            MocapSample: Muestra procesada, o None si el paquete se descartó.
+        """
+        if self.route_by == 'topic':
+            # Se busca el cuerpo antes de decodificar: los paquetes sin destinatario no se decodifican
+            key = topic[topic.rfind('/') + 1:]
+            body = self.bodies.get(key)
+            if body is None and not self.auto_add:
+                self.metrics.unrouted += 1
+                return None
+            sample = self._decode(payload, t_rx)
+            if sample is None:
+                return None
+        else:
+            sample = self._decode(payload, t_rx)
+            if sample is None:
+                return None
+            key = str(sample.identifier)
+            body = self.bodies.get(key)
+            if body is None and (sample.identifier is None or not self.auto_add):
+                self.metrics.unrouted += 1
+                return None
+
+        if body is None:
+            body = self.body(key)
+        if not body.update(sample):
+            self.metrics.stale += 1
+            return None
+        return sample
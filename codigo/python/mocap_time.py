@@ -0,0 +1,73 @@
+"""
+Este módulo convierte el campo `ts` (ISO 8601) de los paquetes del servidor MoCap a un entero
+de nanosegundos desde la época Unix (UTC). Las comparaciones de orden y antigüedad de los
+paquetes se hacen entonces con enteros, sin crear un objeto datetime por mensaje.
+
+Los paquetes consecutivos comparten la fecha, la hora y el segundo ('2025-10-18T14:03:27'),
+por lo que esa parte se convierte una sola vez y se guarda en un caché de prefijo; en cada
+mensaje solo se lee la fracción de segundo.
+"""
+
+import calendar
+from datetime import datetime, timezone
+
+NS_PER_S = 1_000_000_000
+
+# Caché de prefijo: (prefijo 'YYYY-MM-DDTHH:MM:SS', largo del texto, fin de la fracción,
+# sufijo de zona horaria, escala de la fracción a ns, ns del prefijo en UTC).
+# Se reemplaza como una tupla completa para que sea seguro leerlo desde varios hilos.
+_prefix_cache = ('', 0, 0, '', 0, 0)
+
+
+def _parse_full(ts):
+    """
+    Conversión completa (una vez por segundo): valida el texto con datetime, calcula los
+    nanosegundos y actualiza el caché de prefijo.
+    """
+    global _prefix_cache
+
+    msg_time = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+    if msg_time.tzinfo is None:
+        msg_time = msg_time.replace(tzinfo=timezone.utc)
+    base = calendar.timegm(msg_time.utctimetuple()) * NS_PER_S
+
+    # Ubicar la fracción de segundo (puede tener hasta 9 dígitos)
+    n = len(ts)
+    frac_end = 19
+    if n > 20 and ts[19] in '.,':
+        frac_end = 20
+        while frac_end < n and ts[frac_end].isdigit():
+            frac_end += 1
+    frac = ts[20:frac_end]
+    scale = 10 ** (9 - len(frac)) if len(frac) <= 9 else 0
+    frac_ns = int(frac[:9].ljust(9, '0')) if frac else 0
+
+    if len(ts) >= 19 and len(frac) <= 9:
+        _prefix_cache = (ts[:19], n, frac_end, ts[frac_end:], scale, base)
+    return base + frac_ns
+
+
+def parse_ts_ns(ts):
+    """
+    Convierte un timestamp ISO 8601 del servidor MoCap a nanosegundos desde la época (UTC).
+
+    Acepta 'YYYY-MM-DDTHH:MM:SS', con fracción de segundo opcional (hasta 9 dígitos) y
+    zona horaria opcional ('Z' o '±HH:MM'; sin zona se asume UTC).
+
+    Parámetros:
+        ts (str): Timestamp, por ejemplo '2025-10-18T14:03:27.512Z'.
+
+    Retorno:
+        int: Nanosegundos desde 1970-01-01T00:00:00Z.
+
+    Errores:
+        Lanza ValueError si el texto no es un timestamp ISO 8601 válido.
+    """
+    prefix, n, frac_end, suffix, scale, base = _prefix_cache
+    if len(ts) == n and ts[:19] == prefix and ts.endswith(suffix):
+        if frac_end == 19:
+            return base
+        frac = ts[20:frac_end]
+        if frac.isdigit():
+            return base + int(frac) * scale
+    return _parse_full(ts)
@@ -0,0 +1,179 @@
+"""
+Este módulo proporciona los manejadores de los comandos de movimiento no bloqueantes de
+CrazyflieSession (takeoff_async, land_async, go_to_async, move_to_async).
+
+Antes cada comando se enviaba y el hilo quedaba dormido con `time.sleep(duration)`: no se
+podía hacer nada más, ni encadenar comandos, ni volar varios drones desde un mismo hilo.
+Ahora el comando se envía y se retorna un MotionHandle (un concurrent.futures.Future) que se
+completa cuando pasa la duración del comando o, si se indica una tolerancia, cuando la pose
+del dron llega al objetivo. El manejador se puede esperar, encadenar con then() o cancelar
+(el dron se queda en su posición actual).
+
+Uso:
+    h1 = dron1.go_to_async(0.5, 0.0, 0.5, duration=2.0)
+    h2 = dron2.go_to_async(-0.5, 0.0, 0.5, duration=2.0, tolerance=0.05)
+    concurrent.futures.wait([h1, h2])
+    dron1.takeoff_async(0.5).then(dron1.go_to_async, 0.0, 0.0, 0.5, duration=2.0).result()
+"""
+
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+
+class _Chainable(Future):
+    """Future con encadenamiento de comandos."""
+
+    def then(self, command, *args, **kwargs):
+        """
+        Ejecuta command(*args, **kwargs) cuando este comando termina (si no fue cancelado).
+
+        Parámetros:
+            command (callable): Función que envía el siguiente comando y retorna su MotionHandle
+                                (por ejemplo session.go_to_async).
+
+        Retorno:
+            MotionChain: Manejador que se completa con el resultado del comando encadenado y
+                         que, al cancelarse, cancela el comando que esté en curso.
+        """
+        chain = MotionChain(self)
+
+        def start_next(previous):
+            if previous.cancelled() or previous.exception() is not None or chain.done():
+                chain._abort(previous)
+                return
+            try:
+                chain._attach(command(*args, **kwargs))
+            except Exception as e:
+                chain._abort(None, e)
+
+        self.add_done_callback(start_next)
+        return chain
+
+    def _finish(self, result):
+        try:
+            self.set_result(result)
+        except InvalidStateError:
+            # Ya se completó por la otra vía (tiempo / pose) o fue cancelado
+            pass
+
+    def _cancel(self):
+        # El manejador queda en estado PENDING mientras el comando está en curso, así
+        # Future.cancel() se puede usar en cualquier momento antes de que termine
+        if self.done() or not Future.cancel(self):
+            return False
+        try:
+            self.set_running_or_notify_cancel()    # despierta a concurrent.futures.wait()
+        except RuntimeError:
+            pass                                   # otro hilo ya lo notificó
+        return True
+
+
+class MotionHandle(_Chainable):
+    """
+    Comando de movimiento en curso. result() retorna True si terminó por tiempo o porque la
+    pose llegó al objetivo, y False si se agotó el tiempo de espera sin alcanzarlo.
+    """
+
+    def __init__(self, session, name, duration, target=None, tolerance=None, settle=1.0):
+        """
+        Parámetros:
+            session (CrazyflieSession): Sesión que envió el comando.
+            name (str): Nombre del comando ('takeoff', 'go_to', ...).
+            duration (float): Duración del comando [s].
+            target (tuple): Posición objetivo (x, y, z) [m], para completar por llegada.
+            tolerance (float): Distancia [m] al objetivo para considerarlo alcanzado (None = solo por tiempo).
+            settle (float): Tiempo extra [s] para alcanzar el objetivo después de `duration`.
+        """
+        super().__init__()
+        self.session = session
+        self.name = name
+        self.duration = duration
+        self.target = target
+        self.tolerance = tolerance if target is not None else None
+        self.settle = settle
+        self.t_start = None
+        self._timer = None
+
+    def start(self):
+        """Inicia la espera (lo llama la sesión después de enviar el comando)."""
+        self.t_start = time.monotonic()
+        if self.tolerance is None:
+            self._timer = threading.Timer(self.duration, self._finish, (True,))
+        else:
+            self._timer = threading.Timer(self.duration + self.settle, self._timeout)
+            self.session._watch(self)
+        self._timer.daemon = True
+        self._timer.start()
+        return self
+
+    def elapsed(self):
+        """Tiempo transcurrido desde el envío del comando [s]."""
+        return 0.0 if self.t_start is None else time.monotonic() - self.t_start
+
+    def check_pose(self, x, y, z):
+        """Completa el comando si la pose está dentro de la tolerancia del objetivo."""
+        tx, ty, tz = self.target
+        if (x - tx)**2 + (y - ty)**2 + (z - tz)**2 <= self.tolerance**2:
+            self._timer.cancel()
+            self._finish(True)
+            return True
+        return False
+
+    def _timeout(self):
+        self.session._unwatch(self)
+        self._finish(False)
+
+    def cancel(self):
+        """
+        Cancela el comando: deja de esperarlo y el dron mantiene su posición actual.
+
+        Retorno:
+            bool: False si el comando ya había terminado.
+        """
+        if not self._cancel():
+            return False
+        if self._timer is not None:
+            self._timer.cancel()
+        self.session._unwatch(self)
+        self.session.hold()
+        return True
+
+
+class MotionChain(_Chainable):
+    """Manejador de un comando encadenado con then()."""
+
+    def __init__(self, previous):
+        super().__init__()
+        self._current = previous
+
+    def _attach(self, handle):
+        self._current = handle
+        handle.add_done_callback(self._copy)
+
+    def _copy(self, handle):
+        if handle.cancelled():
+            self._abort(handle)
+        elif handle.exception() is not None:
+            self._abort(None, handle.exception())
+        else:
+            self._finish(handle.result())
+
+    def _abort(self, previous, exception=None):
+        if exception is None and previous is not None and not previous.cancelled():
+            exception = previous.exception()
+        if exception is None:
+            self._cancel()
+            return
+        try:
+            self.set_exception(exception)
+        except InvalidStateError:
+            pass
+
+    def cancel(self):
+        """Cancela el comando en curso de la cadena y los siguientes."""
+        if self.done():
+            return False
+        self._current.cancel()
+        self._cancel()
+        return self.cancelled()
@@ -1,10 +1,8 @@
 import time
-import json
-import threading
 import numpy as np
-import paho.mqtt.client as mqtt
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from mocap_stream import MocapStream
 
 # Visualización en tiempo real de flujo de datos del servidor MQTT.
 
@@ -15,37 +13,14 @@ MQTT_TOPIC = 'mocap/drone3'   # Tópico MQTT del sistema de captura
 BROKER = '192.168.50.200'          # Cambia por la IP de tu broker
 PORT = 1880
 
-# Variables compartidas
-mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
-
 # Trayectorias cortas
 max_len = 100
 mocap_traj = {'x': [], 'y': [], 'z': []}
 
 # -------------------------------------------------------
-# CALLBACK MQTT (lectura)
+# CLIENTE MQTT (lectura)
 # -------------------------------------------------------
-def on_message(client, userdata, msg):
-    global mocap_pose
-    try:
-        data = json.loads(msg.payload.decode())
-        pos = data['payload']['pose']['position']
-
-        # Actualizar posición del MoCap
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-    except Exception as e:
-        print("Error en MQTT:", e)
-        print("Mensaje:", msg.payload.decode())
-
-def start_mqtt():
-    client = mqtt.Client()
-    client.on_message = on_message
-    client.connect(BROKER, PORT, 60)
-    client.subscribe(MQTT_TOPIC)
-    client.loop_forever()
+mocap = MocapStream(BROKER, PORT, MQTT_TOPIC)
 
 # -------------------------------------------------------
 # GRAFICADO EN TIEMPO REAL
@@ -68,10 +43,13 @@ ax.legend()
 ax.set_title("Trayectoria MoCap (MQTT)")
 
 def update(frame):
+    # Última posición del MoCap (origen mientras no lleguen datos)
+    x, y, z = mocap.get_pose() or (0.0, 0.0, 0.0)
+
     # Agregar nuevo punto a la trayectoria
-    mocap_traj['x'].append(mocap_pose['x'])
-    mocap_traj['y'].append(mocap_pose['y'])
-    mocap_traj['z'].append(mocap_pose['z'])
+    mocap_traj['x'].append(x)
+    mocap_traj['y'].append(y)
+    mocap_traj['z'].append(z)
 
     # Mantener longitud máxima (cola de N puntos)
     if len(mocap_traj['x']) > max_len:
@@ -83,8 +61,8 @@ def update(frame):
     mocap_line.set_data(mocap_traj['x'], mocap_traj['y'])
     mocap_line.set_3d_properties(mocap_traj['z'])
 
-    mocap_point.set_data([mocap_pose['x']], [mocap_pose['y']])
-    mocap_point.set_3d_properties([mocap_pose['z']])
+    mocap_point.set_data([x], [y])
+    mocap_point.set_3d_properties([z])
 
     return mocap_point, mocap_line
 
@@ -93,7 +71,6 @@ ani = FuncAnimation(fig, update, interval=100)
 # -------------------------------------------------------
 # HILO MQTT
 # -------------------------------------------------------
-mqtt_thread = threading.Thread(target=start_mqtt, daemon=True)
-mqtt_thread.start()
+mocap.start()
 
 plt.show()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Este módulo proporciona la carga de trayectorias polinomiales en la memoria de trayectorias
+del Crazyflie. Antes los vuelos circulares se hacían con N comandos `go_to` seguidos de un
+sleep: el dron frenaba en cada punto y el radio enviaba un comando por segmento.
+
+Ahora los puntos se ajustan a polinomios de 7.º orden por tramo (Poly4D de cflib, los que
+ejecuta el planificador de alto nivel del firmware), se suben una sola vez y la trayectoria
+completa se inicia con un único `start_trajectory`. Durante el vuelo el radio queda libre para
+el envío de extpos.
+
+Ajuste: mínimo snap (ver trajectory_generator.py), con reposo en el primer y el último punto.
+La trayectoria pasa por todos los puntos sin detenerse y sus derivadas son continuas hasta el
+orden 6.
+"""
+
+import numpy as np
+
+from cflib.crazyflie.mem import MemoryElement, Poly4D
+
+from trajectory_generator import min_snap
+
+POLY4D_BYTES = 132      # 4 polinomios de 8 coeficientes float + duración
+
+
+def segment_durations(waypoints, velocity):
+    """
+    Parámetros:
+        waypoints (array): Puntos (n, 3) [m].
+        velocity (float): Velocidad media deseada [m/s].
+
+    Retorno:
+        numpy.ndarray: Duración de cada tramo (n - 1,) [s], proporcional a su longitud.
+    """
+    waypoints = np.asarray(waypoints, dtype=float)
+    return np.linalg.norm(np.diff(waypoints, axis=0), axis=1) / velocity
+
+
+def fit_polynomials(waypoints, durations):
+    """
+    Ajusta un polinomio de 7.º orden por tramo y eje (mínimo snap) que pasa por todos los puntos.
+
+    Parámetros:
+        waypoints (array): Puntos (n, 3) [m], n >= 2.
+        durations (array): Duración de cada tramo (n - 1,) [s].
+
+    Retorno:
+        numpy.ndarray: Coeficientes (n - 1, 3, 8) en potencias crecientes de t (t desde el
+                       inicio de cada tramo).
+
+    Errores:
+        Lanza ValueError si las dimensiones no coinciden o alguna duración no es positiva.
+    """
+    waypoints = np.asarray(waypoints, dtype=float)
+    if waypoints.ndim != 2 or waypoints.shape[1] != 3:
+        raise ValueError("waypoints must be (n, 3)")
+    return min_snap(waypoints, durations)
+
+
+def to_poly4d(coef, durations):
+    """
+    Parámetros:
+        coef (array): Coeficientes (m, 3, 8) de fit_polynomials().
+        durations (array): Duración de cada tramo (m,) [s].
+
+    Retorno:
+        list: Tramos Poly4D de cflib (yaw constante en 0).
+    """
+    return [
+        Poly4D(float(T), *(Poly4D.Poly([float(c) for c in axis]) for axis in piece))
+        for piece, T in zip(coef, durations)
+    ]
+
+
+def upload_trajectory(cf, waypoints, durations, trajectory_id=1, start_addr=0):
+    """
+    Ajusta la trayectoria, la sube a la memoria de trayectorias y la define en el commander
+    de alto nivel. Luego se inicia con cf.high_level_commander.start_trajectory(trajectory_id).
+
+    Parámetros:
+        cf (Crazyflie): Objeto Crazyflie conectado (scf.cf o session.cf).
+        waypoints (array): Puntos (n, 3) [m].
+        durations (array): Duración de cada tramo (n - 1,) [s].
+        trajectory_id (int): Identificador de la trayectoria en el Crazyflie.
+        start_addr (int): Dirección de la memoria de trayectorias donde se escribe.
+
+    Retorno:
+        float: Duración total de la trayectoria [s].
+
+    Errores:
+        Lanza ValueError si la trayectoria no cabe en la memoria y RuntimeError si el
+        Crazyflie no tiene memoria de trayectorias o la escritura falla.
+    """
+    pieces = to_poly4d(fit_polynomials(waypoints, durations), durations)
+
+    mems = cf.mem.get_mems(MemoryElement.TYPE_TRAJ)
+    if not mems:
+        raise RuntimeError("Trajectory memory not found")
+    memory = mems[0]
+    if start_addr + len(pieces) * POLY4D_BYTES > memory.size:
+        raise ValueError(f"Trajectory too large: {len(pieces)} pieces, "
+                         f"max {(memory.size - start_addr) // POLY4D_BYTES}")
+
+    memory.trajectory = pieces
+    if not memory.write_data_sync(start_addr):
+        raise RuntimeError("Trajectory upload failed")
+    cf.high_level_commander.define_trajectory(trajectory_id, start_addr, len(pieces))
+    return float(np.sum(durations))
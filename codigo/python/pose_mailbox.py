@@ -0,0 +1,95 @@
+"""
+Este módulo proporciona un buzón de la última pose (PoseMailbox) para compartir datos entre
+el hilo que los produce (callback de paho o de cflib) y los hilos que los leen (control,
+radio, gráficas) sin que un lector vea una mezcla de dos muestras distintas.
+
+Funciona como un seqlock sobre un arreglo preasignado: el escritor incrementa un número de
+versión antes y después de escribir (impar = escritura en curso) y el lector repite la
+lectura si la versión cambió mientras copiaba. Las lecturas no toman ningún candado.
+Solo debe existir UN hilo escritor por buzón.
+"""
+
+import threading
+import time
+from array import array
+
+
+class PoseMailbox:
+    """
+    Buzón de un solo escritor con lecturas consistentes (seqlock).
+
+    Uso:
+        mailbox = PoseMailbox(('x', 'y', 'z'))
+        mailbox.write((x, y, z))                 # hilo escritor
+        version, (x, y, z) = mailbox.read()      # cualquier hilo
+    """
+
+    def __init__(self, fields, initial=None):
+        """
+        Parámetros:
+            fields (sequence): Nombres de los campos, en el orden en que se escriben.
+            initial (sequence): Valores iniciales (por defecto todos en 0.0).
+        """
+        self.fields = tuple(fields)
+        self._size = len(self.fields)
+        self._data = array('d', initial if initial is not None else [0.0] * self._size)
+        self._seq = 0
+        self._written = threading.Event()
+
+        # Lecturas repetidas porque coincidieron con una escritura
+        self.retries = 0
+
+    @property
+    def version(self):
+        """Número de muestras escritas hasta ahora."""
+        return self._seq >> 1
+
+    def write(self, values):
+        """
+        Publica una muestra nueva. Solo debe llamarse desde el hilo escritor.
+
+        Parámetros:
+            values (sequence): Valores en el orden de `fields`.
+        """
+        self._seq += 1            # impar: escritura en curso
+        data = self._data
+        for i in range(self._size):
+            data[i] = values[i]
+        self._seq += 1            # par: muestra completa
+        self._written.set()
+
+    def read(self):
+        """
+        Lee la última muestra completa sin bloquear al escritor.
+
+        Retorno:
+            tuple: (versión, tupla de valores en el orden de `fields`).
+        """
+        while True:
+            seq = self._seq
+            if not seq & 1:
+                values = tuple(self._data)
+                if self._seq == seq:
+                    return seq >> 1, values
+            # Coincidió con una escritura: ceder el GIL al escritor y repetir
+            self.retries += 1
+            time.sleep(0)
+
+    def snapshot(self):
+        """
+        Retorno:
+            dict: Última muestra completa como diccionario {campo: valor}.
+        """
+        return dict(zip(self.fields, self.read()[1]))
+
+    def wait(self, timeout=None):
+        """
+        Espera hasta que se haya escrito al menos una muestra.
+
+        Parámetros:
+            timeout (float): Tiempo máximo de espera en segundos (None = sin límite).
+
+        Retorno:
+            bool: True si ya hay una muestra escrita, False si se agotó el tiempo.
+        """
+        return self._written.wait(timeout)
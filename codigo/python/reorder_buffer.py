@@ -0,0 +1,151 @@
+"""
+Este módulo proporciona una ventana de reordenamiento (ReorderBuffer) para los paquetes del
+MoCap. Los callbacks originales descartaban todo paquete con `ts <= last_ts`, por lo que un
+paquete válido que llegaba unos milisegundos desordenado por el jitter de la red se perdía.
+
+ReorderBuffer retiene hasta `depth` muestras en un heap ordenado por timestamp y las libera
+en orden cuando la ventana se llena o cuando la muestra más antigua supera `max_delay`
+segundos retenida. Solo se descartan las muestras que llegan después de haber liberado una
+más nueva (tardías) y las repetidas (duplicadas).
+"""
+
+import heapq
+import itertools
+import time
+
+
+class ReorderBuffer:
+    """
+    Ventana de reordenamiento por timestamp con profundidad y latencia acotadas.
+
+    Uso:
+        reorder = ReorderBuffer(depth=4, max_delay=0.01)
+        for sample in reorder.push(sample.ts_ns, sample):
+            procesar(sample)          # siempre en orden creciente de ts_ns
+    """
+
+    def __init__(self, depth=4, max_delay=0.01):
+        """
+        Parámetros:
+            depth (int): Cantidad máxima de muestras retenidas (0 = se liberan de inmediato,
+                         equivalente a descartar todo lo que no sea más reciente).
+            max_delay (float): Tiempo máximo [s] que una muestra puede quedar retenida.
+
+        Errores:
+            Lanza ValueError si depth o max_delay son negativos.
+        """
+        if depth < 0 or max_delay < 0:
+            raise ValueError("depth and max_delay must be non-negative")
+        self.depth = depth
+        self.max_delay = max_delay
+
+        self._heap = []                   # (ts, orden de llegada, t_llegada, item)
+        self._order = itertools.count()
+        self._newest = None               # mayor ts recibido
+        self._last_released = None        # ts de la última muestra liberada
+
+        # Contadores
+        self.pushed = 0       # muestras recibidas
+        self.released = 0     # muestras liberadas en orden
+        self.reordered = 0    # muestras que llegaron desordenadas y se reubicaron a tiempo
+        self.late = 0         # muestras descartadas por llegar después de liberar una más nueva
+        self.duplicate = 0    # muestras descartadas por repetir un timestamp
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, ts, item, now=None):
+        """
+        Agrega una muestra y libera las que ya no pueden ser precedidas por otra.
+
+        Parámetros:
+            ts (int): Timestamp de la muestra (por ejemplo ts_ns del MoCap).
+            item: Muestra a retener.
+            now (float): Tiempo actual (time.monotonic()); si es None se usa el actual.
+
+        Retorno:
+            list: Muestras liberadas, en orden creciente de timestamp (puede estar vacía).
+        """
+        if now is None:
+            now = time.monotonic()
+        self.pushed += 1
+
+        # Descartar duplicadas y tardías
+        last = self._last_released
+        if last is not None and ts <= last:
+            if ts == last:
+                self.duplicate += 1
+            else:
+                self.late += 1
+            return self._expire(now)
+        for entry in self._heap:
+            if entry[0] == ts:
+                self.duplicate += 1
+                return self._expire(now)
+
+        if self._newest is not None and ts < self._newest:
+            self.reordered += 1
+        else:
+            self._newest = ts
+
+        heapq.heappush(self._heap, (ts, next(self._order), now, item))
+
+        released = []
+        while len(self._heap) > self.depth:
+            released.append(self._pop())
+        return released + self._expire(now)
+
+    def poll(self, now=None):
+        """
+        Libera las muestras que superaron `max_delay` sin esperar un paquete nuevo.
+
+        Retorno:
+            list: Muestras liberadas, en orden.
+        """
+        return self._expire(time.monotonic() if now is None else now)
+
+    def flush(self):
+        """
+        Libera todas las muestras retenidas (por ejemplo al detener el stream).
+
+        Retorno:
+            list: Muestras liberadas, en orden.
+        """
+        released = []
+        while self._heap:
+            released.append(self._pop())
+        return released
+
+    def stats(self):
+        """
+        Retorno:
+            dict: Contadores de la ventana y muestras retenidas actualmente.
+        """
+        return {
+            'pushed': self.pushed,
+            'released': self.released,
+            'reordered': self.reordered,
+            'late': self.late,
+            'duplicate': self.duplicate,
+            'held': len(self._heap),
+        }
+
+    def _pop(self):
+        ts, _, _, item = heapq.heappop(self._heap)
+        self._last_released = ts
+        self.released += 1
+        return item
+
+    def _expire(self, now):
+        # Se busca la muestra vencida con mayor ts: para respetar el orden se liberan también
+        # todas las anteriores a ella, aunque hayan llegado después.
+        deadline = now - self.max_delay
+        expired_ts = None
+        for ts, _, t_arrival, _ in self._heap:
+            if t_arrival <= deadline and (expired_ts is None or ts > expired_ts):
+                expired_ts = ts
+
+        released = []
+        while self._heap and expired_ts is not None and self._heap[0][0] <= expired_ts:
+            released.append(self._pop())
+        return released
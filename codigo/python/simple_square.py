@@ -1,13 +1,14 @@
-import json
 import time
-import threading
-import paho.mqtt.client as mqtt
-import matplotlib.pyplot as plt
 from cflib.crazyflie import Crazyflie
 from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
 from cflib.crazyflie.high_level_commander import HighLevelCommander
 import cflib.crtp
-from datetime import datetime, timezone
+from mocap_stream import MocapStream
+from trajectory_buffer import TrajectoryBuffer
+from extpos_forwarder import ExtPosForwarder
+from trajectory_generator import square_waypoints
+from crazyflie_session import wait_for_estimator
+from toc_cache import cache_dir
 
 ## Vuelo del dron usando Mocap y Flowdeck, con verificación de vuelo final. Usada para
 ## comprobar que tan diferente es el funcionamiento de la fusión de sensores en Python sin
@@ -20,77 +21,38 @@ URI = "radio://0/80/2M/E7E7E7E7E1"
 MQTT_TOPIC = 'mocap/drone3'
 MQTT_BROKER = '192.168.50.200'
 PORT = 1880
+EXTPOS_HZ = 100  # tasa de envío de la posición del MoCap al dron [Hz]
 
 # -------------------------------------------------------
 # VARIABLES GLOBALES
 # -------------------------------------------------------
-mocap_pose = {'x': 0.0, 'y': 0.0, 'z': 0.0}
-real_trajectory = []
+real_trajectory = TrajectoryBuffer()  # [t, x, y, z] del MoCap
 theoretical_trajectory = []
 cf = None  # referencia global al dron
-last_ts = None  # timestamp del último mensaje procesado
 
 # -------------------------------------------------------
-# CALLBACK MQTT (lectura y envío a EKF)
+# CALLBACK MOCAP (registro de la trayectoria real)
 # -------------------------------------------------------
-def on_message(client, userdata, msg):
-    global mocap_pose, cf, last_ts
-    try:   
-        data = json.loads(msg.payload.decode())
-        pos = data['payload']['pose']['position']
-        ts_str = data.get('ts', None)
-
-        # Convertir timestamp ISO 8601 a datetime con zona UTC
-        if ts_str is not None:
-            msg_time = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-
-            # Ignorar mensajes antiguos
-            if last_ts is not None and msg_time <= last_ts:
-                return  # este mensaje es viejo
-            last_ts = msg_time
-
-        mocap_pose['x'] = float(pos['x'])
-        mocap_pose['y'] = float(pos['y'])
-        mocap_pose['z'] = float(pos['z'])
-
-        # Si el dron está conectado, enviar posición al EKF
-        if cf is not None:
-            cf.extpos.send_extpos(
-                mocap_pose['x'],
-                mocap_pose['y'],
-                mocap_pose['z']
-            )
-
-        # Guardar trayectoria real
-        real_trajectory.append([mocap_pose['x'], mocap_pose['y'], mocap_pose['z']])
-
-    except Exception as e:
-        print("Error en MQTT:", e)
-        print("Mensaje:", msg.payload.decode())
-
-def start_mqtt():
-    client = mqtt.Client()
-    client.on_message = on_message
-    client.connect(MQTT_BROKER, PORT, 60)
-    client.subscribe(MQTT_TOPIC)
-    client.loop_forever()
+mocap = MocapStream(MQTT_BROKER, PORT, MQTT_TOPIC)
+
+def on_pose(sample):
+    # Guardar trayectoria real (el envío al EKF lo hace el ExtPosForwarder a tasa fija)
+    real_trajectory.append(sample.t_rx, sample.x, sample.y, sample.z)
 
 
 # -------------------------------------------------------
 # TRAJECTORIA CUADRADA (takeoff -> square -> land)
 # -------------------------------------------------------
 def fly_square_trajectory(cf):
-    global theoretical_trajectory, mocap_pose
+    global theoretical_trajectory
 
     commander = HighLevelCommander(cf)
 
     # Esperar a tener una posición inicial válida del MoCap
     print("Esperando posición inicial del MoCap...")
-    while mocap_pose['x'] == 0.0 and mocap_pose['y'] == 0.0 and mocap_pose['z'] == 0.0:
-        time.sleep(0.1)
+    x0, y0, z0 = mocap.wait_for_pose()
 
     # Posición inicial (centro del cuadrado)
-    x0, y0, z0 = mocap_pose['x'], mocap_pose['y'], mocap_pose['z']
     print(f"Posición inicial detectada: x={x0:.2f}, y={y0:.2f}, z={z0:.2f}")
 
     # Parámetros del cuadrado
@@ -101,11 +63,10 @@ def fly_square_trajectory(cf):
     dt = t_total / N_sides
 
     # --- Generar trayectoria teórica cuadrada ---
-    xs = [x0 + side_length/2, x0 + side_length/2, x0 - side_length/2, x0 - side_length/2, x0 + side_length/2]
-    ys = [y0 + side_length/2, y0 - side_length/2, y0 - side_length/2, y0 + side_length/2, y0 + side_length/2]
-    zs = [z0 + hover_height] * (N_sides + 1)
+    vertices = square_waypoints((x0, y0, z0), side_length, height=z0 + hover_height)
+    xs, ys, zs = vertices.T
 
-    theoretical_trajectory = [[xs[i], ys[i], zs[i]] for i in range(N_sides + 1)]
+    theoretical_trajectory = vertices.tolist()
 
     # Despegue
     print("Despegando...")
@@ -138,11 +99,12 @@ def fly_square_trajectory(cf):
 # -------------------------------------------------------
 def plot_trajectories():
     import numpy as np
+    import matplotlib.pyplot as plt
     if len(real_trajectory) == 0:
         print("No se registró trayectoria real.")
         return
 
-    real = np.array(real_trajectory)
+    real = real_trajectory.positions  # vista (n, 3), sin copia
     theo = np.array(theoretical_trajectory)
 
     fig = plt.figure()
@@ -171,26 +133,43 @@ def main():
     # Inicializar drivers
     cflib.crtp.init_drivers()
 
-    # Hilo MQTT (recibe datos MoCap)
-    mqtt_thread = threading.Thread(target=start_mqtt, daemon=True)
-    mqtt_thread.start()
+    # Cliente MQTT (recibe datos MoCap en su propio hilo)
+    mocap.add_callback(on_pose)
+    mocap.start()
 
     print("Conectando al dron...")
-    with SyncCrazyflie(URI, cf=Crazyflie(rw_cache='./cache')) as scf:
+    t_connect = time.time()
+    with SyncCrazyflie(URI, cf=Crazyflie(rw_cache=cache_dir())) as scf:
         cf = scf.cf  # referencia al objeto Crazyflie interno
         print("Conectado correctamente.")
 
-        cf.param.set_value('stabilizer.estimator', '2')  # 2 = Kalman
-        # --- Reiniciar el estimador Kalman ---
-        print("Reiniciando el estimador Kalman...")
-        cf.param.set_value('kalman.resetEstimation', '1')
-        time.sleep(0.1)
-        cf.param.set_value('kalman.resetEstimation', '0')  # vuelve a 0
-        time.sleep(3.0) #esperar al EKF
-        print("Estimador reiniciado correctamente.")
-
-        # Ejecutar trayectoria circular
-        fly_square_trajectory(cf)
+        # Reenvío de la posición del MoCap al EKF a tasa fija, en su propio hilo
+        forwarder = ExtPosForwarder(cf, rate_hz=EXTPOS_HZ, metrics=mocap.metrics)
+        mocap.add_callback(forwarder.on_pose)
+        forwarder.start()
+
+        try:
+            cf.param.set_value('stabilizer.estimator', '2')  # 2 = Kalman
+            # --- Reiniciar el estimador Kalman ---
+            print("Reiniciando el estimador Kalman...")
+            cf.param.set_value('kalman.resetEstimation', '1')
+            time.sleep(0.1)
+            cf.param.set_value('kalman.resetEstimation', '0')  # vuelve a 0
+            # Esperar a que el EKF converja (varianzas de posición bajo el umbral)
+            t_ekf = wait_for_estimator(cf)
+            if t_ekf is None:
+                print("ERROR: el estimador Kalman no convergió dentro del tiempo de espera; no se despega.")
+                return
+            else:
+                print(f"Estimador listo en {t_ekf:.2f} s ({time.time() - t_connect:.2f} s desde la conexión).")
+            print("Estimador reiniciado correctamente.")
+
+            # Ejecutar trayectoria circular
+            fly_square_trajectory(cf)
+        finally:
+            forwarder.stop()
+            print("Envío extpos:", forwarder.stats())
+            print("Ingesta MoCap:", mocap.metrics.snapshot())
 
     # Graficar trayectorias
     plot_trajectories()
@@ -0,0 +1,272 @@
+"""
+Este módulo proporciona un formato binario compacto para la caché de TOC. Los JSON de cflib
+tienen 3-5 mil líneas (cada elemento repite `__class__`, `pytype`, sangría, ...) y el archivo
+completo se interpreta con json.load y un object_hook por elemento en cada conexión.
+
+Formato de un archivo %08X.toc (un TOC de log o de parámetros, identificado por su CRC):
+
+    encabezado  '<4sBBxxI'   magia b'CFTC', versión, tipo (0 = log, 1 = parámetros), cantidad n
+    tabla       n x '<HBBBxHI'   id, tipo de dato del firmware, acceso, extended, largo y
+                                 posición del nombre completo ('grupo.nombre') en el bloque de nombres
+    nombres     UTF-8 concatenados
+
+La tabla está ordenada por nombre completo, así TocIndex busca el id de una variable con
+búsqueda binaria directamente sobre el archivo mapeado en memoria (mmap), sin construir el TOC.
+
+BinaryTocCache reemplaza a la TocCache de cflib: no lee nada al crearse, en fetch() abre solo
+el archivo del CRC pedido (si no existe el .toc usa el .json y lo convierte) y en insert()
+guarda ambos formatos, para que las herramientas que usan cflib sin este módulo sigan
+encontrando el JSON.
+"""
+
+import bisect
+import glob
+import mmap
+import os
+import struct
+
+from cflib.crazyflie.log import LogTocElement
+from cflib.crazyflie.param import ParamTocElement
+from cflib.crazyflie.toccache import TocCache
+
+MAGIC = b'CFTC'
+VERSION = 1
+HEADER = struct.Struct('<4sBBxxI')
+RECORD = struct.Struct('<HBBBxHI')
+
+# Tipo de TOC -> (clase de elemento, tabla de tipos de dato del firmware)
+KINDS = {
+    0: (LogTocElement, {ident: entry[:2] for ident, entry in LogTocElement.types.items()}),
+    1: (ParamTocElement, ParamTocElement.types),
+}
+_CODES = {kind: {ctype: code for code, (ctype, _) in types.items()} for kind, (_, types) in KINDS.items()}
+
+
+# -------------------------------------------------------
+# ESCRITURA / LECTURA
+# -------------------------------------------------------
+def pack_toc(toc):
+    """
+    Parámetros:
+        toc (dict): TOC de cflib {grupo: {nombre: elemento}} (Toc.toc).
+
+    Retorno:
+        bytes: Contenido del archivo binario.
+
+    Errores:
+        Lanza ValueError si el TOC está vacío o mezcla elementos de log y de parámetros.
+    """
+    elements = [element for group in toc.values() for element in group.values()]
+    kinds = {0 if isinstance(element, LogTocElement) else 1 for element in elements}
+    if len(kinds) != 1:
+        raise ValueError("TOC must contain only log or only param elements")
+    kind = kinds.pop()
+    codes = _CODES[kind]
+
+    elements.sort(key=lambda element: f'{element.group}.{element.name}'.encode())
+    records = bytearray()
+    names = bytearray()
+    for element in elements:
+        name = f'{element.group}.{element.name}'.encode()
+        records += RECORD.pack(element.ident, codes[element.ctype], element.access,
+                               int(getattr(element, 'extended', False)), len(name), len(names))
+        names += name
+    return HEADER.pack(MAGIC, VERSION, kind, len(elements)) + bytes(records) + bytes(names)
+
+
+def _header(buffer):
+    magic, version, kind, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION or kind not in KINDS:
+        raise ValueError("Not a binary TOC file")
+    return kind, count
+
+
+def unpack_toc(buffer):
+    """
+    Parámetros:
+        buffer (bytes): Contenido de un archivo binario.
+
+    Retorno:
+        dict: TOC de cflib {grupo: {nombre: elemento}}.
+
+    Errores:
+        Lanza ValueError si el contenido no es un TOC binario válido.
+    """
+    kind, count = _header(buffer)
+    cls, types = KINDS[kind]
+    start = HEADER.size
+    names = bytes(buffer[start + count * RECORD.size:])
+
+    toc = {}
+    for ident, code, access, extended, length, offset in RECORD.iter_unpack(buffer[start:start + count * RECORD.size]):
+        group, name = names[offset:offset + length].decode().split('.', 1)
+        element = cls()
+        element.ident = ident
+        element.group = group
+        element.name = name
+        element.ctype, element.pytype = types[code]
+        element.access = access
+        if kind == 1:
+            element.extended = bool(extended)
+        try:
+            toc[group][name] = element
+        except KeyError:
+            toc[group] = {name: element}
+    return toc
+
+
+# -------------------------------------------------------
+# ÍNDICE NOMBRE -> ID
+# -------------------------------------------------------
+class TocIndex:
+    """
+    Búsqueda de id y tipo por nombre completo sobre un archivo binario mapeado en memoria, sin
+    construir el TOC.
+
+    Uso:
+        with TocIndex(os.path.join(cache_dir(), 'E74449A3.toc')) as index:
+            ident = index.id_of('stateEstimate.x')
+    """
+
+    def __init__(self, path):
+        """
+        Parámetros:
+            path (str): Archivo binario (%08X.toc).
+
+        Errores:
+            Lanza ValueError si el archivo no es un TOC binario válido.
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.kind, self.count = _header(self._map)
+        self._names = HEADER.size + self.count * RECORD.size
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+
+    def _name(self, i):
+        _, _, _, _, length, offset = self._record(i)
+        start = self._names + offset
+        return self._map[start:start + length]
+
+    def lookup(self, complete_name):
+        """
+        Parámetros:
+            complete_name (str): Nombre completo ('grupo.nombre').
+
+        Retorno:
+            tuple: (id, ctype, acceso) del elemento, o None si no existe.
+        """
+        key = complete_name.encode()
+        i = bisect.bisect_left(range(self.count), key, key=self._name)
+        if i == self.count or self._name(i) != key:
+            return None
+        ident, code, access, _, _, _ = self._record(i)
+        return ident, KINDS[self.kind][1][code][0], access
+
+    def id_of(self, complete_name):
+        """Id del elemento, o None si no existe."""
+        found = self.lookup(complete_name)
+        return None if found is None else found[0]
+
+    def names(self):
+        """Nombres completos de todos los elementos, en orden."""
+        return [self._name(i).decode() for i in range(self.count)]
+
+
+# -------------------------------------------------------
+# CACHÉ PARA CFLIB
+# -------------------------------------------------------
+class BinaryTocCache(TocCache):
+    """
+    TocCache de cflib que usa los archivos binarios (ver el encabezado del módulo).
+
+    Uso:
+        cf = Crazyflie(rw_cache=path)
+        cf._toc_cache = BinaryTocCache(rw_cache=path)     # o toc_cache.new_crazyflie()
+    """
+
+    def __init__(self, ro_cache=None, rw_cache=None):
+        # No se listan los archivos al crear la caché: se buscan por CRC en fetch()
+        self._dirs = [d for d in (rw_cache, ro_cache) if d]
+        self._rw_cache = rw_cache
+        self._cache_files = []
+        if rw_cache:
+            os.makedirs(rw_cache, exist_ok=True)
+
+    def fetch(self, crc):
+        """TOC del CRC pedido, o None si no está en la caché."""
+        for directory in self._dirs:
+            path = os.path.join(directory, '%08X.toc' % crc)
+            try:
+                with open(path, 'rb') as f:
+                    return unpack_toc(f.read())
+            except (OSError, ValueError, KeyError, struct.error):
+                pass
+        for directory in self._dirs:
+            if os.path.exists(os.path.join(directory, '%08X.json' % crc)):
+                self._cache_files = [os.path.join(directory, '%08X.json' % crc)]
+                toc = TocCache.fetch(self, crc)
+                if toc is not None:
+                    self._write_binary(crc, toc)
+                return toc
+        return None
+
+    def insert(self, crc, toc):
+        """Guarda el TOC en formato JSON (compatibilidad con cflib) y binario."""
+        TocCache.insert(self, crc, toc)
+        self._write_binary(crc, toc)
+
+    def _write_binary(self, crc, toc):
+        if not self._rw_cache:
+            return
+        path = os.path.join(self._rw_cache, '%08X.toc' % crc)
+        try:
+            data = pack_toc(toc)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)     # otros procesos nunca ven un archivo a medias
+        except (OSError, ValueError, KeyError):
+            pass
+
+
+def convert_json(directory):
+    """
+    Crea el archivo binario de cada JSON de la carpeta que todavía no lo tenga.
+
+    Parámetros:
+        directory (str): Carpeta de caché.
+
+    Retorno:
+        list: Archivos binarios creados.
+    """
+    cache = BinaryTocCache(rw_cache=directory)
+    created = []
+    for filename in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        target = os.path.join(directory, stem + '.toc')
+        if os.path.exists(target):
+            continue
+        try:
+            crc = int(stem, 16)
+        except ValueError:
+            continue
+        cache._cache_files = [filename]
+        toc = TocCache.fetch(cache, crc)
+        if toc:
+            cache._write_binary(crc, toc)
+            created.append(target)
+    return created
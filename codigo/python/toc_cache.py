@@ -0,0 +1,190 @@
+"""
+Este módulo proporciona la caché de TOC (tablas de variables de log y parámetros) compartida
+por todas las herramientas. Antes cada script usaba `Crazyflie(rw_cache='./cache')`, relativo
+a la carpeta de trabajo: los mismos archivos (03D6DB4C.json, E74449A3.json, ...) estaban
+copiados en codigo/python/cache, codigo/matlab/Mqtt/cache, cf_newcom/cache, robotat/cache y
+experimentos/cache, y correr un script desde otra carpeta descargaba el TOC completo al conectar.
+
+Ahora hay una sola caché por usuario (~/.cache/crazyflie/toc, o la carpeta de la variable de
+entorno CRAZYFLIE_TOC_CACHE). Cada archivo se identifica por el CRC del TOC del firmware, así
+que drones con el mismo firmware comparten la entrada y un firmware nuevo agrega la suya.
+new_crazyflie() crea el Crazyflie con la caché binaria de toc_binary.py (cada entrada se guarda
+también como %08X.toc, mucho más rápida de leer al conectar que el JSON).
+
+Uso como comando:
+    python toc_cache.py list                     # entradas de la caché
+    python toc_cache.py import                   # copia las cachés ./cache del repositorio
+    python toc_cache.py warm radio://0/80/2M/E7E7E7E7E1 [...]   # descarga el TOC de cada dron
+    python toc_cache.py convert                  # crea el archivo binario de cada JSON
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import time
+
+ENV_VARIABLE = 'CRAZYFLIE_TOC_CACHE'
+DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'crazyflie', 'toc')
+
+# Cachés por carpeta de trabajo del repositorio (relativas a la raíz)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+LEGACY_DIRS = [
+    'codigo/python/cache',
+    'codigo/matlab/Mqtt/cache',
+    'codigo/matlab/Mqtt/cf_newcom/cache',
+    'codigo/matlab/Mqtt/robotat/cache',
+    'codigo/matlab/experimentos/cache',
+    'codigo/matlab/experimentos/robotat/cache',
+]
+
+
+def cache_dir():
+    """
+    Retorno:
+        str: Carpeta de la caché de TOC del usuario (se crea si no existe).
+    """
+    path = os.environ.get(ENV_VARIABLE) or DEFAULT_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def entries(path=None):
+    """
+    Parámetros:
+        path (str): Carpeta de caché (None = la del usuario).
+
+    Retorno:
+        dict: CRC (int) -> ruta del archivo, de todas las entradas de la caché.
+    """
+    path = path or cache_dir()
+    result = {}
+    for filename in glob.glob(os.path.join(path, '*.json')):
+        try:
+            result[int(os.path.splitext(os.path.basename(filename))[0], 16)] = filename
+        except ValueError:
+            pass
+    return result
+
+
+def new_crazyflie(rw_cache=None):
+    """
+    Parámetros:
+        rw_cache (str): Carpeta de caché (None = la del usuario).
+
+    Retorno:
+        Crazyflie: Crazyflie de cflib que lee y guarda el TOC en formato binario (toc_binary.py).
+    """
+    from cflib.crazyflie import Crazyflie
+    from toc_binary import BinaryTocCache
+
+    path = rw_cache or cache_dir()
+    cf = Crazyflie(rw_cache=path)
+    cf._toc_cache = BinaryTocCache(rw_cache=path)
+    return cf
+
+
+def import_caches(sources=None, path=None):
+    """
+    Copia a la caché del usuario las entradas de otras carpetas que todavía no tiene. Un
+    archivo que no se puede leer como JSON se omite.
+
+    Parámetros:
+        sources (sequence): Carpetas de origen (None = las cachés del repositorio, LEGACY_DIRS).
+        path (str): Carpeta de destino (None = la del usuario).
+
+    Retorno:
+        list: Archivos copiados.
+    """
+    path = path or cache_dir()
+    if sources is None:
+        sources = [os.path.join(_REPO_ROOT, d) for d in LEGACY_DIRS]
+    existing = entries(path)
+    copied = []
+    for source in sources:
+        for crc, filename in entries(source).items():
+            if crc in existing:
+                continue
+            try:
+                with open(filename) as f:
+                    json.load(f)
+            except (OSError, ValueError):
+                continue
+            target = os.path.join(path, '%08X.json' % crc)
+            shutil.copyfile(filename, target)
+            existing[crc] = target
+            copied.append(target)
+    return copied
+
+
+def warm(uris, path=None):
+    """
+    Conecta a cada dron (sin iniciar logs ni el estimador) para que cflib guarde su TOC en la
+    caché. Con la caché ya caliente, la conexión solo compara el CRC.
+
+    Parámetros:
+        uris (sequence): URIs de los drones.
+        path (str): Carpeta de caché (None = la del usuario).
+
+    Retorno:
+        dict: uri -> tiempo de conexión [s], o el mensaje de error si no se pudo conectar.
+    """
+    import cflib.crtp
+    from cflib.crazyflie.syncCrazyflie import SyncCrazyflie
+
+    cflib.crtp.init_drivers()
+    path = path or cache_dir()
+    result = {}
+    for uri in uris:
+        t0 = time.perf_counter()
+        try:
+            with SyncCrazyflie(uri, cf=new_crazyflie(path)):
+                result[uri] = time.perf_counter() - t0
+        except Exception as e:
+            result[uri] = str(e)
+    return result
+
+
+# -------------------------------------------------------
+# COMANDO
+# -------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Caché de TOC compartida de los Crazyflie")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="lista las entradas de la caché")
+    commands.add_parser('import', help="copia las cachés ./cache del repositorio")
+    warm_parser = commands.add_parser('warm', help="conecta a los drones y guarda su TOC")
+    warm_parser.add_argument('uris', nargs='+')
+    commands.add_parser('convert', help="crea el archivo binario (.toc) de cada entrada JSON")
+    args = parser.parse_args()
+
+    print(f"Caché de TOC: {cache_dir()}")
+    if args.command == 'list':
+        for crc, filename in sorted(entries().items()):
+            binary = os.path.splitext(filename)[0] + '.toc'
+            size = f"{os.path.getsize(binary) / 1024:8.1f} KiB" if os.path.exists(binary) else "       -"
+            print(f"  {crc:08X}  {os.path.getsize(filename) / 1024:8.1f} KiB  binario {size}")
+    elif args.command == 'import':
+        copied = import_caches()
+        print(f"  {len(copied)} entradas copiadas")
+        for filename in copied:
+            print(f"  {os.path.basename(filename)}")
+    elif args.command == 'warm':
+        for uri, result in warm(args.uris).items():
+            if isinstance(result, str):
+                print(f"  ERROR {uri}: {result}")
+            else:
+                print(f"  {uri}: {result:.2f} s")
+    elif args.command == 'convert':
+        from toc_binary import convert_json
+
+        created = convert_json(cache_dir())
+        print(f"  {len(created)} entradas convertidas")
+        for filename in created:
+            print(f"  {os.path.basename(filename)}")
+
+
+# -------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Este módulo proporciona un almacenamiento de trayectorias (TrajectoryBuffer) sobre arreglos
+NumPy preasignados, para reemplazar las listas `real_trajectory.append([x, y, z])` de los
+scripts de vuelo. Cada muestra ocupa una fila float64 (tiempo + columnas), agregar una muestra
+es O(1) y las gráficas y análisis trabajan sobre vistas del arreglo, sin copiarlo.
+
+Dos modos:
+    - Creciente (max_samples=None): la capacidad crece por bloques de `chunk_size` filas.
+    - Anillo (max_samples=N): guarda solo las últimas N muestras con memoria fija.
+"""
+
+import numpy as np
+
+
+class TrajectoryBuffer:
+    """
+    Trayectoria con timestamps sobre un arreglo float64 preasignado.
+
+    Uso:
+        real_trajectory = TrajectoryBuffer()
+        real_trajectory.append(t, x, y, z)
+        ...
+        real = real_trajectory.positions      # vista (n, 3), sin copia
+        t = real_trajectory.times             # vista (n,), sin copia
+    """
+
+    def __init__(self, columns=('x', 'y', 'z'), chunk_size=4096, max_samples=None):
+        """
+        Parámetros:
+            columns (sequence): Nombres de las columnas de datos (además del tiempo).
+            chunk_size (int): Filas que se reservan cada vez que el arreglo se llena (modo creciente).
+            max_samples (int): Si se indica, se guardan solo las últimas `max_samples` muestras (modo anillo).
+
+        Errores:
+            Lanza ValueError si chunk_size o max_samples no son positivos.
+        """
+        if chunk_size <= 0 or (max_samples is not None and max_samples <= 0):
+            raise ValueError("chunk_size and max_samples must be positive")
+        self.columns = tuple(columns)
+        self.chunk_size = chunk_size
+        self.max_samples = max_samples
+        self._width = 1 + len(self.columns)
+        self.clear()
+
+    def clear(self):
+        """Elimina todas las muestras y libera la memoria extra reservada."""
+        if self.max_samples is None:
+            self._data = np.empty((self.chunk_size, self._width))
+        else:
+            # Anillo espejado: cada muestra se escribe en i y en i + N, así las últimas N
+            # muestras siempre forman un bloque contiguo (vista sin copia).
+            self._data = np.empty((2 * self.max_samples, self._width))
+        self._count = 0    # muestras escritas en total
+        self._head = 0     # próxima fila a escribir
+
+    def append(self, t, *values):
+        """
+        Agrega una muestra.
+
+        Parámetros:
+            t (float): Tiempo de la muestra (por ejemplo time.time() o el ts del MoCap).
+            *values (float): Un valor por cada columna, en el orden de `columns`.
+        """
+        row = (t,) + values
+        if self.max_samples is None:
+            if self._head == len(self._data):
+                # Crecimiento geométrico redondeado a bloques: O(1) amortizado por muestra
+                grow = max(self.chunk_size, len(self._data) // 2)
+                grow = -(-grow // self.chunk_size) * self.chunk_size
+                self._data = np.concatenate((self._data, np.empty((grow, self._width))))
+            self._data[self._head] = row
+            self._head += 1
+        else:
+            n = self.max_samples
+            self._data[self._head] = row
+            self._data[self._head + n] = row
+            self._head = self._head + 1 if self._head + 1 < n else 0
+        self._count += 1
+
+    def __len__(self):
+        if self.max_samples is None:
+            return self._head
+        return min(self._count, self.max_samples)
+
+    @property
+    def dropped(self):
+        """Muestras descartadas por el modo anillo."""
+        return self._count - len(self)
+
+    @property
+    def nbytes(self):
+        """Memoria reservada por el arreglo en bytes."""
+        return self._data.nbytes
+
+    def view(self):
+        """
+        Retorno:
+            np.ndarray: Vista (n, 1 + columnas) de las muestras en orden cronológico, sin copia.
+            La vista deja de ser válida si se agregan muestras que hagan crecer el arreglo
+            (modo creciente) o que sobreescriban filas (modo anillo); usar .copy() para conservarla.
+        """
+        n = len(self)
+        if self.max_samples is None:
+            return self._data[:n]
+        start = self._head if self._count >= self.max_samples else 0
+        return self._data[start:start + n]
+
+    @property
+    def times(self):
+        """Vista (n,) de los tiempos."""
+        return self.view()[:, 0]
+
+    @property
+    def positions(self):
+        """Vista (n, columnas) de los datos (sin la columna de tiempo)."""
+        return self.view()[:, 1:]
+
+    def column(self, name):
+        """
+        Parámetros:
+            name (str): Nombre de la columna ('t' para el tiempo).
+
+        Retorno:
+            np.ndarray: Vista (n,) de la columna.
+        """
+        if name == 't':
+            return self.times
+        return self.view()[:, 1 + self.columns.index(name)]
@@ -0,0 +1,276 @@
+"""
+Este módulo proporciona la generación de trayectorias con NumPy: puntos de las misiones
+(círculo, cuadrado, línea), polinomios por tramo de mínimo jerk o mínimo snap que pasan por
+puntos arbitrarios, y el muestreo de posición, velocidad y aceleración en lote.
+
+Mínimo jerk / snap: con los tiempos de cada tramo fijos, la trayectoria que minimiza la
+integral del jerk (orden r = 3) o del snap (r = 4) al cuadrado es un spline de grado 2r - 1
+con derivadas continuas hasta el orden 2r - 2, y reposo (derivadas 1..r-1 nulas) en el primer
+y el último punto. Las incógnitas son las derivadas 1..r-1 en los puntos intermedios; la
+continuidad de las derivadas r..2r-2 da un sistema tridiagonal por bloques (bandas) que se
+resuelve en O(n). Si SciPy está instalado se usa solve_banded; si no, una eliminación por
+bloques equivalente en NumPy (más lenta para decenas de miles de puntos).
+
+Los coeficientes se entregan como un arreglo (m, d, grado + 1) en potencias crecientes del
+tiempo desde el inicio de cada tramo, el mismo formato que usa onboard_trajectory.py.
+"""
+
+from math import factorial
+
+import numpy as np
+
+# SciPy se importa en la primera solución (su import tarda más que el de NumPy); queda en
+# None si no está instalado. banded_solver() fuerza la búsqueda.
+solve_banded = None
+_scipy_checked = False
+
+MIN_JERK = 3
+MIN_SNAP = 4
+
+
+# -------------------------------------------------------
+# PUNTOS DE LAS MISIONES
+# -------------------------------------------------------
+def circle_waypoints(center, radius, n, height=None):
+    """
+    Parámetros:
+        center (sequence): Centro (x, y, z) [m].
+        radius (float): Radio [m].
+        n (int): Cantidad de tramos; el último punto repite el primero (círculo cerrado).
+        height (float): Altura z [m] (None = la z del centro).
+
+    Retorno:
+        numpy.ndarray: Puntos (n + 1, 3).
+    """
+    theta = np.linspace(0.0, 2 * np.pi, n + 1)
+    z = center[2] if height is None else height
+    return np.column_stack([center[0] + radius * np.cos(theta),
+                            center[1] + radius * np.sin(theta),
+                            np.full(n + 1, z)])
+
+
+def square_waypoints(center, side, height=None):
+    """
+    Parámetros:
+        center (sequence): Centro (x, y, z) [m].
+        side (float): Longitud del lado [m].
+        height (float): Altura z [m] (None = la z del centro).
+
+    Retorno:
+        numpy.ndarray: Vértices (5, 3) empezando y terminando en (+side/2, +side/2).
+    """
+    h = side / 2
+    corners = np.array([[h, h], [h, -h], [-h, -h], [-h, h], [h, h]])
+    z = center[2] if height is None else height
+    return np.column_stack([center[0] + corners[:, 0], center[1] + corners[:, 1], np.full(5, z)])
+
+
+def linear_waypoints(start, displacement, n):
+    """
+    Parámetros:
+        start (sequence): Punto inicial (x, y, z) [m].
+        displacement (sequence): Desplazamiento total (dx, dy, dz) [m].
+        n (int): Cantidad de puntos (incluye el inicial y el final).
+
+    Retorno:
+        numpy.ndarray: Puntos (n, 3) equiespaciados.
+    """
+    s = np.linspace(0.0, 1.0, n)[:, None]
+    return np.asarray(start, dtype=float) + s * np.asarray(displacement, dtype=float)
+
+
+# -------------------------------------------------------
+# MÍNIMO JERK / SNAP
+# -------------------------------------------------------
+def _hermite(r):
+    # Matriz M (2r x 2r): coeficientes en s (0..1) del polinomio de grado 2r-1 a partir de las
+    # derivadas 0..r-1 en s = 0 y en s = 1
+    n = 2 * r
+    A = np.zeros((n, n))
+    for k in range(r):
+        A[k, k] = factorial(k)
+        for j in range(k, n):
+            A[r + k, j] = factorial(j) / factorial(j - k)
+    return np.linalg.inv(A)
+
+
+def _derivative_rows(r, s):
+    # Filas E (2r-1 x 2r): derivada de orden k (0..2r-2) en s de cada potencia s^j
+    n = 2 * r
+    E = np.zeros((n - 1, n))
+    for k in range(n - 1):
+        for j in range(k, n):
+            E[k, j] = factorial(j) / factorial(j - k) * s**(j - k)
+    return E
+
+
+def banded_solver():
+    """
+    Retorno:
+        function: scipy.linalg.solve_banded, o None si SciPy no está instalado.
+    """
+    global solve_banded, _scipy_checked
+    if not _scipy_checked:
+        _scipy_checked = True
+        try:
+            from scipy.linalg import solve_banded
+        except ImportError:
+            solve_banded = None
+    return solve_banded
+
+
+def _solve_block_tridiagonal(L, C, U, rhs):
+    # Sistema con bloques L[j] (fila j, incógnita j-1), C[j] y U[j] (incógnita j+1)
+    n, q, _ = C.shape
+    if banded_solver() is not None:
+        size = n * q
+        bw = 2 * q - 1
+        ab = np.zeros((2 * bw + 1, size))
+        rows = np.arange(size).reshape(n, q)
+        for offset, blocks in ((-1, L), (0, C), (1, U)):
+            j = np.arange(max(0, -offset), n - max(0, offset))
+            for a in range(q):
+                for b in range(q):
+                    row = rows[j, a]
+                    col = rows[j + offset, b]
+                    ab[bw + row - col, col] = blocks[j, a, b]
+        return solve_banded((bw, bw), ab, rhs.reshape(size, -1)).reshape(n, q, -1)
+
+    # Eliminación por bloques (Thomas)
+    Cp = C.copy()
+    dp = rhs.copy()
+    for j in range(1, n):
+        factor = L[j] @ np.linalg.inv(Cp[j - 1])
+        Cp[j] -= factor @ U[j - 1]
+        dp[j] -= factor @ dp[j - 1]
+    x = np.empty_like(dp)
+    x[-1] = np.linalg.solve(Cp[-1], dp[-1])
+    for j in range(n - 2, -1, -1):
+        x[j] = np.linalg.solve(Cp[j], dp[j] - U[j] @ x[j + 1])
+    return x
+
+
+def min_derivative(waypoints, durations, order=MIN_SNAP):
+    """
+    Polinomios por tramo que pasan por los puntos y minimizan la derivada de orden `order`.
+
+    Parámetros:
+        waypoints (array): Puntos (n, d) [m], n >= 2.
+        durations (array): Duración de cada tramo (n - 1,) [s].
+        order (int): MIN_JERK (3, grado 5) o MIN_SNAP (4, grado 7).
+
+    Retorno:
+        numpy.ndarray: Coeficientes (n - 1, d, 2 * order) en potencias crecientes de t.
+
+    Errores:
+        Lanza ValueError si las dimensiones no coinciden, alguna duración no es positiva o el
+        orden es menor que 2.
+    """
+    p = np.asarray(waypoints, dtype=float)
+    T = np.asarray(durations, dtype=float)
+    if p.ndim != 2 or len(p) < 2 or T.shape != (len(p) - 1,):
+        raise ValueError("waypoints must be (n, d) and durations (n - 1,)")
+    if np.any(T <= 0):
+        raise ValueError("durations must be positive")
+    if order < 2:
+        raise ValueError("order must be >= 2")
+
+    r = order
+    q = r - 1
+    M = _hermite(r)
+    m = np.arange(r)
+    D = np.zeros((len(p), q, p.shape[1]))    # derivadas 1..r-1 en los puntos (reposo en los extremos)
+
+    if len(p) > 2:
+        # Se resuelve con los tiempos normalizados (duración media = 1) para acotar las potencias
+        scale = T.mean()
+        Ta, Tb = (T[:-1] / scale)[:, None], (T[1:] / scale)[:, None]
+        k = np.arange(r, 2 * r - 1)
+        H1 = _derivative_rows(r, 1.0)[k] @ M    # derivadas r..2r-2 al final de un tramo
+        H0 = _derivative_rows(r, 0.0)[k] @ M    # ... y al inicio
+
+        # Continuidad en el punto j: tramo anterior (Ta) en s = 1 == tramo siguiente (Tb) en s = 0
+        ka, kb = Ta[:, :, None] ** -k[:, None], Tb[:, :, None] ** -k[:, None]    # (n-2, q, 1)
+        sa, sb = Ta[:, None, :] ** m, Tb[:, None, :] ** m                        # (n-2, 1, r)
+        left = ka * H1[None, :, :r] * sa
+        mid_a = ka * H1[None, :, r:] * sa
+        mid_b = kb * H0[None, :, :r] * sb
+        right = kb * H0[None, :, r:] * sb
+
+        L = left[:, :, 1:]
+        C = mid_a[:, :, 1:] - mid_b[:, :, 1:]
+        U = -right[:, :, 1:]
+        rhs = -(left[:, :, :1] * p[:-2, None, :] + (mid_a[:, :, :1] - mid_b[:, :, :1]) * p[1:-1, None, :]
+                - right[:, :, :1] * p[2:, None, :])
+
+        # Los extremos están en reposo: sus términos ya son nulos
+        L[0] = 0.0
+        U[-1] = 0.0
+        D[1:-1] = _solve_block_tridiagonal(L, C, U, rhs) / scale ** np.arange(1, r)[:, None]
+
+    # Coeficientes de cada tramo en s y conversión a t = s * T
+    Y = np.concatenate([p[:, None, :], D], axis=1)          # (n, r, d): derivadas 0..r-1
+    Tm = T[:, None, None] ** m[:, None]
+    ends = np.concatenate([Y[:-1] * Tm, Y[1:] * Tm], axis=1)  # (n-1, 2r, d)
+    coef = np.einsum('ij,mjd->mdi', M, ends)
+    return coef / T[:, None, None] ** np.arange(2 * r)
+
+
+def min_jerk(waypoints, durations):
+    """Atajo de min_derivative(..., order=MIN_JERK): polinomios de grado 5."""
+    return min_derivative(waypoints, durations, MIN_JERK)
+
+
+def min_snap(waypoints, durations):
+    """Atajo de min_derivative(..., order=MIN_SNAP): polinomios de grado 7."""
+    return min_derivative(waypoints, durations, MIN_SNAP)
+
+
+# -------------------------------------------------------
+# MUESTREO
+# -------------------------------------------------------
+def sample(coef, durations, t):
+    """
+    Evalúa la trayectoria en lote.
+
+    Parámetros:
+        coef (array): Coeficientes (m, d, grado + 1) de min_derivative().
+        durations (array): Duración de cada tramo (m,) [s].
+        t (array): Tiempos desde el inicio de la trayectoria [s] (se recortan al intervalo válido).
+
+    Retorno:
+        tuple: (posición, velocidad, aceleración), cada una (len(t), d).
+    """
+    coef = np.asarray(coef, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    starts = np.concatenate([[0.0], np.cumsum(durations)[:-1]])
+    t = np.clip(np.asarray(t, dtype=float), 0.0, starts[-1] + durations[-1])
+    index = np.clip(np.searchsorted(starts, t, side='right') - 1, 0, len(durations) - 1)
+    tau = (t - starts[index])[:, None]
+    c = coef[index]                                     # (len(t), d, grado + 1)
+
+    degree = c.shape[-1] - 1
+    pos = c[..., degree].copy()
+    vel = np.zeros_like(pos)
+    acc = np.zeros_like(pos)
+    # Horner con las dos primeras derivadas
+    for i in range(degree - 1, -1, -1):
+        acc = acc * tau + 2 * vel
+        vel = vel * tau + pos
+        pos = pos * tau + c[..., i]
+    return pos, vel, acc
+
+
+def sample_uniform(coef, durations, dt):
+    """
+    Parámetros:
+        coef (array): Coeficientes de min_derivative().
+        durations (array): Duración de cada tramo [s].
+        dt (float): Periodo de muestreo [s].
+
+    Retorno:
+        tuple: (t, posición, velocidad, aceleración) muestreados cada `dt`, incluido el final.
+    """
+    total = float(np.sum(durations))
+    t = np.append(np.arange(0.0, total, dt), total)
+    return (t,) + sample(coef, durations, t)